@@ -0,0 +1,206 @@
+import argparse
+import itertools
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from unittest import mock
+
+import numpy as np
+import onnxruntime as ort
+
+# Add repo root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import src.inference_engine as inference_engine
+from src.inference_engine import InferenceEngine
+from src.session_pool import build_session_options
+from src.search_engine import EvidenceResult, SourcePassages
+
+# Short common words, one WordPiece token each, used to pad evidence to a target length
+FILLER = (
+    "the study found that water is a common part of many old and new"
+    " systems in the world where people live and work each day"
+).split()
+
+CLAIMS = [
+    "The Eiffel Tower is located in Berlin.",
+    "Water boils at 100 degrees Celsius at sea level.",
+    "The Great Wall of China is visible from the Moon.",
+    "Python was created by Guido van Rossum.",
+    "The human body has 206 bones.",
+    "Mount Everest is the tallest mountain above sea level.",
+]
+
+class OfflineSearchEngine:
+    """
+    Stands in for SearchEngine so the benchmark never touches the network.
+    """
+    def get_evidence(self, query, max_results=3, on_progress=None, budget=None):
+        return EvidenceResult(f"[Source: https://example.com] Offline evidence for: {query}", ("https://example.com",), ())
+
+    def collect_passages(self, claim, max_results=3, passage_length=500, on_progress=None, budget=None):
+        return SourcePassages([{"url": "https://example.com", "text": claim, "snippet": claim}], [])
+
+def build_workload(engine, batch_size, seq_len, seed=0):
+    """
+    Builds batch_size claim/evidence pairs whose token sequences are
+    close to seq_len tokens long (claim + evidence + special tokens).
+    """
+    rng = random.Random(seed)
+    claims, evidences = [], []
+    for i in range(batch_size):
+        claim = f"{rng.choice(CLAIMS)} ({i})"
+        claim_len = len(engine.tokenizer(claim, add_special_tokens=False)["input_ids"])
+        words = max(seq_len - claim_len - 3, 1)
+        claims.append(claim)
+        evidences.append(" ".join(rng.choice(FILLER) for _ in range(words)))
+    return claims, evidences
+
+def percentile(samples, q):
+    return float(np.percentile(samples, q)) * 1000
+
+def run_case(engine, batch_size, seq_len, padding, iterations, warmup, warm_cache):
+    """
+    Times engine._predict_uncached over one fixed batch. The verdict cache is
+    bypassed; the token cache is cleared per iteration unless warm_cache is set.
+    """
+    engine.padding_strategy = padding
+    claims, evidences = build_workload(engine, batch_size, seq_len)
+    lengths = [len(seq) for seq in engine._build_sequences(claims, evidences)]
+
+    for _ in range(warmup):
+        engine._predict_uncached(claims, evidences)
+
+    samples = []
+    for _ in range(iterations):
+        if not warm_cache:
+            engine.token_cache.clear()
+        start = time.perf_counter()
+        predictions = engine._predict_uncached(claims, evidences)
+        samples.append(time.perf_counter() - start)
+
+    errors = [p["error"] for p in predictions if p["result"] == "ERROR"]
+    if errors:
+        raise RuntimeError(f"Inference failed: {errors[0]}")
+
+    total = sum(samples)
+    return {
+        "batch_size": batch_size,
+        "seq_len": seq_len,
+        "mean_tokens": float(np.mean(lengths)),
+        "padding": padding,
+        "iterations": iterations,
+        "p50_ms": percentile(samples, 50),
+        "p95_ms": percentile(samples, 95),
+        "p99_ms": percentile(samples, 99),
+        "mean_ms": total / iterations * 1000,
+        "throughput_pairs_per_s": batch_size * iterations / total
+    }
+
+def case_key(result):
+    return (
+        os.path.basename(result["model"]), result["intra_op_threads"], result["inter_op_threads"],
+        result["padding"], result["batch_size"], result["seq_len"]
+    )
+
+def git_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True, stderr=subprocess.DEVNULL).strip()
+    except Exception:
+        return None
+
+def print_results(results, baseline=None):
+    header = f"{'model':<22} {'intra':>5} {'inter':>5} {'padding':<10} {'batch':>5} {'seq':>4} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'pairs/s':>9}"
+    if baseline:
+        header += f" {'vs base':>8}"
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        line = (
+            f"{os.path.basename(r['model']):<22} {r['intra_op_threads']:>5} {r['inter_op_threads']:>5} "
+            f"{r['padding']:<10} {r['batch_size']:>5} {r['seq_len']:>4} "
+            f"{r['p50_ms']:>9.2f} {r['p95_ms']:>9.2f} {r['p99_ms']:>9.2f} {r['throughput_pairs_per_s']:>9.1f}"
+        )
+        if baseline:
+            base = baseline.get(case_key(r))
+            if base:
+                # Positive means faster than the baseline
+                change = r["throughput_pairs_per_s"] / base["throughput_pairs_per_s"] - 1
+                line += f" {change * 100:>+7.1f}%"
+            else:
+                line += f" {'n/a':>8}"
+        print(line)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark InferenceEngine latency and throughput on CPU, offline.")
+    parser.add_argument("--models", nargs="+", default=["models/model_quant.onnx", "models/model.onnx"],
+                        help="ONNX models to compare (e.g. quantized and fp32). Missing files are skipped.")
+    parser.add_argument("--tokenizer", default="./final_judge_model")
+    parser.add_argument("--batch-sizes", nargs="+", type=int, default=[1, 8, 32, 64])
+    parser.add_argument("--seq-lens", nargs="+", type=int, default=[32, 64, 128])
+    parser.add_argument("--padding", nargs="+", default=["dynamic", "max_length"], choices=["dynamic", "max_length"])
+    parser.add_argument("--intra-op-threads", nargs="+", type=int, default=[0],
+                        help="ORT intra-op thread counts (0 = ONNX Runtime default)")
+    parser.add_argument("--inter-op-threads", nargs="+", type=int, default=[0])
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--warmup", type=int, default=3)
+    parser.add_argument("--warm-cache", action="store_true", help="Keep the token cache between iterations")
+    parser.add_argument("--output", default="benchmark_inference.json", help="Where to write JSON results")
+    parser.add_argument("--compare", help="Earlier JSON results to compare throughput against")
+    args = parser.parse_args()
+
+    models = [m for m in args.models if os.path.exists(m)]
+    for missing in set(args.models) - set(models):
+        print(f"Skipping {missing}: file not found")
+    if not models:
+        sys.exit("No models to benchmark.")
+
+    results = []
+    # Sessions depend on the model and thread settings, so build one engine per combination
+    with mock.patch.object(inference_engine, "SearchEngine", OfflineSearchEngine):
+        for model, intra, inter in itertools.product(models, args.intra_op_threads, args.inter_op_threads):
+            options = build_session_options(intra_op_threads=intra, inter_op_threads=inter)
+            engine = InferenceEngine(model_path=model, tokenizer_path=args.tokenizer, session_options=options, evidence_mode="truncate")
+            for padding, batch_size, seq_len in itertools.product(args.padding, args.batch_sizes, args.seq_lens):
+                result = run_case(engine, batch_size, seq_len, padding, args.iterations, args.warmup, args.warm_cache)
+                results.append({
+                    "model": model,
+                    "model_mb": round(os.path.getsize(model) / (1024 * 1024), 2),
+                    "intra_op_threads": intra,
+                    "inter_op_threads": inter,
+                    **result
+                })
+                print(f"{os.path.basename(model)} intra={intra} inter={inter} {padding} batch={batch_size} seq={seq_len}: "
+                      f"p50 {result['p50_ms']:.2f} ms, {result['throughput_pairs_per_s']:.1f} pairs/s")
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = {case_key(r): r for r in json.load(f)["results"]}
+
+    print()
+    print_results(results, baseline)
+
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "onnxruntime": ort.__version__,
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "warm_cache": args.warm_cache
+        },
+        "results": results
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults written to {args.output}")
+
+if __name__ == "__main__":
+    main()
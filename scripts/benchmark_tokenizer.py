@@ -0,0 +1,95 @@
+import argparse
+import random
+import sys
+import os
+import time
+
+# Add repo root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from transformers import DistilBertTokenizer
+from src.inference_engine import InferenceEngine
+
+CLAIMS = [
+    "The Eiffel Tower is located in Berlin.",
+    "Water boils at 100 degrees Celsius at sea level.",
+    "The Great Wall of China is visible from the Moon with the naked eye.",
+    "Python was created by Guido van Rossum.",
+    "The human body has 206 bones.",
+    "Mount Everest is the tallest mountain above sea level.",
+    "Lightning never strikes the same place twice.",
+    "The Amazon is the longest river in the world.",
+]
+
+EVIDENCE = (
+    "[Source: https://example.com/article] According to multiple encyclopedic sources, "
+    "the statement has been studied extensively and the consensus among researchers is "
+    "documented in peer-reviewed literature spanning several decades of observation. "
+)
+
+def build_workload(num_requests, distinct):
+    """
+    Watchdog-like traffic: a small set of sentences re-sent many times.
+    """
+    random.seed(0)
+    pairs = [(f"{random.choice(CLAIMS)} ({i})", EVIDENCE * (1 + i % 4)) for i in range(distinct)]
+    return [random.choice(pairs) for _ in range(num_requests)]
+
+def time_it(fn, repeats):
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare tokenization cost before and after the fast tokenizer + token cache.")
+    parser.add_argument("--model", default="models/model_quant.onnx")
+    parser.add_argument("--tokenizer", default="./final_judge_model")
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--distinct", type=int, default=50)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    workload = build_workload(args.requests, args.distinct)
+    batches = [workload[i:i + args.batch_size] for i in range(0, len(workload), args.batch_size)]
+
+    # Before: one tokenizer call per request, padded to max_length
+    baseline_tokenizer = DistilBertTokenizer.from_pretrained(args.tokenizer)
+
+    def baseline():
+        for claim, evidence in workload:
+            baseline_tokenizer(f"{claim} [SEP] {evidence}", return_tensors="np", padding="max_length", truncation=True, max_length=128)
+
+    # After: batched fast tokenizer with the token-id cache
+    engine = InferenceEngine(model_path=args.model, tokenizer_path=args.tokenizer)
+
+    def batched(clear_cache):
+        for batch in batches:
+            if clear_cache:
+                engine.token_cache.clear()
+            engine._build_sequences([c for c, _ in batch], [e for _, e in batch])
+
+    # Sanity check: both paths must produce the same token ids
+    claim, evidence = workload[0]
+    expected = baseline_tokenizer(f"{claim} [SEP] {evidence}", truncation=True, max_length=128)["input_ids"]
+    if engine._build_sequences([claim], [evidence])[0] != expected:
+        print("WARNING: token ids differ between baseline and cached path")
+
+    results = {
+        f"baseline (is_fast={baseline_tokenizer.is_fast}, per request)": time_it(baseline, args.repeats),
+        f"batched (is_fast={engine.tokenizer.is_fast}, cold cache)": time_it(lambda: batched(True), args.repeats),
+        f"batched (is_fast={engine.tokenizer.is_fast}, warm cache)": time_it(lambda: batched(False), args.repeats),
+    }
+
+    print(f"\nTokenizing {args.requests} requests ({args.distinct} distinct pairs, batch size {args.batch_size})")
+    base = next(iter(results.values()))
+    for name, seconds in results.items():
+        per_request_us = seconds / args.requests * 1e6
+        print(f"{name:<45} {seconds * 1000:8.1f} ms  {per_request_us:8.1f} us/request  {base / seconds:6.1f}x")
+    print(f"Token cache: {engine.token_cache.stats()}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+# Add repo root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.local_index import LocalIndex, load_embedder, split_passages
+
+def iter_files(inputs):
+    for path in map(Path, inputs):
+        if path.is_dir():
+            yield from sorted(p for p in path.rglob("*") if p.is_file())
+        else:
+            yield path
+
+def iter_documents(inputs):
+    """
+    Yields {"url", "title", "text"} per document.
+    .txt files are one document each. Anything else is read as JSON lines
+    with a "text" field and optional "url"/"title" (e.g. the --json output
+    of WikiExtractor over a Wikipedia dump).
+    """
+    for path in iter_files(inputs):
+        if path.suffix == ".txt":
+            yield {"url": path.resolve().as_uri(), "title": path.stem, "text": path.read_text(errors="replace")}
+            continue
+        with open(path, errors="replace") as f:
+            for line_number, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    doc = json.loads(line)
+                except json.JSONDecodeError:
+                    print(f"Skipping {path}:{line_number}: not JSON")
+                    continue
+                if doc.get("text"):
+                    yield doc
+
+def iter_passages(documents, max_words):
+    for doc in documents:
+        for passage in split_passages(doc["text"], max_words):
+            yield {"url": doc.get("url", ""), "title": doc.get("title", ""), "text": passage}
+
+def build_local_index():
+    parser = argparse.ArgumentParser(description="Build or extend the offline evidence index used by SEARCH_BACKENDS=local.")
+    parser.add_argument("inputs", nargs="*", help="Corpus files or directories (.txt, or JSON lines with a text field)")
+    parser.add_argument("--index", default=os.environ.get("LOCAL_INDEX_PATH", "data/local_index"))
+    parser.add_argument("--passage-words", type=int, default=120, help="Documents are indexed as passages of at most this many words")
+    parser.add_argument("--segment-size", type=int, default=50000, help="Passages per segment")
+    parser.add_argument("--embeddings", action="store_true", help="Also store passage embeddings for dense retrieval")
+    parser.add_argument("--embedding-model", help="sentence-transformers model (default: models/embedder, else all-MiniLM-L6-v2)")
+    parser.add_argument("--compact", action="store_true", help="Merge all segments into one afterwards")
+    args = parser.parse_args()
+
+    index = LocalIndex(args.index)
+
+    embed, embedding_model = None, None
+    if args.embeddings:
+        embedding_model = args.embedding_model or index.embedding_model
+        if not embedding_model:
+            embedding_model = "models/embedder" if os.path.exists("models/embedder") else "all-MiniLM-L6-v2"
+        if index.embedding_model and embedding_model != index.embedding_model:
+            sys.exit(f"Index already uses embedding model {index.embedding_model}")
+        print(f"Loading embedding model {embedding_model}...")
+        embed = load_embedder(embedding_model)
+
+    start = time.perf_counter()
+    added = 0
+    batch = []
+    for passage in iter_passages(iter_documents(args.inputs), args.passage_words):
+        batch.append(passage)
+        if len(batch) >= args.segment_size:
+            added += index.add(batch, embed=embed, embedding_model=embedding_model)
+            print(f"Indexed {added} passages ({time.perf_counter() - start:.0f}s)")
+            batch = []
+    if batch:
+        added += index.add(batch, embed=embed, embedding_model=embedding_model)
+
+    if args.compact:
+        print("Compacting segments...")
+        index.compact()
+
+    print(f"Added {added} passages in {time.perf_counter() - start:.1f}s")
+    print(json.dumps(index.stats(), indent=2))
+
+if __name__ == "__main__":
+    build_local_index()
@@ -1,62 +1,246 @@
-import torch
-from transformers import DistilBertTokenizer, DistilBertForSequenceClassification
+import argparse
+import json
 import os
+import shutil
+import sys
+import time
 from pathlib import Path
 
+import numpy as np
+import onnxruntime as ort
+from onnxruntime.quantization import CalibrationDataReader
+import pandas as pd
+from transformers import AutoConfig, DistilBertTokenizer
+
+# Add repo root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.session_pool import build_session_options
+
 # Install required packages if not present
 # pip install onnx onnxruntime
 
-def convert_to_onnx():
-    model_path = "./final_judge_model"
-    output_dir = Path("models")
-    output_dir.mkdir(exist_ok=True)
-    
-    onnx_path = output_dir / "model.onnx"
-    quant_path = output_dir / "model_quant.onnx"
-    
+MAX_LENGTH = 128
+
+# Variant name -> file name once promoted to models/
+PROMOTED_NAMES = {
+    "fp32": "model.onnx",
+    "fp32_fused": "model_fused.onnx",
+    "int8_dynamic": "model_quant.onnx",
+    "int8_static": "model_static_quant.onnx",
+}
+
+def export_fp32(model_path, onnx_path):
+    import torch
+    from transformers import DistilBertForSequenceClassification
+
     print(f"Loading model from {model_path}...")
     tokenizer = DistilBertTokenizer.from_pretrained(model_path)
     model = DistilBertForSequenceClassification.from_pretrained(model_path)
     model.eval()
-    
+
     # Create dummy input for export
     dummy_text = "This is a claim [SEP] This is evidence"
     inputs = tokenizer(dummy_text, return_tensors="pt")
-    
+
     print("Exporting to ONNX...")
     torch.onnx.export(
-        model, 
-        (inputs['input_ids'], inputs['attention_mask']), 
-        onnx_path, 
-        input_names=['input_ids', 'attention_mask'], 
-        output_names=['logits'], 
+        model,
+        (inputs['input_ids'], inputs['attention_mask']),
+        onnx_path,
+        input_names=['input_ids', 'attention_mask'],
+        output_names=['logits'],
         dynamic_axes={
-            'input_ids': {0: 'batch_size', 1: 'sequence_length'}, 
-            'attention_mask': {0: 'batch_size', 1: 'sequence_length'}, 
+            'input_ids': {0: 'batch_size', 1: 'sequence_length'},
+            'attention_mask': {0: 'batch_size', 1: 'sequence_length'},
             'logits': {0: 'batch_size'}
         },
         opset_version=14
     )
     print(f"ONNX model saved to {onnx_path}")
-    
-    print("Quantizing to INT8...")
+
+def fuse_transformer(onnx_path, fused_path, model_path):
+    """
+    Runs ONNX Runtime's transformer optimizer (attention, LayerNorm,
+    GELU and embedding fusion).
+    """
+    from onnxruntime.transformers import optimizer
+
+    print("Fusing transformer graph...")
+    try:
+        config = AutoConfig.from_pretrained(model_path)
+        num_heads = getattr(config, "n_heads", 0)
+        hidden_size = getattr(config, "dim", 0)
+    except Exception:
+        # 0 lets the optimizer detect them from the graph
+        num_heads, hidden_size = 0, 0
+
+    optimized = optimizer.optimize_model(
+        str(onnx_path),
+        model_type="bert",
+        num_heads=num_heads,
+        hidden_size=hidden_size,
+        # Python fusions only; ONNX Runtime applies its own graph
+        # optimizations when the session is created
+        opt_level=0
+    )
+    fused = {op: count for op, count in optimized.get_fused_operator_statistics().items() if count}
+    print(f"Fused operators: {fused or 'none'}")
+    optimized.save_model_to_file(str(fused_path))
+
+def quantize_dynamic_int8(input_path, output_path):
     from onnxruntime.quantization import quantize_dynamic, QuantType
-    
+
+    print("Quantizing to INT8 (dynamic)...")
     quantize_dynamic(
-        model_input=onnx_path,
-        model_output=quant_path,
+        model_input=input_path,
+        model_output=output_path,
         weight_type=QuantType.QUInt8
     )
-    
-    print(f"Quantized model saved to {quant_path}")
-    
-    # Compare sizes
-    orig_size = os.path.getsize(onnx_path) / (1024 * 1024)
-    quant_size = os.path.getsize(quant_path) / (1024 * 1024)
-    
-    print(f"Original Size: {orig_size:.2f} MB")
-    print(f"Quantized Size: {quant_size:.2f} MB")
-    print(f"Reduction: {(1 - quant_size/orig_size)*100:.2f}%")
+
+class CalibrationReader(CalibrationDataReader):
+    """
+    Feeds tokenized training examples to the static quantization calibrator.
+    """
+    def __init__(self, tokenizer, texts, batch_size=8):
+        self.batches = []
+        for start in range(0, len(texts), batch_size):
+            encoded = tokenizer(
+                texts[start:start + batch_size], return_tensors="np",
+                padding="max_length", truncation=True, max_length=MAX_LENGTH
+            )
+            self.batches.append({
+                "input_ids": encoded["input_ids"].astype(np.int64),
+                "attention_mask": encoded["attention_mask"].astype(np.int64)
+            })
+        self._iter = iter(self.batches)
+
+    def get_next(self):
+        return next(self._iter, None)
+
+    def rewind(self):
+        self._iter = iter(self.batches)
+
+def quantize_static_int8(input_path, output_path, calibration_reader):
+    from onnxruntime.quantization import CalibrationMethod, QuantFormat, QuantType, quantize_static
+
+    print(f"Quantizing to INT8 (static, {len(calibration_reader.batches)} calibration batches)...")
+    quantize_static(
+        model_input=input_path,
+        model_output=output_path,
+        calibration_data_reader=calibration_reader,
+        quant_format=QuantFormat.QDQ,
+        activation_type=QuantType.QUInt8,
+        weight_type=QuantType.QInt8,
+        per_channel=True,
+        calibrate_method=CalibrationMethod.MinMax,
+        # Quantizing softmax/LayerNorm inputs costs too much accuracy
+        op_types_to_quantize=["MatMul", "Gemm"]
+    )
+
+def evaluate(onnx_path, tokenizer, texts, labels, latency_runs, batch_size=32):
+    """
+    Accuracy on the held-out examples plus single-request CPU latency.
+    """
+    session = ort.InferenceSession(str(onnx_path), sess_options=build_session_options())
+
+    predictions = []
+    for start in range(0, len(texts), batch_size):
+        encoded = tokenizer(texts[start:start + batch_size], return_tensors="np", padding=True, truncation=True, max_length=MAX_LENGTH)
+        logits = session.run(None, {
+            "input_ids": encoded["input_ids"].astype(np.int64),
+            "attention_mask": encoded["attention_mask"].astype(np.int64)
+        })[0]
+        predictions.extend(np.argmax(logits, axis=-1).tolist())
+    accuracy = float(np.mean(np.asarray(predictions) == np.asarray(labels)))
+
+    single = tokenizer(texts[0], return_tensors="np", padding="max_length", truncation=True, max_length=MAX_LENGTH)
+    inputs = {
+        "input_ids": single["input_ids"].astype(np.int64),
+        "attention_mask": single["attention_mask"].astype(np.int64)
+    }
+    for _ in range(3):
+        session.run(None, inputs)
+    samples = []
+    for _ in range(latency_runs):
+        start = time.perf_counter()
+        session.run(None, inputs)
+        samples.append(time.perf_counter() - start)
+
+    return {
+        "accuracy": accuracy,
+        "size_mb": round(os.path.getsize(onnx_path) / (1024 * 1024), 2),
+        "p50_ms": float(np.percentile(samples, 50)) * 1000,
+        "p95_ms": float(np.percentile(samples, 95)) * 1000
+    }, predictions
+
+def convert_to_onnx():
+    parser = argparse.ArgumentParser(description="Export, fuse and quantize the judge model, then promote variants that keep accuracy.")
+    parser.add_argument("--model-path", default="./final_judge_model")
+    parser.add_argument("--data", default="data/train_dataset_ready.csv")
+    parser.add_argument("--work-dir", default="build/onnx", help="Where variants are built before promotion")
+    parser.add_argument("--output-dir", default="models")
+    parser.add_argument("--fp32", help="Use an existing fp32 ONNX export instead of exporting with torch")
+    parser.add_argument("--calibration-samples", type=int, default=256)
+    parser.add_argument("--eval-samples", type=int, default=1000)
+    parser.add_argument("--tolerance", type=float, default=0.01, help="Max accuracy drop vs fp32 for promotion")
+    parser.add_argument("--latency-runs", type=int, default=50)
+    args = parser.parse_args()
+
+    work_dir = Path(args.work_dir)
+    output_dir = Path(args.output_dir)
+    work_dir.mkdir(parents=True, exist_ok=True)
+    output_dir.mkdir(exist_ok=True)
+
+    variants = {name: work_dir / file_name for name, file_name in PROMOTED_NAMES.items()}
+
+    if args.fp32:
+        shutil.copyfile(args.fp32, variants["fp32"])
+    else:
+        export_fp32(args.model_path, variants["fp32"])
+
+    tokenizer = DistilBertTokenizer.from_pretrained(args.model_path)
+
+    # Same split as train.py: the last 1000 rows are held out
+    df = pd.read_csv(args.data)
+    train_df, val_df = df.iloc[:-1000], df.iloc[-1000:]
+    calibration_texts = train_df.sample(n=min(args.calibration_samples, len(train_df)), random_state=0)["text"].tolist()
+    eval_df = val_df.iloc[:args.eval_samples]
+    eval_texts, eval_labels = eval_df["text"].tolist(), eval_df["label"].tolist()
+
+    fuse_transformer(variants["fp32"], variants["fp32_fused"], args.model_path)
+    quantize_dynamic_int8(variants["fp32_fused"], variants["int8_dynamic"])
+    quantize_static_int8(variants["fp32_fused"], variants["int8_static"], CalibrationReader(tokenizer, calibration_texts))
+
+    print(f"\nEvaluating on {len(eval_texts)} held-out examples...")
+    report = {}
+    reference = None
+    for name, path in variants.items():
+        metrics, predictions = evaluate(path, tokenizer, eval_texts, eval_labels, args.latency_runs)
+        if reference is None:
+            reference = predictions
+        metrics["agreement_with_fp32"] = float(np.mean(np.asarray(predictions) == np.asarray(reference)))
+        report[name] = metrics
+
+    baseline = report["fp32"]["accuracy"]
+    for name, metrics in report.items():
+        metrics["accuracy_drop"] = baseline - metrics["accuracy"]
+        metrics["promoted"] = metrics["accuracy_drop"] <= args.tolerance
+        if metrics["promoted"]:
+            shutil.copyfile(variants[name], output_dir / PROMOTED_NAMES[name])
+
+    print(f"\n{'variant':<14} {'accuracy':>9} {'drop':>7} {'agree':>7} {'size MB':>8} {'p50 ms':>8} {'p95 ms':>8}  promoted")
+    for name, m in report.items():
+        print(
+            f"{name:<14} {m['accuracy']:>9.2%} {m['accuracy_drop']:>+7.2%} {m['agreement_with_fp32']:>7.2%} "
+            f"{m['size_mb']:>8.2f} {m['p50_ms']:>8.2f} {m['p95_ms']:>8.2f}  "
+            f"{'-> ' + str(output_dir / PROMOTED_NAMES[name]) if m['promoted'] else 'no'}"
+        )
+
+    report_path = output_dir / "conversion_report.json"
+    with open(report_path, "w") as f:
+        json.dump({"tolerance": args.tolerance, "eval_samples": len(eval_texts), "variants": report}, f, indent=2)
+    print(f"\nReport written to {report_path}")
 
 if __name__ == "__main__":
     convert_to_onnx()
@@ -54,6 +54,16 @@ async def test_backend_logic():
     mock_request.app.state.memory_engine = mock_memory_engine
     mock_request.app.state.inference_engine = mock_inference_engine
     
+    # Routes verify through the batch scheduler and run blocking calls on the executor
+    mock_batch_scheduler = MagicMock()
+    mock_batch_scheduler.verify_claim = AsyncMock(side_effect=mock_verify)
+    mock_request.app.state.batch_scheduler = mock_batch_scheduler
+    
+    class InlineExecutor:
+        async def run(self, fn, *args, **kwargs):
+            return fn(*args, **kwargs)
+    mock_request.app.state.inference_executor = InlineExecutor()
+    
     # Patch dependencies
     # We need to patch `get_user_from_key` and `check_credits`/`deduct_credits` 
     # OR we just let them run if we have a real DB connection.
@@ -179,21 +189,17 @@ async def test_backend_logic():
     import src.api.billing
     src.api.billing.supabase = mock_client
     
-    # Mock httpx in capture_memory
-    # We need to patch httpx.AsyncClient
-    mock_response = MagicMock()
-    mock_response.text = "<html><body><p>chunk1 chunk2 chunk3</p></body></html>"
-    mock_response.raise_for_status = MagicMock()
-    
-    mock_client_instance = AsyncMock()
-    mock_client_instance.get.return_value = mock_response
-    mock_client_instance.__aenter__.return_value = mock_client_instance
-    mock_client_instance.__aexit__.return_value = None
-    
-    # Patch httpx.AsyncClient
-    import httpx
-    original_client = httpx.AsyncClient
-    httpx.AsyncClient = MagicMock(return_value=mock_client_instance)
+    # Mock the shared HTTP client used by capture_memory
+    from src.http_client import FetchResponse
+    from src.content_store import get_content_store
+    get_content_store().clear()
+    mock_http = MagicMock()
+    mock_http.fetch_response = AsyncMock(return_value=FetchResponse(
+        200, b"<html><body><p>chunk1 chunk2 chunk3</p></body></html>", {}
+    ))
+    mock_http.call = lambda coro: coro
+    original_get_http_client = src.api.routes.memory.get_http_client
+    src.api.routes.memory.get_http_client = MagicMock(return_value=mock_http)
     
     req = MemoryCaptureRequest(url="https://example.com", verify=False)
     
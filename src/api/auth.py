@@ -8,6 +8,7 @@ import time
 import logging
 import bcrypt
 import hashlib
+import hmac
 
 load_dotenv()
 
@@ -259,3 +260,14 @@ async def get_user_from_key(api_key: str):
     except Exception as e:
         logging.warning(f"get_user_from_key failed: {e}")
         return None
+
+async def require_admin(x_admin_token: str = Header(None)):
+    """
+    Guards operational endpoints (model rollout, caches) with the shared
+    ADMIN_TOKEN. Disabled entirely when ADMIN_TOKEN is not set.
+    """
+    admin_token = os.getenv("ADMIN_TOKEN")
+    if not admin_token:
+        raise HTTPException(status_code=403, detail="Admin API disabled")
+    if not x_admin_token or not hmac.compare_digest(x_admin_token, admin_token):
+        raise HTTPException(status_code=401, detail="Invalid admin token")
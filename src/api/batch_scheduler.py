@@ -0,0 +1,215 @@
+import asyncio
+import os
+from src.api.single_flight import SingleFlight
+from src.utils.logger import logger
+
+def _normalize(text):
+    return " ".join(text.split()) if text else None
+
+class BatchScheduler:
+    """
+    Dynamic micro-batching for claim verification.
+
+    Concurrent requests are queued and collected into a batch until either
+    max_batch_size requests are waiting or max_wait_ms has passed since the
+    first one arrived. Each batch runs as a single ONNX session.run and every
+    caller receives its own prediction. Up to max_concurrent_batches batches
+    (by default the engine's session pool size) run at the same time.
+
+    Blocking inference runs on the given InferenceExecutor and evidence
+    gathering on evidence_executor (network-bound, so it must not hold the
+    inference slots), each falling back to a default thread when not supplied.
+
+    Identical verifications in flight at the same time (same claim and
+    evidence, whitespace-normalized) run once and every caller gets the
+    result; each caller is still billed and logged by the API. A caller
+    only joins an auto-search running to a deadline at or before its own,
+    so nobody waits on a longer budget than theirs.
+    """
+    def __init__(self, inference_engine, max_batch_size=None, max_wait_ms=None, max_concurrent_batches=None, executor=None, evidence_executor=None):
+        self.engine = inference_engine
+        self.executor = executor
+        self.evidence_executor = evidence_executor
+        self.max_batch_size = max_batch_size or int(os.environ.get("BATCH_MAX_SIZE", 32))
+        if max_wait_ms is None:
+            max_wait_ms = float(os.environ.get("BATCH_MAX_WAIT_MS", 10))
+        self.max_wait = max_wait_ms / 1000.0
+        if max_concurrent_batches is None:
+            session_pool = getattr(inference_engine, "session_pool", None)
+            max_concurrent_batches = session_pool.size if session_pool else 1
+        self.max_concurrent_batches = max_concurrent_batches
+
+        self._queue = None
+        self._worker = None
+        self._slots = None
+        self._running = set()
+        self.single_flight = SingleFlight()
+
+        # Stats
+        self.batches_run = 0
+        self.items_run = 0
+
+    async def start(self):
+        self._queue = asyncio.Queue()
+        self._slots = asyncio.Semaphore(self.max_concurrent_batches)
+        self._worker = asyncio.create_task(self._run())
+        logger.info(f"Batch scheduler started (max_batch_size={self.max_batch_size}, max_wait_ms={self.max_wait * 1000:.0f})")
+
+    async def stop(self):
+        if self._worker:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+
+        # Let in-flight batches finish and deliver their results
+        if self._running:
+            await asyncio.gather(*self._running, return_exceptions=True)
+
+        # Fail anything still waiting so callers don't hang on shutdown
+        while self._queue and not self._queue.empty():
+            self._fail([self._queue.get_nowait()], RuntimeError("Batch scheduler stopped"))
+
+    async def submit(self, claim: str, evidence: str) -> dict:
+        """
+        Queues a claim/evidence pair and waits for its prediction.
+        """
+        if self._worker is None:
+            raise RuntimeError("Batch scheduler is not running")
+
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((claim, evidence, future))
+        return await future
+
+    async def verify_claim(self, claim: str, evidence: str = None, on_progress=None, deadline=None) -> dict:
+        """
+        Batched equivalent of InferenceEngine.verify_claim.
+        Auto-searches for evidence when none is supplied; on_progress and
+        deadline are passed to gather_evidence. Callers joining an identical
+        verification already in flight share it; for auto-search only if
+        it runs to a deadline no later than theirs.
+        """
+        key = ("claim", _normalize(claim), _normalize(evidence))
+        # Evidence-supplied verifications don't search, so any caller may share them
+        flight_deadline = None if evidence else deadline
+        return await self._coalesced(key, claim, lambda progress: self._verify_claim(claim, evidence, progress, deadline), on_progress, flight_deadline)
+
+    async def verify_claim_by_source(self, claim: str, on_progress=None, deadline=None) -> dict:
+        """
+        Auto-searches and scores the claim against each source in one batched call.
+        """
+        key = ("by_source", _normalize(claim))
+        return await self._coalesced(key, claim, lambda progress: self._verify_claim_by_source(claim, progress, deadline), on_progress, deadline)
+
+    async def _coalesced(self, key, claim, fn, on_progress, deadline=None):
+        prediction = await self.single_flight.do(key, fn, on_progress, deadline)
+        # Every caller gets its own copy, echoing its own claim text
+        return {**prediction, "claim": claim}
+
+    async def _verify_claim(self, claim, evidence, on_progress, deadline):
+        if evidence:
+            return await self.submit(claim, evidence)
+
+        cached = self.engine.lookup_verdict(claim)
+        if cached:
+            return cached
+
+        result = await self._run_gathering(self.engine.gather_evidence, claim, on_progress=on_progress, deadline=deadline)
+        if not result.evidence:
+            return self.engine.empty_result(claim, list(result.sources))
+
+        return self.engine.searched_prediction(claim, await self.submit(claim, result.evidence), result)
+
+    async def _verify_claim_by_source(self, claim, on_progress, deadline):
+        result = await self._run_gathering(self.engine.gather_source_passages, claim, on_progress=on_progress, deadline=deadline)
+        return await self._run_blocking(self.engine.score_sources, claim, result.passages, result.timed_out)
+
+    async def _run_blocking(self, fn, *args, **kwargs):
+        if self.executor:
+            return await self.executor.run(fn, *args, **kwargs)
+        return await asyncio.to_thread(fn, *args, **kwargs)
+
+    async def _run_gathering(self, fn, *args, **kwargs):
+        if self.evidence_executor:
+            return await self.evidence_executor.run(fn, *args, **kwargs)
+        return await asyncio.to_thread(fn, *args, **kwargs)
+
+    def stats(self) -> dict:
+        return {
+            "batches_run": self.batches_run,
+            "items_run": self.items_run,
+            "avg_batch_size": self.items_run / self.batches_run if self.batches_run else 0.0,
+            "running_batches": len(self._running),
+            "queued": self._queue.qsize() if self._queue else 0,
+            "single_flight": self.single_flight.stats()
+        }
+
+    async def _collect(self, batch: list):
+        """
+        Fills batch in place, so items already taken off the queue are
+        still reachable if the collection is cancelled.
+        """
+        loop = asyncio.get_running_loop()
+        batch.append(await self._queue.get())
+        deadline = loop.time() + self.max_wait
+
+        while len(batch) < self.max_batch_size:
+            # Take whatever is already queued without waiting
+            if not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+                continue
+
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+
+    async def _run(self):
+        while True:
+            # Wait for a free session before forming the next batch, so the
+            # batch keeps growing while all sessions are busy
+            await self._slots.acquire()
+            batch = []
+            try:
+                await self._collect(batch)
+            except BaseException:
+                self._slots.release()
+                # Stopped mid-collection: these callers would otherwise wait forever
+                self._fail(batch, RuntimeError("Batch scheduler stopped"))
+                raise
+            task = asyncio.create_task(self._execute(batch))
+            self._running.add(task)
+            task.add_done_callback(self._batch_done)
+
+    def _fail(self, batch, error):
+        for _, _, future in batch:
+            if not future.done():
+                future.set_exception(error)
+
+    def _batch_done(self, task):
+        self._running.discard(task)
+        self._slots.release()
+
+    async def _execute(self, batch: list):
+        claims = [claim for claim, _, _ in batch]
+        evidences = [evidence for _, evidence, _ in batch]
+
+        try:
+            predictions = await self._run_blocking(self.engine.predict_batch, claims, evidences)
+        except Exception as e:
+            logger.error(f"Batch inference failed for {len(batch)} items: {e}", exc_info=True)
+            self._fail(batch, e)
+            return
+
+        self.batches_run += 1
+        self.items_run += len(batch)
+
+        for (_, _, future), prediction in zip(batch, predictions):
+            # Caller may have gone away (client disconnect)
+            if not future.done():
+                future.set_result(prediction)
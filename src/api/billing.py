@@ -5,11 +5,13 @@ from src.utils.logger import logger
 
 async def check_credits(user_id: str, amount: int) -> bool:
     """
-    DEPRECATED: This function creates a TOCTOU (Time-of-Check to Time-of-Use) race condition.
-    Use deduct_credits() directly instead, which performs atomic validation and deduction.
-    
-    This function is kept only for potential UI/display purposes where you need to 
-    check credits WITHOUT deducting them. Never use this as a gate before deduct_credits().
+    Checks the balance WITHOUT deducting it. This is a TOCTOU (Time-of-Check to
+    Time-of-Use) check, so it never replaces deduct_credits(), which performs
+    atomic validation and deduction and must still be called.
+
+    Use it for UI/display, or as a fail-fast pre-check before expensive work
+    (e.g. /verify/batch) so a user who cannot pay is turned away before the
+    work runs. deduct_credits() stays the authoritative charge afterwards.
     """
     def _check():
         try:
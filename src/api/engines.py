@@ -0,0 +1,92 @@
+import asyncio
+import threading
+import time
+from src.utils.logger import logger
+
+class EngineRegistry:
+    """
+    Loads the API's engines and keeps track of their state.
+
+    Eager engines are constructed in parallel at startup; lazy engines are
+    constructed on first use. Load time and status are recorded per engine
+    and reported by /ready.
+    """
+    def __init__(self):
+        self._factories = {}
+        self._lazy = {}
+        self._engines = {}
+        self._status = {}
+        self._load_seconds = {}
+        self._errors = {}
+        self._locks = {}
+
+    def register(self, name: str, factory, lazy: bool = False):
+        self._factories[name] = factory
+        self._lazy[name] = lazy
+        self._status[name] = "cold"
+        self._locks[name] = threading.Lock()
+
+    def _load(self, name: str):
+        with self._locks[name]:
+            if self._status[name] in ("warm", "failed"):
+                return self._engines.get(name)
+
+            self._status[name] = "loading"
+            start = time.perf_counter()
+            try:
+                engine = self._factories[name]()
+            except Exception as e:
+                self._status[name] = "failed"
+                self._errors[name] = str(e)
+                logger.error(f"Failed to load {name} engine: {e}")
+                return None
+            finally:
+                self._load_seconds[name] = time.perf_counter() - start
+
+            self._engines[name] = engine
+            self._status[name] = "warm"
+            logger.info(f"{name} engine loaded in {self._load_seconds[name]:.2f}s")
+            return engine
+
+    async def load_eager(self):
+        """
+        Loads every non-lazy engine concurrently, each on its own thread.
+        """
+        names = [name for name, lazy in self._lazy.items() if not lazy]
+        start = time.perf_counter()
+        await asyncio.gather(*[asyncio.to_thread(self._load, name) for name in names])
+        logger.info(f"Startup engines ({', '.join(names)}) loaded in {time.perf_counter() - start:.2f}s")
+
+    def get(self, name: str):
+        """
+        Returns the engine, loading it first if it is lazy and still cold.
+        Returns None if it failed to load.
+        """
+        if self._status[name] == "warm":
+            return self._engines[name]
+        return self._load(name)
+
+    async def aget(self, name: str):
+        """
+        Like get(), but loads a cold engine off the event loop.
+        """
+        if self._status[name] == "warm":
+            return self._engines[name]
+        return await asyncio.to_thread(self._load, name)
+
+    def ready(self) -> bool:
+        """
+        True once every eager engine is warm.
+        """
+        return all(self._status[name] == "warm" for name, lazy in self._lazy.items() if not lazy)
+
+    def status(self) -> dict:
+        return {
+            name: {
+                "status": self._status[name],
+                "lazy": self._lazy[name],
+                "load_seconds": round(self._load_seconds[name], 3) if name in self._load_seconds else None,
+                "error": self._errors.get(name)
+            }
+            for name in self._factories
+        }
@@ -0,0 +1,57 @@
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from src.utils.logger import logger
+
+class InferenceExecutor:
+    """
+    Dedicated thread pool for blocking work (tokenization, ONNX inference,
+    embeddings, web search and scraping), so the event loop only awaits
+    results and keeps serving auth and health checks.
+
+    At most max_workers jobs run at once; further callers wait their turn.
+    The API runs one for CPU-bound work and a separate "evidence" one for
+    network-bound searches, so those never hold the slots model batches need.
+    """
+    def __init__(self, max_workers=None, name="inference"):
+        self.name = name
+        self.max_workers = max_workers or int(os.environ.get(f"{name.upper()}_EXECUTOR_WORKERS", 16))
+        self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=name)
+        self._slots = asyncio.Semaphore(self.max_workers)
+
+        # Stats
+        self.running = 0
+        self.waiting = 0
+        self.completed = 0
+
+    async def run(self, fn, *args, **kwargs):
+        """
+        Runs fn(*args, **kwargs) on the pool and returns its result.
+        """
+        self.waiting += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            self.waiting -= 1
+
+        self.running += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._pool, partial(fn, *args, **kwargs))
+        finally:
+            self.running -= 1
+            self.completed += 1
+            self._slots.release()
+
+    def shutdown(self):
+        logger.info(f"Shutting down {self.name} executor")
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> dict:
+        return {
+            "max_workers": self.max_workers,
+            "running": self.running,
+            "waiting": self.waiting,
+            "completed": self.completed
+        }
@@ -1,43 +1,76 @@
 from fastapi import FastAPI, Depends, HTTPException, Header, BackgroundTasks
-from pydantic import BaseModel
+from fastapi.responses import JSONResponse, StreamingResponse
+from starlette.background import BackgroundTask
+from pydantic import BaseModel, Field
 from contextlib import asynccontextmanager
 import sys
 import os
 import asyncio
+import json
+import threading
 from typing import Optional, List
 
 # Add src to path to import inference_engine
 sys.path.append(os.path.join(os.getcwd(), 'src'))
 
-from inference_engine import InferenceEngine
-from api.auth import get_current_user, get_user_from_key, supabase
-from api.gpu_lock import get_gpu_lock
+from api.auth import get_current_user, get_user_from_key, require_admin, supabase
+from api.batch_scheduler import BatchScheduler
+from api.inference_executor import InferenceExecutor
+from api.engines import EngineRegistry
 
 # Global Variables (for backward compatibility if needed, but prefer app.state)
 bad_domains = set()
 
+# Heavy modules (onnxruntime, transformers, sentence_transformers, cv2) are
+# imported inside the factories so they load on the engine's own thread.
+def load_inference_engine():
+    from inference_engine import InferenceEngine
+    return InferenceEngine()
+
+def load_memory_engine():
+    from src.memory_engine import MemoryEngine
+    return MemoryEngine()
+
+def load_provenance_engine():
+    from src.provenance_engine import ProvenanceEngine
+    return ProvenanceEngine()
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
     print("Initializing API...")
     
-    # Load Inference Engine
-    try:
-        app.state.inference_engine = InferenceEngine()
-        print("Inference Engine Loaded.")
-    except Exception as e:
-        print(f"Failed to load Inference Engine: {e}")
-        app.state.inference_engine = None
+    # Inference + Memory load in parallel; VeriSnap loads on first image request
+    engines = EngineRegistry()
+    engines.register("inference", load_inference_engine)
+    engines.register("memory", load_memory_engine)
+    engines.register("provenance", load_provenance_engine, lazy=True)
+    app.state.engines = engines
+    await engines.load_eager()
+
+    app.state.inference_engine = engines.get("inference")
+    app.state.memory_engine = engines.get("memory")
+    for name, status in engines.status().items():
+        print(f"Engine {name}: {status['status']} ({status['load_seconds']}s)")
+
+    # Dedicated executors for blocking inference (CPU) and evidence gathering (network)
+    app.state.inference_executor = InferenceExecutor()
+    app.state.evidence_executor = InferenceExecutor(name="evidence")
+
+    # HTML extraction (search scraping and /memory/capture) runs in worker processes
+    from src.extraction import get_extract_pool
+    get_extract_pool().start()
+
+    # Start Batch Scheduler (replaces the global GPU lock)
+    app.state.batch_scheduler = None
+    if app.state.inference_engine:
+        app.state.batch_scheduler = BatchScheduler(
+            app.state.inference_engine,
+            executor=app.state.inference_executor,
+            evidence_executor=app.state.evidence_executor
+        )
+        await app.state.batch_scheduler.start()
 
-    # Load Memory Engine
-    try:
-        from src.memory_engine import MemoryEngine
-        app.state.memory_engine = MemoryEngine()
-        print("Memory Engine Loaded.")
-    except Exception as e:
-        print(f"Failed to load Memory Engine: {e}")
-        app.state.memory_engine = None
-        
     # Load Reputation List
     try:
         if os.path.exists("data/bad_domains.txt"):
@@ -52,6 +85,13 @@ async def lifespan(app: FastAPI):
     yield
     # Shutdown
     print("Shutting down API...")
+    if app.state.batch_scheduler:
+        await app.state.batch_scheduler.stop()
+    if app.state.inference_engine:
+        app.state.inference_engine.model_registry.shutdown()
+    app.state.inference_executor.shutdown()
+    app.state.evidence_executor.shutdown()
+    get_extract_pool().shutdown()
 
 app = FastAPI(title="Layers Verification API", lifespan=lifespan)
 
@@ -77,16 +117,27 @@ app.add_middleware(
 
 # Import and Include Routers
 # Note: We import here to avoid circular dependency if router imports main (it shouldn't)
-from api.routes import memory, keys, images, billing
+from api.routes import memory, keys, images, billing, admin
 app.include_router(memory.router)
 app.include_router(keys.router)
 app.include_router(images.router)
+app.include_router(admin.router)
 app.include_router(billing.router, prefix="/billing", tags=["Billing"])
 
 # --- Models ---
 class VerifyRequest(BaseModel):
     claim: str
     evidence: Optional[str] = None
+    # Auto-search only: score each source separately and attribute verdicts
+    per_source: bool = False
+    # Client's own timeout; auto-search stops early enough to answer within it
+    timeout_ms: Optional[int] = Field(default=None, gt=0)
+
+class SourceVerdict(BaseModel):
+    url: str
+    result: str
+    confidence: float
+    snippet: bool = False
 
 class VerifyResponse(BaseModel):
     result: str
@@ -94,44 +145,56 @@ class VerifyResponse(BaseModel):
     claim: str
     evidence: str
     sources: List[str] = []
+    source_verdicts: List[SourceVerdict] = []
+    # "prescreen" or "model": which stage decided the verdict
+    stage: Optional[str] = None
+    # Auto-search sources dropped because the time budget ran out
+    timed_out_sources: List[str] = []
+
+# Upper bound on pairs accepted by a single /verify/batch call
+MAX_VERIFY_BATCH_ITEMS = int(os.environ.get("VERIFY_BATCH_MAX_ITEMS", 500))
+
+class VerifyBatchItem(BaseModel):
+    claim: str
+    evidence: str
+
+class VerifyBatchRequest(BaseModel):
+    items: List[VerifyBatchItem] = Field(..., min_length=1, max_length=MAX_VERIFY_BATCH_ITEMS)
+
+class VerifyBatchResponse(BaseModel):
+    results: List[VerifyResponse]
+    credits_deducted: int
 
 # --- Endpoints ---
 
-@app.post("/verify", response_model=VerifyResponse)
-async def verify_claim(
-    request: VerifyRequest, 
-    background_tasks: BackgroundTasks,
-    user_id: str = Depends(get_current_user),
-    lock: asyncio.Lock = Depends(get_gpu_lock)
-):
-    inference_engine = getattr(app.state, "inference_engine", None)
-    if not inference_engine:
-        raise HTTPException(status_code=503, detail="Inference Engine not ready")
+def log_verification(user_id: str, claim: str, prediction: dict):
+    log_verifications(user_id, [{**prediction, "claim": claim}])
 
-    # Async Lock for GPU (Queueing)
-    async with lock:
-        prediction = inference_engine.verify_claim(request.claim, request.evidence)
-    
-    # Log to Supabase (Background)
-    def log_to_supabase():
-        try:
-            supabase.table("logs").insert({
+def log_verifications(user_id: str, predictions: List[dict]):
+    """
+    Logs many verifications with a single insert.
+    """
+    try:
+        supabase.table("logs").insert([
+            {
                 "user_id": user_id,
-                "claim": request.claim,
+                "claim": prediction["claim"],
                 "evidence": prediction["evidence"],
                 "result": prediction["result"],
                 "confidence": prediction["confidence"]
-            }).execute()
-        except Exception as e:
-            print(f"Logging Error: {e}")
-            
-    background_tasks.add_task(log_to_supabase)
-    
-    # Deduct Credits (Synchronous - CRITICAL: Must succeed before response)
-    # This prevents revenue loss from silent background task failures
+            }
+            for prediction in predictions
+        ]).execute()
+    except Exception as e:
+        print(f"Logging Error: {e}")
+
+async def charge_verification(user_id: str, amount: int = 1, action: str = "verify_claim"):
+    """
+    Deducts the credits for amount verifications. Raises HTTPException on failure.
+    """
     from api.billing import deduct_credits
     try:
-        await deduct_credits(user_id, 1, "verify_claim")
+        await deduct_credits(user_id, amount, action)
     except HTTPException:
         # Re-raise HTTP exceptions as-is (insufficient credits, user not found, etc.)
         raise
@@ -139,15 +202,200 @@ async def verify_claim(
         # Log unexpected billing errors
         print(f"CRITICAL - Billing Error: {e}")
         raise HTTPException(status_code=500, detail="Billing failed. Please try again.")
-    
+
+def to_verify_response(prediction: dict) -> VerifyResponse:
     return VerifyResponse(
         result=prediction["result"],
         confidence=prediction["confidence"],
         claim=prediction["claim"],
         evidence=prediction["evidence"],
-        sources=prediction.get("sources", [])
+        sources=prediction.get("sources", []),
+        source_verdicts=[SourceVerdict(**verdict) for verdict in prediction.get("source_verdicts", [])],
+        stage=prediction.get("stage"),
+        timed_out_sources=prediction.get("timed_out_sources", [])
+    )
+
+async def run_verification(batch_scheduler: BatchScheduler, request: VerifyRequest, on_progress=None) -> dict:
+    # Auto-search budget counts from now, not from when a worker picks it up
+    timeout = request.timeout_ms / 1000 if request.timeout_ms else None
+    deadline = batch_scheduler.engine.evidence_deadline(timeout)
+    if request.per_source and not request.evidence:
+        return await batch_scheduler.verify_claim_by_source(request.claim, on_progress=on_progress, deadline=deadline)
+    # Queued into a micro-batch with other concurrent requests
+    return await batch_scheduler.verify_claim(request.claim, request.evidence, on_progress=on_progress, deadline=deadline)
+
+@app.post("/verify", response_model=VerifyResponse)
+async def verify_claim(
+    request: VerifyRequest, 
+    background_tasks: BackgroundTasks,
+    user_id: str = Depends(get_current_user)
+):
+    batch_scheduler = getattr(app.state, "batch_scheduler", None)
+    if not batch_scheduler:
+        raise HTTPException(status_code=503, detail="Inference Engine not ready")
+
+    prediction = await run_verification(batch_scheduler, request)
+    
+    # Log to Supabase (Background)
+    background_tasks.add_task(log_verification, user_id, request.claim, prediction)
+    
+    # Deduct Credits (Synchronous - CRITICAL: Must succeed before response)
+    # This prevents revenue loss from silent background task failures
+    await charge_verification(user_id)
+    
+    return to_verify_response(prediction)
+
+def sse_event(event: str, data) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+@app.post("/verify/stream")
+async def verify_claim_stream(
+    request: VerifyRequest,
+    user_id: str = Depends(get_current_user)
+):
+    """
+    Streaming /verify (Server-Sent Events). Emits one event per pipeline stage:
+      sources   - search results found
+      source    - one source scraped (or fell back to its snippet)
+      evidence  - evidence assembled
+      verdict   - the VerifyResponse, sent once the credit is charged
+      error     - {"status", "detail"}; the stream ends
+    Closing the connection before the verdict cancels the request and
+    nothing is charged or logged.
+    """
+    batch_scheduler = getattr(app.state, "batch_scheduler", None)
+    if not batch_scheduler:
+        raise HTTPException(status_code=503, detail="Inference Engine not ready")
+
+    loop = asyncio.get_running_loop()
+    events = asyncio.Queue()
+    cancelled = threading.Event()
+    delivered = {}
+
+    def on_progress(event, data):
+        # Called from the search thread; stops scraping once the client is gone
+        if cancelled.is_set():
+            raise RuntimeError("Client disconnected")
+        loop.call_soon_threadsafe(events.put_nowait, (event, data))
+
+    async def stream():
+        task = asyncio.create_task(run_verification(batch_scheduler, request, on_progress))
+        task.add_done_callback(lambda _: loop.call_soon_threadsafe(events.put_nowait, None))
+        try:
+            while (item := await events.get()) is not None:
+                yield sse_event(*item)
+
+            try:
+                prediction = task.result()
+                await charge_verification(user_id)
+            except HTTPException as e:
+                yield sse_event("error", {"status": e.status_code, "detail": e.detail})
+                return
+            except Exception as e:
+                print(f"Streaming verification failed: {e}")
+                yield sse_event("error", {"status": 500, "detail": "Verification failed"})
+                return
+
+            delivered["prediction"] = prediction
+            yield sse_event("verdict", to_verify_response(prediction).model_dump())
+        finally:
+            cancelled.set()
+            task.cancel()
+
+    def log_if_delivered():
+        if "prediction" in delivered:
+            log_verification(user_id, request.claim, delivered["prediction"])
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        background=BackgroundTask(log_if_delivered)
     )
 
+@app.post("/verify/batch", response_model=VerifyBatchResponse)
+async def verify_claims_batch(
+    request: VerifyBatchRequest,
+    background_tasks: BackgroundTasks,
+    user_id: str = Depends(get_current_user)
+):
+    """
+    Verifies many claim/evidence pairs in one call.
+    Evidence is required for every item (no auto-search).
+    Cost: 1 Credit per item, charged once for the whole batch.
+    """
+    inference_engine = getattr(app.state, "inference_engine", None)
+    if not inference_engine:
+        raise HTTPException(status_code=503, detail="Inference Engine not ready")
+
+    # Fail fast before up to MAX_VERIFY_BATCH_ITEMS model passes; deduct_credits below stays the atomic charge
+    from api.billing import check_credits
+    await check_credits(user_id, len(request.items))
+
+    claims = [item.claim for item in request.items]
+    evidences = [item.evidence for item in request.items]
+
+    # Already batched, so skip the scheduler and run the chunks on the inference executor
+    predictions = await app.state.inference_executor.run(inference_engine.verify_batch, claims, evidences)
+
+    # Log to Supabase (Background)
+    background_tasks.add_task(log_verifications, user_id, predictions)
+
+    # Deduct Credits once for the whole batch
+    total_cost = len(predictions)
+    await charge_verification(user_id, total_cost, "verify_batch")
+
+    return VerifyBatchResponse(
+        results=[to_verify_response(prediction) for prediction in predictions],
+        credits_deducted=total_cost
+    )
+
+@app.get("/ready")
+async def ready():
+    """
+    Readiness probe: 200 once every startup engine is warm, 503 before.
+    Lazy engines are listed but don't block readiness.
+    """
+    engines = getattr(app.state, "engines", None)
+    is_ready = bool(engines and engines.ready())
+    return JSONResponse(
+        status_code=200 if is_ready else 503,
+        content={
+            "ready": is_ready,
+            "engines": engines.status() if engines else {}
+        }
+    )
+
+@app.get("/metrics", dependencies=[Depends(require_admin)])
+async def metrics():
+    """
+    Runtime counters for the inference pipeline (caches, batching).
+    Admin only: they reveal cache paths and the hosts being scraped.
+    """
+    inference_engine = getattr(app.state, "inference_engine", None)
+    batch_scheduler = getattr(app.state, "batch_scheduler", None)
+    inference_executor = getattr(app.state, "inference_executor", None)
+    evidence_executor = getattr(app.state, "evidence_executor", None)
+    from src.content_store import get_content_store
+    from src.http_client import get_http_client
+    from src.circuit_breaker import get_scrape_breaker
+    from src.extraction import get_extract_pool
+    return {
+        "verdict_cache": inference_engine.verdict_cache.stats() if inference_engine else None,
+        "token_cache": inference_engine.token_cache.stats() if inference_engine else None,
+        "session_pool": inference_engine.session_pool.stats() if inference_engine else None,
+        "prescreen": inference_engine.prescreen.stats() if inference_engine and inference_engine.prescreen else None,
+        "search_cache": inference_engine.search_engine.search_cache.stats() if inference_engine and inference_engine.search_engine.search_cache is not None else None,
+        "search_backends": [backend.stats() for backend in inference_engine.search_engine.backends] if inference_engine else None,
+        "content_store": get_content_store().stats(),
+        "extract_pool": get_extract_pool().stats(),
+        "scrape_breaker": get_scrape_breaker().stats(),
+        "http_client": get_http_client().stats(),
+        "batch_scheduler": batch_scheduler.stats() if batch_scheduler else None,
+        "inference_executor": inference_executor.stats() if inference_executor else None,
+        "evidence_executor": evidence_executor.stats() if evidence_executor else None
+    }
+
 @app.get("/reputation")
 async def check_reputation(domain: str):
     if domain in bad_domains:
@@ -0,0 +1,107 @@
+from fastapi import APIRouter, HTTPException, Depends, Request
+from pydantic import BaseModel, Field
+from typing import Optional
+import os
+from src.api.auth import require_admin
+from src.circuit_breaker import get_scrape_breaker
+from src.utils.logger import logger
+
+router = APIRouter(prefix="/admin", tags=["Admin"], dependencies=[Depends(require_admin)])
+
+# Candidate models may only be loaded from this directory
+MODEL_DIR = os.environ.get("MODEL_DIR", "models")
+
+class CandidateRequest(BaseModel):
+    model_path: str
+    session_pool_size: Optional[int] = Field(default=None, ge=1)
+
+class ShadowRequest(BaseModel):
+    rate: float = Field(ge=0.0, le=1.0)
+
+class BreakerResetRequest(BaseModel):
+    domain: Optional[str] = None
+
+def get_model_registry(request: Request):
+    inference_engine = getattr(request.app.state, "inference_engine", None)
+    if not inference_engine:
+        raise HTTPException(status_code=503, detail="Inference Engine not available")
+    return inference_engine.model_registry
+
+def resolve_model_path(model_path: str) -> str:
+    model_dir = os.path.realpath(MODEL_DIR)
+    resolved = os.path.realpath(os.path.join(model_dir, model_path))
+    if os.path.commonpath([model_dir, resolved]) != model_dir:
+        raise HTTPException(status_code=400, detail=f"Model must be inside {MODEL_DIR}/")
+    if not os.path.isfile(resolved):
+        raise HTTPException(status_code=404, detail="Model file not found")
+    return resolved
+
+@router.get("/models")
+async def model_status(registry=Depends(get_model_registry)):
+    """
+    Active, candidate and previous models plus shadow agreement/latency.
+    """
+    return registry.stats()
+
+@router.post("/models/candidate")
+async def load_candidate(body: CandidateRequest, request: Request, registry=Depends(get_model_registry)):
+    """
+    Loads a model next to the active one. Traffic keeps going to the
+    active model; a sample of batches is shadowed on the candidate.
+    """
+    model_path = resolve_model_path(body.model_path)
+    try:
+        candidate = await request.app.state.inference_executor.run(
+            registry.load_candidate, model_path, session_pool_size=body.session_pool_size
+        )
+    except Exception as e:
+        logger.error(f"Failed to load candidate model {model_path}: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Failed to load model: {e}")
+    return {"candidate": candidate}
+
+@router.post("/models/candidate/discard")
+async def discard_candidate(registry=Depends(get_model_registry)):
+    registry.discard_candidate()
+    return {"candidate": None}
+
+@router.post("/models/shadow")
+async def set_shadow_rate(body: ShadowRequest, registry=Depends(get_model_registry)):
+    registry.set_shadow_rate(body.rate)
+    return {"rate": registry.shadow_rate}
+
+@router.post("/models/promote")
+async def promote_candidate(registry=Depends(get_model_registry)):
+    """
+    Switches all traffic to the candidate. Cached verdicts are dropped.
+    """
+    try:
+        active = registry.promote()
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return {"active": active}
+
+@router.post("/models/rollback")
+async def rollback_model(registry=Depends(get_model_registry)):
+    try:
+        active = registry.rollback()
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return {"active": active}
+
+@router.get("/scrape/breakers")
+async def scrape_breakers():
+    """
+    Scrape breaker state of every domain with recent failures, plus the
+    negative URL cache.
+    """
+    breaker = get_scrape_breaker()
+    return {**breaker.stats(), "domains": breaker.domains()}
+
+@router.post("/scrape/breakers/reset")
+async def reset_scrape_breakers(body: BreakerResetRequest):
+    """
+    Closes one domain's breaker, or all of them (and clears the negative
+    URL cache) when no domain is given.
+    """
+    get_scrape_breaker().reset(body.domain)
+    return {"reset": body.domain or "all"}
@@ -5,17 +5,24 @@ import hashlib
 import logging
 from src.api.auth import get_current_user, supabase
 from src.api.billing import check_credits, deduct_credits
-from src.provenance_engine import ProvenanceEngine
 
 router = APIRouter(prefix="/images", tags=["VeriSnap"])
-provenance_engine = ProvenanceEngine()
+
+async def get_provenance_engine(request: Request):
+    """
+    VeriSnap engine, loaded on first use (cv2/mediapipe are heavy imports).
+    """
+    provenance_engine = await request.app.state.engines.aget("provenance")
+    if not provenance_engine:
+        raise HTTPException(status_code=503, detail="Provenance Engine not available")
+    return provenance_engine
 
 class ImageSignRequest(BaseModel):
     hash: str
     metadata: dict
 
 @router.post("/verify")
-async def verify_image(request: Request, file: UploadFile = File(...), user_id: str = Depends(get_current_user)):
+async def verify_image(request: Request, file: UploadFile = File(...), user_id: str = Depends(get_current_user), provenance_engine=Depends(get_provenance_engine)):
     """
     Layer 3: VeriSnap Analysis.
     Upload an image to detect manipulation.
@@ -74,7 +81,8 @@ async def check_liveness(
     request: Request, 
     challenge: int = File(...), 
     file: UploadFile = File(...), 
-    user_id: str = Depends(get_current_user)
+    user_id: str = Depends(get_current_user),
+    provenance_engine=Depends(get_provenance_engine)
 ):
     """
     Challenge-Response Liveness Check.
@@ -103,7 +111,7 @@ async def check_liveness(
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/sign")
-async def sign_image(request: Request, file: UploadFile = File(...), user_id: str = Depends(get_current_user)):
+async def sign_image(request: Request, file: UploadFile = File(...), user_id: str = Depends(get_current_user), provenance_engine=Depends(get_provenance_engine)):
     """
     Registers a 'REAL' image to prevent replay attacks.
     """
@@ -48,6 +48,7 @@ def chunk_text(text: str, chunk_size: int = 1000, overlap: int = 200) -> List[st
 @router.post("/add")
 async def add_memory(request: Request, body: MemoryAddRequest, user_id: str = Depends(get_current_user)):
     memory_engine = request.app.state.memory_engine
+    executor = request.app.state.inference_executor
     if not memory_engine:
         raise HTTPException(status_code=503, detail="Memory Engine not available")
 
@@ -63,7 +64,7 @@ async def add_memory(request: Request, body: MemoryAddRequest, user_id: str = De
     memories_data = []
     for i, chunk in enumerate(chunks):
         # Embed (Potential for batching here too if engine supports it)
-        embedding = memory_engine.embed_text(chunk)
+        embedding = await executor.run(memory_engine.embed_text, chunk)
         
         chunk_tags = body.tags + ([f"chunk:{i+1}/{len(chunks)}"] if len(chunks) > 1 else [])
         
@@ -111,14 +112,15 @@ async def add_verified_memory(request: Request, body: MemoryVerifiedRequest, use
     Layer 1 + Layer 2: Verify first, then Store.
     """
     # Cost: 3 Credits (1 Verify + 2 Save)
-    inference_engine = request.app.state.inference_engine
+    batch_scheduler = request.app.state.batch_scheduler
     memory_engine = request.app.state.memory_engine
+    executor = request.app.state.inference_executor
     
-    if not inference_engine or not memory_engine:
+    if not batch_scheduler or not memory_engine:
         raise HTTPException(status_code=503, detail="Engines not available")
 
     # 1. Verify with Trust OS (Layer 1)
-    prediction = inference_engine.verify_claim(body.claim, body.evidence)
+    prediction = await batch_scheduler.verify_claim(body.claim, body.evidence)
     
     if prediction["result"] == "FALSE":
         # Charge 1 credit for the verification attempt
@@ -132,7 +134,7 @@ async def add_verified_memory(request: Request, body: MemoryVerifiedRequest, use
     # 2. If TRUE, Store in Memory (Layer 2)
     full_content = f"{body.claim} (Evidence: {prediction['evidence']})"
     
-    embedding = memory_engine.embed_text(full_content)
+    embedding = await executor.run(memory_engine.embed_text, full_content)
     
     data = {
         "user_id": user_id,
@@ -164,7 +166,7 @@ async def search_memory(request: Request, body: MemorySearchRequest, user_id: st
         raise HTTPException(status_code=503, detail="Memory Engine not available")
 
     # 1. Embed Query
-    query_embedding = memory_engine.embed_text(body.query)
+    query_embedding = await request.app.state.inference_executor.run(memory_engine.embed_text, body.query)
     
     results = []
     try:
@@ -189,8 +191,9 @@ async def search_memory(request: Request, body: MemorySearchRequest, user_id: st
     
     return {"results": results}
 
-from bs4 import BeautifulSoup
-import httpx
+from src.http_client import get_http_client
+from src.content_store import get_content_store
+from src.extraction import extract_capture
 
 @router.post("/capture")
 async def capture_memory(request: Request, body: MemoryCaptureRequest, user_id: str = Depends(get_current_user)):
@@ -199,39 +202,30 @@ async def capture_memory(request: Request, body: MemoryCaptureRequest, user_id:
     """
     # Cost: 2 Credits (Storage)
     memory_engine = request.app.state.memory_engine
-    inference_engine = request.app.state.inference_engine
+    batch_scheduler = request.app.state.batch_scheduler
+    executor = request.app.state.inference_executor
     
     if not memory_engine:
         raise HTTPException(status_code=503, detail="Memory Engine not available")
 
-    # 1. Scrape URL
-    try:
-        async with httpx.AsyncClient() as client:
-            resp = await client.get(body.url, follow_redirects=True)
-            resp.raise_for_status()
-            
-        soup = BeautifulSoup(resp.text, 'html.parser')
-        
-        # Basic cleanup
-        for script in soup(["script", "style", "nav", "footer"]):
-            script.decompose()
-            
-        text = soup.get_text(separator=' ', strip=True)
-        content = text[:4000]
-        title = soup.title.string if soup.title else body.url
-        
-        full_content = f"Source: {body.url}\nTitle: {title}\n\n{content}"
-        
-    except Exception as e:
-        raise HTTPException(status_code=400, detail=f"Failed to fetch URL: {str(e)}")
+    # 1. Scrape URL (via the shared content store: unchanged pages are
+    # revalidated instead of downloaded and parsed again)
+    http = get_http_client()
+    page = await http.call(get_content_store().fetch(http, body.url, extract_capture, kind="capture"))
+    if not page:
+        raise HTTPException(status_code=400, detail=f"Failed to fetch URL: {body.url}")
+
+    content = page["text"]
+    title = page["title"] or body.url
+    full_content = f"Source: {body.url}\nTitle: {title}\n\n{content}"
 
     # 2. Verify (Optional)
     verification_result = None
     if body.verify:
-        if not inference_engine:
+        if not batch_scheduler:
              raise HTTPException(status_code=503, detail="Inference Engine not available for verification")
              
-        prediction = inference_engine.verify_claim(title, content[:500])
+        prediction = await batch_scheduler.verify_claim(title, content[:500])
         verification_result = prediction
         
         if prediction["result"] == "FALSE":
@@ -253,7 +247,7 @@ async def capture_memory(request: Request, body: MemoryCaptureRequest, user_id:
     
     memories_data = []
     for i, chunk in enumerate(chunks):
-        embedding = memory_engine.embed_text(chunk)
+        embedding = await executor.run(memory_engine.embed_text, chunk)
         chunk_tags = body.tags + ([f"chunk:{i+1}/{len(chunks)}"] if len(chunks) > 1 else [])
         
         memories_data.append({
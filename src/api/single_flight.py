@@ -0,0 +1,117 @@
+import asyncio
+import threading
+
+class _Flight:
+    """
+    One in-flight execution: its task, the deadline it runs to, how many
+    callers await it and the progress listeners of those callers.
+    """
+    def __init__(self, deadline=None):
+        self.task = None
+        self.deadline = deadline
+        self.waiters = 0
+        self.listeners = []
+        self.events = []
+        self.lock = threading.Lock()
+
+    def join(self, on_progress):
+        # Replay what already happened so late joiners see every stage
+        with self.lock:
+            for event, data in self.events:
+                on_progress(event, data)
+            self.listeners.append(on_progress)
+
+    def broadcast(self, event, data):
+        """
+        Progress callback handed to the shared execution. May be called
+        from any thread. Raises once no caller is left, so blocking work
+        that reports progress stops early.
+        """
+        with self.lock:
+            self.events.append((event, data))
+            for listener in list(self.listeners):
+                try:
+                    listener(event, data)
+                except Exception:
+                    # That caller has gone away (e.g. SSE client disconnected)
+                    self.listeners.remove(listener)
+            if not self.waiters:
+                raise RuntimeError("No callers left")
+
+class SingleFlight:
+    """
+    Coalesces identical concurrent calls. While a call for a key is running,
+    later callers with the same key await its result instead of starting
+    their own execution. Nothing is kept after it finishes; repeated work
+    over time is the caches' job.
+
+    Calls with a deadline only join an execution that will be done by
+    then: one whose deadline is at or before theirs. A caller whose budget
+    is shorter than every execution in flight starts its own.
+
+    The execution is cancelled only when every caller waiting on it has
+    been cancelled.
+    """
+    def __init__(self):
+        self._flights = {}
+
+        # Stats
+        self.executions = 0
+        self.coalesced = 0
+
+    async def do(self, key, fn, on_progress=None, deadline=None):
+        """
+        Runs fn(progress) once per key among concurrent callers and returns
+        its result to all of them. progress(event, data) reaches the
+        on_progress of every caller sharing the execution.
+
+        deadline (any comparable time, e.g. time.monotonic()) is when this
+        caller needs the result by; fn must finish by the deadline it was
+        started with. None means no deadline.
+        """
+        flight = self._join(key, deadline)
+        if flight is None:
+            flight = _Flight(deadline)
+            self._flights.setdefault(key, []).append(flight)
+            flight.task = asyncio.ensure_future(fn(flight.broadcast))
+            flight.task.add_done_callback(lambda _: self._finished(key, flight))
+            self.executions += 1
+        else:
+            self.coalesced += 1
+
+        if on_progress:
+            flight.join(on_progress)
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task)
+        finally:
+            flight.waiters -= 1
+            if not flight.waiters and not flight.task.done():
+                flight.task.cancel()
+                # Later callers start afresh instead of joining a cancelled task
+                self._finished(key, flight)
+
+    def _join(self, key, deadline):
+        """
+        The flight for key that finishes within deadline, preferring the
+        one with the most time (the most complete result), or None.
+        """
+        def finish(d):
+            return float("inf") if d is None else d
+
+        candidates = [flight for flight in self._flights.get(key, ()) if finish(flight.deadline) <= finish(deadline)]
+        return max(candidates, key=lambda flight: finish(flight.deadline), default=None)
+
+    def _finished(self, key, flight):
+        flights = self._flights.get(key)
+        if flights and flight in flights:
+            flights.remove(flight)
+            if not flights:
+                del self._flights[key]
+
+    def stats(self) -> dict:
+        return {
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+            "in_flight": sum(len(flights) for flights in self._flights.values())
+        }
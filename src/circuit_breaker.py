@@ -0,0 +1,148 @@
+import os
+import threading
+import time
+from urllib.parse import urlsplit
+from src.utils.cache import TTLCache
+
+def domain_of(url: str) -> str:
+    host = (urlsplit(url).hostname or "").lower()
+    return host[4:] if host.startswith("www.") else host
+
+class DomainState:
+    def __init__(self):
+        self.failures = 0
+        self.opened_at = None
+        self.probe_started = None
+        self.trips = 0
+
+class ScrapeCircuitBreaker:
+    """
+    Tracks scrape failures per domain so sites that block us or time out
+    stop costing a download on every claim.
+
+    After `threshold` consecutive failures a domain's breaker opens and its
+    URLs go straight to the snippet path for `cooldown` seconds. Then one
+    probe request is let through (half-open): success closes the breaker,
+    failure opens it for another cooldown. Independently, URLs that failed
+    are not retried for `negative_ttl` seconds.
+    """
+    def __init__(self, threshold=None, cooldown=None, negative_ttl=None):
+        self.threshold = threshold or int(os.environ.get("SCRAPE_BREAKER_THRESHOLD", 3))
+        self.cooldown = cooldown or float(os.environ.get("SCRAPE_BREAKER_COOLDOWN", 300))
+        self.failed_urls = TTLCache(
+            maxsize=int(os.environ.get("SCRAPE_NEGATIVE_CACHE_SIZE", 10000)),
+            ttl=negative_ttl or float(os.environ.get("SCRAPE_NEGATIVE_TTL", 600))
+        )
+
+        # Only domains with recent failures have an entry
+        self._domains = {}
+        self._lock = threading.Lock()
+
+        # Stats
+        self.short_circuited = 0
+
+    def _state(self, state, now):
+        if state.opened_at is None:
+            return "closed"
+        if now - state.opened_at < self.cooldown:
+            return "open"
+        return "half_open"
+
+    def allow(self, url: str) -> bool:
+        """
+        Whether url should be downloaded now. In the half-open state only
+        the first caller gets True until its probe is recorded.
+        """
+        if self.failed_urls.get(url) is not None:
+            return False
+
+        now = time.monotonic()
+        with self._lock:
+            state = self._domains.get(domain_of(url))
+            if state is None:
+                return True
+            status = self._state(state, now)
+            if status == "closed":
+                return True
+            # A probe that never reported back (e.g. cancelled) expires with the cooldown
+            if status == "half_open" and (state.probe_started is None or now - state.probe_started >= self.cooldown):
+                state.probe_started = now
+                return True
+            self.short_circuited += 1
+            return False
+
+    def record_success(self, url: str):
+        with self._lock:
+            self._domains.pop(domain_of(url), None)
+
+    def record_failure(self, url: str, negative_cache: bool = True):
+        """
+        Counts a failed download against url's domain and, unless
+        negative_cache is False, skips url itself for negative_ttl seconds.
+        """
+        if negative_cache:
+            self.failed_urls.set(url, True)
+        now = time.monotonic()
+        with self._lock:
+            domain = domain_of(url)
+            state = self._domains.get(domain)
+            if state is None:
+                state = self._domains[domain] = DomainState()
+            state.failures += 1
+            if state.probe_started is not None or (state.opened_at is None and state.failures >= self.threshold):
+                state.opened_at = now
+                state.probe_started = None
+                state.trips += 1
+
+    def reset(self, domain: str = None):
+        """
+        Closes the breaker of one domain, or of all domains. Resetting all
+        also clears the negative cache.
+        """
+        with self._lock:
+            if domain is None:
+                self._domains.clear()
+            else:
+                self._domains.pop(domain_of(f"//{domain}"), None)
+        if domain is None:
+            self.failed_urls.clear()
+
+    def domains(self) -> dict:
+        """
+        Breaker state per domain with recent failures.
+        """
+        now = time.monotonic()
+        with self._lock:
+            return {
+                domain: {
+                    "state": self._state(state, now),
+                    "failures": state.failures,
+                    "trips": state.trips,
+                    "retry_in": round(max(self.cooldown - (now - state.opened_at), 0.0), 1) if state.opened_at is not None else None
+                }
+                for domain, state in self._domains.items()
+            }
+
+    def stats(self) -> dict:
+        domains = self.domains()
+        return {
+            "threshold": self.threshold,
+            "cooldown": self.cooldown,
+            "tracked_domains": len(domains),
+            "open": sum(1 for d in domains.values() if d["state"] != "closed"),
+            "short_circuited": self.short_circuited,
+            "negative_cache": self.failed_urls.stats()
+        }
+
+_scrape_breaker = None
+_scrape_breaker_lock = threading.Lock()
+
+def get_scrape_breaker() -> ScrapeCircuitBreaker:
+    """
+    Returns the process-wide breaker, creating it on first use.
+    """
+    global _scrape_breaker
+    with _scrape_breaker_lock:
+        if _scrape_breaker is None:
+            _scrape_breaker = ScrapeCircuitBreaker()
+        return _scrape_breaker
@@ -0,0 +1,146 @@
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from src.extraction import get_extract_pool
+
+class ContentEntry:
+    def __init__(self, value, etag, last_modified, size):
+        self.value = value
+        self.etag = etag
+        self.last_modified = last_modified
+        self.size = size
+        self.checked_at = time.monotonic()
+
+class ContentStore:
+    """
+    Extracted page content keyed by URL, kept with the page's ETag and
+    Last-Modified headers.
+
+    Entries younger than fresh_seconds are served without a request. Older
+    ones are revalidated with a conditional GET: a 304 keeps the stored
+    content without downloading or extracting again. The store is bounded
+    by the total size of the stored content and evicts least recently
+    used entries.
+
+    `kind` separates different extractions of the same URL (search
+    passages vs. /memory/capture). Extraction runs on extract_pool
+    (default: the shared ExtractPool).
+    """
+    def __init__(self, max_bytes=None, fresh_seconds=None, extract_pool=None):
+        self.max_bytes = max_bytes or int(os.environ.get("CONTENT_STORE_MAX_BYTES", 64 * 1024 * 1024))
+        if fresh_seconds is None:
+            fresh_seconds = float(os.environ.get("CONTENT_STORE_FRESH_SECONDS", 300))
+        self.fresh_seconds = fresh_seconds
+        self.extract_pool = extract_pool or get_extract_pool()
+
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.bytes = 0
+
+        # Stats
+        self.hits = 0
+        self.revalidated = 0
+        self.fetched = 0
+        self.failures = 0
+
+    @staticmethod
+    def _size(value):
+        if isinstance(value, str):
+            return len(value.encode("utf-8"))
+        return len(json.dumps(value).encode("utf-8"))
+
+    def get(self, url, kind="text"):
+        with self._lock:
+            entry = self._entries.get((kind, url))
+            if entry is not None:
+                self._entries.move_to_end((kind, url))
+            return entry
+
+    def put(self, url, value, etag=None, last_modified=None, kind="text"):
+        entry = ContentEntry(value, etag, last_modified, self._size(value))
+        with self._lock:
+            old = self._entries.pop((kind, url), None)
+            if old is not None:
+                self.bytes -= old.size
+            if entry.size > self.max_bytes:
+                return
+            self._entries[(kind, url)] = entry
+            self.bytes += entry.size
+            while self.bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.bytes -= evicted.size
+
+    async def fetch(self, http, url, extract, kind="text", timeout=None):
+        """
+        Returns the extracted content for url, downloading and running
+        extract(content, encoding) on the extraction pool only when the
+        stored copy is missing or has changed. extract must be a picklable
+        module-level function (see src.extraction). Returns None if the
+        page cannot be fetched and nothing is stored. Must run on http's
+        event loop.
+        """
+        entry = self.get(url, kind)
+        if entry is not None and time.monotonic() - entry.checked_at < self.fresh_seconds:
+            self.hits += 1
+            return entry.value
+
+        headers = {}
+        if entry is not None:
+            if entry.etag:
+                headers["If-None-Match"] = entry.etag
+            if entry.last_modified:
+                headers["If-Modified-Since"] = entry.last_modified
+
+        response = await http.fetch_response(url, timeout=timeout, headers=headers or None)
+        if response is None:
+            self.failures += 1
+            # Serve the stale copy rather than nothing
+            return entry.value if entry is not None else None
+
+        if response.status_code == 304 and entry is not None:
+            self.revalidated += 1
+            entry.checked_at = time.monotonic()
+            return entry.value
+
+        if response.content is None:
+            return None
+
+        self.fetched += 1
+        value = await self.extract_pool.run(extract, response.content, response.encoding)
+        if value:
+            self.put(url, value, response.etag, response.last_modified, kind)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "bytes": self.bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "revalidated": self.revalidated,
+            "fetched": self.fetched,
+            "failures": self.failures
+        }
+
+_content_store = None
+_content_store_lock = threading.Lock()
+
+def get_content_store() -> ContentStore:
+    """
+    The process-wide content store shared by SearchEngine and /memory/capture.
+    """
+    global _content_store
+    with _content_store_lock:
+        if _content_store is None:
+            _content_store = ContentStore()
+        return _content_store
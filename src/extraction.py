@@ -0,0 +1,176 @@
+import asyncio
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import trafilatura
+from bs4 import BeautifulSoup
+from src.utils.logger import logger
+
+# Extractors run in worker processes: module-level functions of
+# (content bytes, charset from the Content-Type header or None)
+
+def _markup(content: bytes, encoding: str = None):
+    # Without a declared charset the parsers sniff it from the page itself
+    if encoding:
+        try:
+            return content.decode(encoding, errors="replace")
+        except LookupError:
+            pass
+    return content
+
+def extract_article(content: bytes, encoding: str = None) -> str:
+    """
+    Main text of a page, via Trafilatura ("" when there is none).
+    """
+    try:
+        return trafilatura.extract(_markup(content, encoding)) or ""
+    except Exception as e:
+        logger.error(f"Extraction failed: {e}")
+        return ""
+
+def extract_capture(content: bytes, encoding: str = None) -> dict:
+    """
+    Title and visible text (first 4000 chars) of a page for /memory/capture.
+    """
+    soup = BeautifulSoup(content, 'html.parser', from_encoding=encoding)
+
+    # Basic cleanup
+    for script in soup(["script", "style", "nav", "footer"]):
+        script.decompose()
+
+    text = soup.get_text(separator=' ', strip=True)
+    return {
+        "title": str(soup.title.string) if soup.title and soup.title.string else None,
+        "text": text[:4000]
+    }
+
+def _ready():
+    return True
+
+class ExtractPool:
+    """
+    Worker processes for HTML extraction, so parsing a large page does not
+    hold the serving process's GIL. Shared by search scraping and
+    /memory/capture through the content store.
+
+    Each job gets `timeout` seconds. A worker that overruns it cannot be
+    interrupted, so the pool is replaced and its processes killed; other
+    jobs still running there fail like any failed extraction.
+
+    Workers are spawned (they import __main__), so scripts using the pool
+    need an `if __name__ == "__main__":` guard. workers=0 runs jobs on a
+    thread pool in this process instead (no isolation or hard timeout; for
+    tests and debugging).
+    """
+    def __init__(self, workers=None, timeout=None):
+        if workers is None:
+            workers = int(os.environ.get("EXTRACT_WORKERS", min(4, os.cpu_count() or 1)))
+        self.workers = workers
+        self.timeout = timeout or float(os.environ.get("EXTRACT_TIMEOUT", 10))
+        self._executor = None
+        self._lock = threading.Lock()
+
+        # Stats
+        self.jobs = 0
+        self.running = 0
+        self.timeouts = 0
+        self.errors = 0
+        self.restarts = 0
+        self.bytes = 0
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                if self.workers > 0:
+                    # spawn: forking a process with running threads is unsafe
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.workers,
+                        mp_context=multiprocessing.get_context("spawn")
+                    )
+                else:
+                    self._executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="extract")
+            return self._executor
+
+    def start(self):
+        """
+        Starts the workers ahead of the first page (each imports the
+        parsers, which takes a moment).
+        """
+        executor = self._get_executor()
+        for _ in range(max(self.workers, 1)):
+            executor.submit(_ready)
+
+    async def run(self, extract, content: bytes, encoding: str = None):
+        """
+        Returns extract(content, encoding) computed on a worker, or None if
+        it raised, crashed or exceeded the timeout.
+        """
+        executor = self._get_executor()
+        self.jobs += 1
+        self.running += 1
+        self.bytes += len(content)
+        try:
+            future = executor.submit(extract, content, encoding)
+            return await asyncio.wait_for(asyncio.wrap_future(future), self.timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            logger.warning(f"Extraction of {len(content)} bytes exceeded {self.timeout}s")
+            self._replace(executor)
+        except BrokenProcessPool as e:
+            self.errors += 1
+            logger.warning(f"Extraction worker died: {e}")
+            self._replace(executor)
+        except Exception as e:
+            self.errors += 1
+            logger.error(f"Extraction failed: {e}")
+        finally:
+            self.running -= 1
+        return None
+
+    def _replace(self, executor):
+        if not isinstance(executor, ProcessPoolExecutor):
+            return
+        with self._lock:
+            if self._executor is not executor:
+                # Already replaced by another job
+                return
+            self._executor = None
+            self.restarts += 1
+        for process in list((executor._processes or {}).values()):
+            process.kill()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            logger.info("Shutting down extraction workers")
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "processes": self.workers > 0,
+            "timeout": self.timeout,
+            "jobs": self.jobs,
+            "running": self.running,
+            "timeouts": self.timeouts,
+            "errors": self.errors,
+            "restarts": self.restarts,
+            "bytes": self.bytes
+        }
+
+_extract_pool = None
+_extract_pool_lock = threading.Lock()
+
+def get_extract_pool() -> ExtractPool:
+    """
+    Returns the process-wide extraction pool, creating it on first use.
+    """
+    global _extract_pool
+    with _extract_pool_lock:
+        if _extract_pool is None:
+            _extract_pool = ExtractPool()
+        return _extract_pool
@@ -0,0 +1,301 @@
+import asyncio
+import importlib.util
+import os
+import socket
+import threading
+import time
+import urllib.request
+from contextlib import asynccontextmanager
+import httpcore
+import httpx
+from src.utils.logger import logger
+
+USER_AGENT = "Mozilla/5.0 (compatible; LayersBot/1.0)"
+
+class DNSCache:
+    """
+    getaddrinfo results per (host, port), kept for ttl seconds. Concurrent
+    lookups of the same host share one resolution.
+    """
+    def __init__(self, ttl=None):
+        self.ttl = ttl if ttl is not None else float(os.environ.get("DNS_CACHE_TTL", 300))
+        self._entries = {}
+        self._pending = {}
+        self.hits = 0
+        self.misses = 0
+
+    async def resolve(self, host, port) -> list:
+        key = (host, port)
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            self.hits += 1
+            return entry[1]
+        if key in self._pending:
+            self.hits += 1
+            return await asyncio.shield(self._pending[key])
+
+        self.misses += 1
+        future = self._pending[key] = asyncio.ensure_future(self._lookup(host, port))
+        future.add_done_callback(lambda _: self._resolved(key, future))
+        # Shielded: a cancelled caller does not cancel the others' lookup
+        return await asyncio.shield(future)
+
+    async def _lookup(self, host, port):
+        infos = await asyncio.get_running_loop().getaddrinfo(host, port, type=socket.SOCK_STREAM)
+        return list(dict.fromkeys(info[4][0] for info in infos))
+
+    def _resolved(self, key, future):
+        del self._pending[key]
+        if not future.cancelled() and future.exception() is None:
+            self._entries[key] = (time.monotonic() + self.ttl, future.result())
+
+    def stats(self) -> dict:
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+class CachingNetworkBackend(httpcore.AsyncNetworkBackend):
+    """
+    httpcore network backend that connects to cached addresses. TLS still
+    uses the original host name for SNI and certificate checks.
+    """
+    def __init__(self, backend, dns_cache):
+        self.backend = backend
+        self.dns_cache = dns_cache
+
+    async def connect_tcp(self, host, port, timeout=None, local_address=None, socket_options=None):
+        try:
+            addresses = await self.dns_cache.resolve(host, port)
+        except OSError as e:
+            raise httpcore.ConnectError(f"Could not resolve {host}: {e}") from e
+        error = None
+        for address in addresses:
+            try:
+                return await self.backend.connect_tcp(address, port, timeout=timeout, local_address=local_address, socket_options=socket_options)
+            except (httpcore.ConnectError, httpcore.ConnectTimeout) as e:
+                error = e
+        raise error
+
+    async def connect_unix_socket(self, path, timeout=None, socket_options=None):
+        return await self.backend.connect_unix_socket(path, timeout=timeout, socket_options=socket_options)
+
+    async def sleep(self, seconds):
+        await self.backend.sleep(seconds)
+
+class FetchResponse:
+    """
+    Status, raw body (None for 304), declared charset and validators of a
+    fetched page.
+    """
+    def __init__(self, status_code, content, headers, encoding=None):
+        self.status_code = status_code
+        self.content = content
+        self.encoding = encoding
+        self.etag = headers.get("etag")
+        self.last_modified = headers.get("last-modified")
+
+    @property
+    def text(self):
+        if self.content is None:
+            return None
+        return self.content.decode(self.encoding or "utf-8", errors="replace")
+
+class AsyncHTTPClient:
+    """
+    One httpx.AsyncClient shared by the whole process for all outbound
+    HTTP, running on its own event loop in a background thread.
+    Synchronous code (SearchEngine runs on worker threads) submits
+    coroutines with run(); other event loops await them with call().
+
+    Connections are kept alive and reused (HTTP/2 when the h2 package is
+    installed and HTTP2 is not "off"), DNS answers are cached, and at most
+    max_per_host requests run against any one host at a time.
+    """
+    def __init__(self, timeout=None, max_connections=None, max_bytes=None, max_per_host=None):
+        self.timeout = timeout or float(os.environ.get("SCRAPE_TIMEOUT", 5))
+        self.connect_timeout = min(self.timeout, float(os.environ.get("HTTP_CONNECT_TIMEOUT", 3)))
+        self.max_connections = max_connections or int(os.environ.get("HTTP_MAX_CONNECTIONS", 100))
+        self.max_per_host = max_per_host or int(os.environ.get("HTTP_MAX_PER_HOST", 6))
+        # Pages larger than this are cut off (trafilatura only needs the article)
+        self.max_bytes = max_bytes or int(os.environ.get("SCRAPE_MAX_BYTES", 5 * 1024 * 1024))
+        self.http2 = os.environ.get("HTTP2", "on") != "off" and importlib.util.find_spec("h2") is not None
+        self.dns_cache = DNSCache()
+
+        # Per-host slots; only touched on the client's loop
+        self._host_slots = {}
+        self._host_users = {}
+        self._in_flight = {}
+        self._pool = None
+
+        # Stats
+        self.requests = 0
+        self.errors = 0
+        self.timeouts = 0
+        self.host_waits = 0
+        self.bytes_received = 0
+
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self.loop.run_forever, name="http-client", daemon=True)
+        self._thread.start()
+        self._client = self.run(self._create_client())
+
+    async def _create_client(self):
+        limits = httpx.Limits(max_connections=self.max_connections, max_keepalive_connections=self.max_connections // 5)
+        kwargs = {}
+        # Proxies from the environment only apply without an explicit transport
+        if not urllib.request.getproxies():
+            transport = httpx.AsyncHTTPTransport(limits=limits, http2=self.http2)
+            # httpx has no resolver hook: give its pool a DNS-caching network backend
+            transport._pool = self._pool = httpcore.AsyncConnectionPool(
+                ssl_context=httpx.create_ssl_context(),
+                max_connections=limits.max_connections,
+                max_keepalive_connections=limits.max_keepalive_connections,
+                keepalive_expiry=limits.keepalive_expiry,
+                http2=self.http2,
+                network_backend=CachingNetworkBackend(httpcore.AnyIOBackend(), self.dns_cache)
+            )
+            kwargs["transport"] = transport
+        return httpx.AsyncClient(
+            follow_redirects=True,
+            headers={"User-Agent": USER_AGENT},
+            limits=limits,
+            http2=self.http2,
+            timeout=httpx.Timeout(self.timeout, connect=self.connect_timeout),
+            **kwargs
+        )
+
+    @asynccontextmanager
+    async def _host_slot(self, url):
+        """
+        Holds one of the host's max_per_host request slots.
+        """
+        host = httpx.URL(url).host
+        slot = self._host_slots.get(host)
+        if slot is None:
+            slot = self._host_slots[host] = asyncio.Semaphore(self.max_per_host)
+        self._host_users[host] = self._host_users.get(host, 0) + 1
+        try:
+            if slot.locked():
+                self.host_waits += 1
+            async with slot:
+                self._in_flight[host] = self._in_flight.get(host, 0) + 1
+                try:
+                    yield
+                finally:
+                    self._in_flight[host] -= 1
+                    if not self._in_flight[host]:
+                        del self._in_flight[host]
+        finally:
+            self._host_users[host] -= 1
+            if not self._host_users[host]:
+                del self._host_users[host]
+                del self._host_slots[host]
+
+    def run(self, coro):
+        """
+        Runs a coroutine on the client's loop and blocks until it finishes.
+        """
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result()
+
+    async def call(self, coro):
+        """
+        Awaits a coroutine on the client's loop from another event loop
+        (e.g. the API's).
+        """
+        return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, self.loop))
+
+    async def fetch(self, url: str, timeout: float = None):
+        """
+        GETs url and returns the body as text, or None on any error,
+        non-200 status or when timeout (seconds, whole request) expires.
+        """
+        response = await self.fetch_response(url, timeout=timeout)
+        return response.text if response and response.status_code == 200 else None
+
+    async def fetch_response(self, url: str, timeout: float = None, headers: dict = None):
+        """
+        GETs url and returns a FetchResponse for 200 and 304 responses,
+        or None on any error, other status or timeout. Pass If-None-Match /
+        If-Modified-Since in headers for a conditional request.
+        """
+        try:
+            return await asyncio.wait_for(self._get(url, headers), timeout or self.timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            logger.warning(f"Fetch timed out for {url}")
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"Fetch failed for {url}: {e}")
+        return None
+
+    async def _get(self, url: str, headers: dict = None):
+        async with self._host_slot(url):
+            self.requests += 1
+            async with self._client.stream("GET", url, headers=headers) as response:
+                if response.status_code == 304:
+                    return FetchResponse(304, None, response.headers)
+                if response.status_code != 200:
+                    logger.warning(f"Fetch returned {response.status_code} for {url}")
+                    return None
+                body = bytearray()
+                async for chunk in response.aiter_bytes():
+                    body.extend(chunk)
+                    if len(body) >= self.max_bytes:
+                        break
+                self.bytes_received += len(body)
+                return FetchResponse(200, bytes(body[:self.max_bytes]), response.headers, response.charset_encoding)
+
+    async def request(self, method: str, url: str, timeout: float = None, **kwargs) -> httpx.Response:
+        """
+        Sends a buffered request (any httpx.AsyncClient.request kwargs)
+        under the host's concurrency limit. timeout (seconds) covers the
+        whole request, as in fetch(). Unlike fetch(), errors raise, and a
+        timeout raises httpx.TimeoutException.
+        """
+        async with self._host_slot(url):
+            self.requests += 1
+            try:
+                response = await asyncio.wait_for(self._client.request(method, url, **kwargs), timeout or self.timeout)
+            except (asyncio.TimeoutError, httpx.TimeoutException) as e:
+                self.timeouts += 1
+                raise httpx.TimeoutException(f"Request to {url} timed out") from e
+            except Exception:
+                self.errors += 1
+                raise
+            self.bytes_received += len(response.content)
+            return response
+
+    def stats(self) -> dict:
+        connections = list(self._pool.connections) if self._pool is not None else []
+        in_flight = dict(self._in_flight)
+        busiest = sorted(in_flight.items(), key=lambda item: -item[1])[:5]
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "timeouts": self.timeouts,
+            "bytes_received": self.bytes_received,
+            "in_flight": sum(in_flight.values()),
+            "busiest_hosts": dict(busiest),
+            "host_waits": self.host_waits,
+            "max_per_host": self.max_per_host,
+            "http2": self.http2,
+            "connections": len(connections),
+            "idle_connections": sum(1 for connection in connections if connection.is_idle()),
+            "http2_connections": sum(1 for connection in connections if "HTTP/2" in connection.info()),
+            "dns_cache": self.dns_cache.stats()
+        }
+
+    def close(self):
+        self.run(self._client.aclose())
+        self.loop.call_soon_threadsafe(self.loop.stop)
+
+_http_client = None
+_http_client_lock = threading.Lock()
+
+def get_http_client() -> AsyncHTTPClient:
+    """
+    Returns the process-wide client, creating it on first use.
+    """
+    global _http_client
+    with _http_client_lock:
+        if _http_client is None:
+            _http_client = AsyncHTTPClient()
+        return _http_client
@@ -1,11 +1,40 @@
-import onnxruntime as ort
-from transformers import DistilBertTokenizer
+from transformers import DistilBertTokenizer, DistilBertTokenizerFast
 import numpy as np
 import os
+import hashlib
+import threading
+import time
 from src.search_engine import SearchEngine
+from src.utils.cache import LRUCache, TTLCache
+from src.session_pool import SessionPool
+from src.prescreen import LexicalPrescreen
+from src.model_registry import ModelRegistry
+
+ENTAILMENT, CONTRADICTION = 1, 0
+AGGREGATION_STRATEGIES = ("max_entailment", "max_contradiction", "max_confidence", "mean")
+
+def aggregate_probs(probs, strategy="max_entailment"):
+    """
+    Combines several probability rows (one per evidence window or source)
+    into a single row.
+      max_entailment: the row most in favour of the claim
+      max_contradiction: the row most against the claim
+      max_confidence: the row with the most confident prediction
+      mean: the average of all rows
+    """
+    probs = np.asarray(probs)
+    if strategy == "max_entailment":
+        return probs[np.argmax(probs[:, ENTAILMENT])]
+    if strategy == "max_contradiction":
+        return probs[np.argmax(probs[:, CONTRADICTION])]
+    if strategy == "max_confidence":
+        return probs[np.argmax(probs.max(axis=-1))]
+    if strategy == "mean":
+        return probs.mean(axis=0)
+    raise ValueError(f"Unknown aggregation strategy: {strategy}")
 
 class InferenceEngine:
-    def __init__(self, model_path="models/model_quant.onnx", tokenizer_path="./final_judge_model", confidence_threshold=0.75):
+    def __init__(self, model_path="models/model_quant.onnx", tokenizer_path="./final_judge_model", confidence_threshold=0.75, batch_size=None, padding_strategy=None, token_cache_size=None, session_pool_size=None, session_options=None, evidence_mode=None, prescreen=None):
         print(f"Loading Inference Engine...")
         print(f"Model: {model_path}")
         print(f"Tokenizer: {tokenizer_path}")
@@ -14,90 +43,546 @@ class InferenceEngine:
             raise FileNotFoundError(f"Model file not found at {model_path}")
 
         try:
-            self.session = ort.InferenceSession(model_path)
-            self.tokenizer = DistilBertTokenizer.from_pretrained(tokenizer_path)
+            # Pool of sessions (ORT_SESSION_POOL_SIZE) sharing one SessionOptions config
+            self.session_pool = SessionPool.from_model(model_path, size=session_pool_size, options=session_options)
+            self.session = self.session_pool.sessions[0]
+            self.tokenizer = self._load_tokenizer(tokenizer_path)
         except Exception as e:
             raise RuntimeError(f"Failed to load model or tokenizer: {e}")
 
         self.labels = {0: "FALSE", 1: "TRUE"} # 0=Contradiction, 1=Entailment
         self.confidence_threshold = confidence_threshold
+        # Max pairs per ONNX call when verifying large batches
+        self.batch_size = batch_size or int(os.environ.get("INFERENCE_BATCH_SIZE", 64))
+
+        # Tokenization: "dynamic" pads each length bucket only to its longest
+        # sequence (the exported model has a dynamic sequence_length axis),
+        # "max_length" always pads to max_length like the original pipeline.
+        self.max_length = 128
+        self.padding_strategy = padding_strategy or os.environ.get("INFERENCE_PADDING", "dynamic")
+        if self.padding_strategy not in ("dynamic", "max_length"):
+            raise ValueError(f"Unknown padding strategy: {self.padding_strategy}")
+        self.length_buckets = (32, 64, 128)
+
+        # Long evidence: "truncate" keeps the first max_length tokens, "window"
+        # splits the evidence into overlapping windows paired with the claim,
+        # scores them all in one batch and aggregates the per-window probabilities.
+        self.evidence_mode = evidence_mode or os.environ.get("EVIDENCE_MODE", "truncate")
+        if self.evidence_mode not in ("truncate", "window"):
+            raise ValueError(f"Unknown evidence mode: {self.evidence_mode}")
+        self.window_overlap = int(os.environ.get("EVIDENCE_WINDOW_OVERLAP", 32))
+        self.max_windows = int(os.environ.get("EVIDENCE_MAX_WINDOWS", 8))
+        self.window_aggregation = os.environ.get("EVIDENCE_WINDOW_AGGREGATION", "max_entailment")
+        if self.window_aggregation not in AGGREGATION_STRATEGIES:
+            raise ValueError(f"Unknown aggregation strategy: {self.window_aggregation}")
+        # How per-source scores combine into the overall verdict
+        self.source_aggregation = os.environ.get("SOURCE_AGGREGATION", "max_confidence")
+        if self.source_aggregation not in AGGREGATION_STRATEGIES:
+            raise ValueError(f"Unknown aggregation strategy: {self.source_aggregation}")
+
+        # Token ids per claim/evidence string. The watchdog re-sends the same
+        # sentences constantly, so most lookups skip the tokenizer entirely.
+        self.token_cache = LRUCache(token_cache_size or int(os.environ.get("TOKEN_CACHE_SIZE", 10000)))
         
-        # Initialize Search Engine
+        # Verdict cache, keyed on normalized claim + evidence + model version.
+        # Auto-searched verdicts expire sooner since the web evidence changes.
+        self.model_path = model_path
+        self.model_version = self._model_version(model_path)
+        # Guards the (session_pool, model_version) pair during hot-swaps
+        self._model_lock = threading.Lock()
+        self.verdict_cache = TTLCache(
+            int(os.environ.get("VERDICT_CACHE_SIZE", 5000)),
+            ttl=float(os.environ.get("VERDICT_CACHE_TTL", 3600))
+        )
+        self.search_verdict_ttl = float(os.environ.get("VERDICT_CACHE_SEARCH_TTL", 300))
+
+        # Cheap lexical stage, opt-in (PRESCREEN=lexical): only ambiguous pairs reach the model
+        if prescreen is None:
+            prescreen = os.environ.get("PRESCREEN", "off") != "off"
+        self.prescreen = LexicalPrescreen() if prescreen else None
+
+        # Candidate models, hot-swap and shadow inference
+        self.model_registry = ModelRegistry(self)
+
+        # Time allowed for auto-search (search + scraping); sources still
+        # downloading after that are dropped. A client timeout shortens it,
+        # keeping evidence_inference_reserve for the model.
+        self.evidence_budget = float(os.environ.get("EVIDENCE_BUDGET", 1.5))
+        self.evidence_inference_reserve = float(os.environ.get("EVIDENCE_INFERENCE_RESERVE", 0.25))
+
+        # Initialize Search Engine (safe to share between concurrent requests)
         try:
             self.search_engine = SearchEngine()
         except Exception as e:
             raise RuntimeError(f"Failed to initialize SearchEngine: {e}")
         
+    @staticmethod
+    def _load_tokenizer(tokenizer_path):
+        """
+        Prefers the Rust-backed fast tokenizer, falling back to the pure-Python one.
+        """
+        try:
+            return DistilBertTokenizerFast.from_pretrained(tokenizer_path)
+        except Exception as e:
+            print(f"Fast tokenizer unavailable ({e}), using DistilBertTokenizer.")
+            return DistilBertTokenizer.from_pretrained(tokenizer_path)
+
+    @staticmethod
+    def _model_version(model_path):
+        """
+        Content hash of the model file, so cached verdicts never outlive a model change.
+        """
+        digest = hashlib.sha256()
+        with open(model_path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+        return digest.hexdigest()[:16]
+
+    def _verdict_key(self, claim, evidence=None):
+        normalize = lambda text: " ".join(text.split())
+        # evidence=None marks an auto-searched verdict
+        evidence_part = "\x01" if evidence is None else normalize(evidence)
+        raw = "\x00".join([self.model_version, self.evidence_mode, normalize(claim), evidence_part])
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def lookup_verdict(self, claim, evidence=None):
+        """
+        Returns a copy of the cached prediction for this pair, or None.
+        """
+        cached = self.verdict_cache.get(self._verdict_key(claim, evidence))
+        return dict(cached) if cached is not None else None
+
+    def store_verdict(self, claim, evidence, prediction):
+        """
+        Caches a prediction. Errors are never cached.
+        """
+        if prediction.get("result") == "ERROR":
+            return
+        # Computed by a model that has since been swapped out
+        if prediction.get("model_version", self.model_version) != self.model_version:
+            return
+        ttl = self.search_verdict_ttl if evidence is None else None
+        self.verdict_cache.set(self._verdict_key(claim, evidence), dict(prediction), ttl=ttl)
+
+    def invalidate_verdicts(self):
+        self.verdict_cache.clear()
+
+    def activate_model(self, session_pool, model_version, model_path):
+        """
+        Switches inference to another loaded model. Batches already running
+        finish on the model they started with.
+        """
+        with self._model_lock:
+            self.session_pool = session_pool
+            self.session = session_pool.sessions[0]
+            self.model_version = model_version
+            self.model_path = model_path
+        self.invalidate_verdicts()
+
     def softmax(self, x):
-        e_x = np.exp(x - np.max(x))
-        return e_x / e_x.sum()
+        # Row-wise over the last axis, so a whole logits matrix is handled in one call
+        e_x = np.exp(x - np.max(x, axis=-1, keepdims=True))
+        return e_x / e_x.sum(axis=-1, keepdims=True)
 
-    def verify_claim(self, claim, evidence=None):
+    def evidence_deadline(self, timeout=None):
         """
-        Verifies a claim. If evidence is missing, searches the web.
+        time.monotonic() deadline for auto-search, starting now. timeout is
+        the caller's own limit in seconds, if it has one.
         """
-        sources = []
-        # Auto-Search Logic
-        if not evidence:
-            print(f"No evidence provided. Auto-searching for: {claim}")
-            evidence = self.search_engine.get_evidence(claim)
-            sources = self.search_engine.get_last_sources()
-            if not evidence:
-                return {
-                    "claim": claim,
-                    "evidence": "",
-                    "result": "UNCERTAIN",
-                    "confidence": 0.0,
-                    "raw_probs": [0.5, 0.5],
-                    "sources": sources
-                }
+        budget = self.evidence_budget
+        if timeout is not None:
+            budget = min(budget, max(timeout - self.evidence_inference_reserve, 0.0))
+        return time.monotonic() + budget
+
+    def gather_evidence(self, claim, on_progress=None, deadline=None):
+        """
+        Searches the web for evidence when the caller did not supply any.
+        Returns an EvidenceResult; sources not scraped before deadline
+        (see evidence_deadline) are listed in its timed_out.
+        on_progress(event, data) receives the search stages ("sources",
+        "source", "evidence") as they finish.
+        """
+        print(f"No evidence provided. Auto-searching for: {claim}")
+        if deadline is None:
+            deadline = self.evidence_deadline()
+        result = self.search_engine.get_evidence(claim, on_progress=on_progress, budget=deadline - time.monotonic())
+        evidence = result.evidence
+        if on_progress:
+            on_progress("evidence", {
+                "evidence": self._format_evidence(evidence or ""),
+                "sources": list(result.sources),
+                "timed_out": list(result.timed_out)
+            })
+        if evidence:
             try:
                 print(f"Found evidence: {evidence[:100].encode('utf-8', 'ignore').decode('utf-8')}...")
             except:
                 pass
-        # Format input
-        text = f"{claim} [SEP] {evidence}"
-        
-        try:
-            # Tokenize
-            inputs = self.tokenizer(text, return_tensors="np", padding="max_length", truncation=True, max_length=128)
-            
-            # ONNX Inference
-            ort_inputs = {
-                'input_ids': inputs['input_ids'].astype(np.int64),
-                'attention_mask': inputs['attention_mask'].astype(np.int64)
+        return result
+
+    def gather_source_passages(self, claim, on_progress=None, deadline=None):
+        """
+        Searches the web for one passage per source. Returns a
+        SourcePassages; sources not scraped before deadline are listed in
+        its timed_out.
+        """
+        print(f"Auto-searching per source for: {claim}")
+        if deadline is None:
+            deadline = self.evidence_deadline()
+        result = self.search_engine.collect_passages(claim, on_progress=on_progress, budget=deadline - time.monotonic())
+        if on_progress:
+            evidence = "\n\n".join(f"[Source: {passage['url']}] {passage['text']}" for passage in result.passages)
+            on_progress("evidence", {
+                "evidence": self._format_evidence(evidence),
+                "sources": [passage["url"] for passage in result.passages],
+                "timed_out": list(result.timed_out)
+            })
+        return result
+
+    def searched_prediction(self, claim, prediction, result):
+        """
+        Attaches the auto-search sources to a prediction and caches it,
+        unless the budget cut the search or some sources short (the
+        evidence was partial) or nothing was found.
+        """
+        prediction = {**prediction, "sources": list(result.sources)}
+        if result.timed_out:
+            prediction["timed_out_sources"] = list(result.timed_out)
+        elif result.sources and not result.search_timed_out:
+            self.store_verdict(claim, None, prediction)
+        return prediction
+
+    def score_sources(self, claim, passages, timed_out=()):
+        """
+        Scores the claim against each source passage in one batched call.
+        Returns the aggregate verdict plus a verdict per source. Sources in
+        timed_out (cut off by the evidence budget) are reported in
+        timed_out_sources.
+        """
+        result = self._score_passages(claim, passages)
+        if timed_out:
+            result["timed_out_sources"] = list(timed_out)
+        return result
+
+    def _score_passages(self, claim, passages):
+        sources = [passage["url"] for passage in passages]
+        if not passages:
+            return {**self.empty_result(claim, sources), "source_verdicts": []}
+
+        texts = [passage["text"] for passage in passages]
+        predictions = self.predict_batch([claim] * len(passages), texts)
+        source_verdicts = [
+            {
+                "url": passage["url"],
+                "result": prediction["result"],
+                "confidence": prediction["confidence"],
+                "raw_probs": prediction["raw_probs"],
+                "snippet": passage["snippet"]
             }
-            
-            logits = self.session.run(None, ort_inputs)[0][0]
-            probs = self.softmax(logits)
-            
-            pred_idx = np.argmax(probs)
-            confidence = probs[pred_idx]
-            
-            # Logic Gate
-            result = self.labels[pred_idx]
-            if confidence < self.confidence_threshold:
-                result = "UNCERTAIN"
-            
-            return {
-                "claim": claim,
-                "evidence": evidence[:200] + "..." if len(evidence) > 200 else evidence,
+            for passage, prediction in zip(passages, predictions)
+        ]
+
+        scored = [prediction["raw_probs"] for prediction in predictions if prediction["result"] != "ERROR"]
+        if not scored:
+            return {**predictions[0], "evidence": "", "sources": sources, "source_verdicts": source_verdicts}
+
+        probs = np.asarray(aggregate_probs(np.asarray(scored), self.source_aggregation))
+        evidence = "\n\n".join(f"[Source: {passage['url']}] {passage['text']}" for passage in passages)
+        aggregate = self._predictions_from_probs([claim], [evidence], probs[np.newaxis, :])[0]
+        return {**aggregate, "sources": sources, "source_verdicts": source_verdicts}
+
+    def verify_claim_by_source(self, claim):
+        """
+        Auto-searches and verifies the claim against each source separately.
+        """
+        passages, timed_out, _ = self.gather_source_passages(claim)
+        return self.score_sources(claim, passages, timed_out)
+
+    def empty_result(self, claim, sources=None):
+        """
+        Result returned when no evidence could be found for a claim.
+        """
+        return {
+            "claim": claim,
+            "evidence": "",
+            "result": "UNCERTAIN",
+            "confidence": 0.0,
+            "raw_probs": [0.5, 0.5],
+            "sources": sources or []
+        }
+
+    def _format_evidence(self, evidence):
+        return evidence[:200] + "..." if len(evidence) > 200 else evidence
+
+    def predict_batch(self, claims, evidences):
+        """
+        Runs a single ONNX inference over a batch of claim/evidence pairs.
+        Pairs already in the verdict cache skip the model.
+        Returns one prediction dict per pair, in input order.
+        """
+        predictions = [self.lookup_verdict(claim, evidence) for claim, evidence in zip(claims, evidences)]
+        misses = [i for i, prediction in enumerate(predictions) if prediction is None]
+        if misses and self.prescreen:
+            misses = self._prescreen(claims, evidences, predictions, misses)
+        if misses:
+            fresh = self._predict_uncached([claims[i] for i in misses], [evidences[i] for i in misses])
+            for i, prediction in zip(misses, fresh):
+                self.store_verdict(claims[i], evidences[i], prediction)
+                predictions[i] = prediction
+        return predictions
+
+    def _prescreen(self, claims, evidences, predictions, indices):
+        """
+        Fills in predictions the lexical pre-screen can decide on its own.
+        Returns the indices that still need the model.
+        """
+        escalated = []
+        for i in indices:
+            decision = self.prescreen.screen(claims[i], evidences[i])
+            if decision is None:
+                escalated.append(i)
+                continue
+            result, confidence = decision
+            if result == "TRUE":
+                raw_probs = [1.0 - confidence, confidence]
+            elif result == "FALSE":
+                raw_probs = [confidence, 1.0 - confidence]
+            else:
+                raw_probs = [0.5, 0.5]
+            prediction = {
+                "claim": claims[i],
+                "evidence": self._format_evidence(evidences[i]),
                 "result": result,
-                "confidence": float(confidence),
-                "raw_probs": probs.tolist(),
-                "sources": sources
+                "confidence": confidence,
+                "raw_probs": raw_probs,
+                "sources": [],
+                "stage": "prescreen"
             }
+            self.store_verdict(claims[i], evidences[i], prediction)
+            predictions[i] = prediction
+        return escalated
+
+    def _predict_uncached(self, claims, evidences):
+        with self._model_lock:
+            session_pool, model_version = self.session_pool, self.model_version
+
+        start = time.perf_counter()
+        predictions = self._run_model(claims, evidences, session_pool)
+        elapsed = time.perf_counter() - start
+
+        for prediction in predictions:
+            prediction["model_version"] = model_version
+        if self.model_registry:
+            self.model_registry.maybe_shadow(claims, evidences, predictions, elapsed)
+        return predictions
+
+    def _run_model(self, claims, evidences, session_pool):
+        """
+        Tokenizes and scores the pairs on the given session pool.
+        """
+        try:
+            if self.evidence_mode == "window":
+                sequences, owners = self._build_window_sequences(claims, evidences)
+            else:
+                sequences, owners = self._build_sequences(claims, evidences), None
+
+            if self.padding_strategy == "max_length":
+                input_ids, attention_mask = self._pad(sequences, length=self.max_length)
+                batch_logits = self._run_session(input_ids, attention_mask, session_pool)
+            elif owners is not None:
+                # Windows are nearly all full length: run them as one batch
+                batch_logits = self._run_session(*self._pad(sequences), session_pool)
+            else:
+                batch_logits = self._run_bucketed(sequences, session_pool)
         except Exception as e:
             # Handle tokenization or inference errors gracefully
-            return {
+            return [
+                {
+                    "claim": claim,
+                    "evidence": self._format_evidence(evidence),
+                    "result": "ERROR",
+                    "confidence": 0.0,
+                    "raw_probs": [],
+                    "sources": [],
+                    "stage": "model",
+                    "error": str(e)
+                }
+                for claim, evidence in zip(claims, evidences)
+            ]
+
+        probs = self.softmax(np.asarray(batch_logits, dtype=np.float32))
+        if owners is None:
+            return self._predictions_from_probs(claims, evidences, probs)
+
+        # One row per window: aggregate back to one row per pair
+        owners = np.asarray(owners)
+        pair_probs = np.stack([aggregate_probs(probs[owners == i], self.window_aggregation) for i in range(len(claims))])
+        predictions = self._predictions_from_probs(claims, evidences, pair_probs)
+        for i, prediction in enumerate(predictions):
+            prediction["windows"] = int((owners == i).sum())
+        return predictions
+
+    def _encode_texts(self, texts):
+        """
+        Returns token ids (without special tokens) for each text.
+        Cache misses are encoded together in a single batch call.
+        """
+        ids = [self.token_cache.get(text) for text in texts]
+        missing = list(dict.fromkeys(text for text, text_ids in zip(texts, ids) if text_ids is None))
+        if missing:
+            encoded = self.tokenizer(missing, add_special_tokens=False)['input_ids']
+            for text, text_ids in zip(missing, encoded):
+                self.token_cache.set(text, text_ids)
+            fresh = dict(zip(missing, encoded))
+            ids = [text_ids if text_ids is not None else fresh[text] for text, text_ids in zip(texts, ids)]
+        return ids
+
+    def _build_sequences(self, claims, evidences):
+        """
+        Builds "[CLS] claim [SEP] evidence [SEP]" id sequences truncated to
+        max_length, the same ids the tokenizer produces for f"{claim} [SEP] {evidence}".
+        """
+        claim_ids = self._encode_texts(claims)
+        evidence_ids = self._encode_texts(evidences)
+        cls_id, sep_id = self.tokenizer.cls_token_id, self.tokenizer.sep_token_id
+        budget = self.max_length - 2
+        return [
+            [cls_id] + (c_ids + [sep_id] + e_ids)[:budget] + [sep_id]
+            for c_ids, e_ids in zip(claim_ids, evidence_ids)
+        ]
+
+    def _split_windows(self, evidence_ids, window_size):
+        """
+        Splits evidence ids into windows of window_size tokens overlapping by
+        window_overlap, capped at max_windows.
+        """
+        stride = max(window_size - self.window_overlap, 1)
+        windows = []
+        start = 0
+        while len(windows) < self.max_windows:
+            windows.append(evidence_ids[start:start + window_size])
+            if start + window_size >= len(evidence_ids):
+                break
+            start += stride
+        return windows
+
+    def _build_window_sequences(self, claims, evidences):
+        """
+        Builds one "[CLS] claim [SEP] window [SEP]" sequence per evidence window.
+        Returns the sequences and, for each, the index of the pair it belongs to.
+        """
+        claim_ids = self._encode_texts(claims)
+        evidence_ids = self._encode_texts(evidences)
+        cls_id, sep_id = self.tokenizer.cls_token_id, self.tokenizer.sep_token_id
+
+        sequences, owners = [], []
+        for i, (c_ids, e_ids) in enumerate(zip(claim_ids, evidence_ids)):
+            # Leave at least half the sequence for evidence
+            c_ids = c_ids[:self.max_length // 2]
+            window_size = self.max_length - 3 - len(c_ids)
+            for window in self._split_windows(e_ids, window_size):
+                sequences.append([cls_id] + c_ids + [sep_id] + window + [sep_id])
+                owners.append(i)
+        return sequences, owners
+
+    def _run_session(self, input_ids, attention_mask, session_pool=None):
+        # ONNX Inference
+        ort_inputs = {
+            'input_ids': np.asarray(input_ids).astype(np.int64),
+            'attention_mask': np.asarray(attention_mask).astype(np.int64)
+        }
+        return (session_pool or self.session_pool).run(None, ort_inputs)[0]
+
+    def _pad(self, sequences, length=None):
+        """
+        Pads token id sequences to length, or to the longest one in the group.
+        """
+        pad_id = getattr(self.tokenizer, "pad_token_id", None) or 0
+        longest = length or max(len(seq) for seq in sequences)
+        input_ids = np.full((len(sequences), longest), pad_id, dtype=np.int64)
+        attention_mask = np.zeros((len(sequences), longest), dtype=np.int64)
+        for i, seq in enumerate(sequences):
+            input_ids[i, :len(seq)] = seq
+            attention_mask[i, :len(seq)] = 1
+        return input_ids, attention_mask
+
+    def _bucket_for(self, length):
+        for bucket in self.length_buckets:
+            if length <= bucket:
+                return bucket
+        return self.length_buckets[-1]
+
+    def _run_bucketed(self, sequences, session_pool=None):
+        """
+        Groups sequences into length buckets and runs one ONNX call per bucket,
+        so short claims don't pay for attention over max_length tokens.
+        Returns the logits matrix in input order.
+        """
+        buckets = {}
+        for i, seq in enumerate(sequences):
+            buckets.setdefault(self._bucket_for(len(seq)), []).append(i)
+
+        batch_logits = None
+        for bucket in sorted(buckets):
+            indices = buckets[bucket]
+            input_ids, attention_mask = self._pad([sequences[i] for i in indices])
+            logits = np.asarray(self._run_session(input_ids, attention_mask, session_pool))
+            if batch_logits is None:
+                batch_logits = np.zeros((len(sequences), logits.shape[-1]), dtype=np.float32)
+            batch_logits[indices] = logits
+        return batch_logits
+
+    def _predictions_from_probs(self, claims, evidences, probs):
+        """
+        Applies the confidence gate across the whole probability matrix.
+        """
+        pred_idx = np.argmax(probs, axis=-1)
+        confidences = probs[np.arange(len(probs)), pred_idx]
+        
+        # Logic Gate
+        uncertain = confidences < self.confidence_threshold
+        
+        predictions = []
+        for i, (claim, evidence) in enumerate(zip(claims, evidences)):
+            result = "UNCERTAIN" if uncertain[i] else self.labels[int(pred_idx[i])]
+            predictions.append({
                 "claim": claim,
-                "evidence": evidence[:200] + "..." if len(evidence) > 200 else evidence,
-                "result": "ERROR",
-                "confidence": 0.0,
-                "raw_probs": [],
-                "sources": sources,
-                "error": str(e)
-            }
+                "evidence": self._format_evidence(evidence),
+                "result": result,
+                "confidence": float(confidences[i]),
+                "raw_probs": probs[i].tolist(),
+                "sources": [],
+                "stage": "model"
+            })
+        return predictions
+
+    def verify_batch(self, claims, evidences):
+        """
+        Verifies many claim/evidence pairs, running the model in chunks of
+        batch_size. Results are returned in input order.
+        """
+        predictions = []
+        for start in range(0, len(claims), self.batch_size):
+            end = start + self.batch_size
+            predictions.extend(self.predict_batch(claims[start:end], evidences[start:end]))
+        return predictions
+
+    def verify_claim(self, claim, evidence=None, deadline=None):
+        """
+        Verifies a claim. If evidence is missing, searches the web until
+        deadline (time.monotonic(); defaults to evidence_deadline()).
+        """
+        # Auto-Search Logic
+        if not evidence:
+            cached = self.lookup_verdict(claim)
+            if cached:
+                return cached
+            result = self.gather_evidence(claim, deadline=deadline)
+            if not result.evidence:
+                return self.empty_result(claim, list(result.sources))
+            return self.searched_prediction(claim, self.predict_batch([claim], [result.evidence])[0], result)
+
+        return self.predict_batch([claim], [evidence])[0]
 
 if __name__ == "__main__":
     # Simple test
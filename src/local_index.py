@@ -0,0 +1,371 @@
+import bisect
+import json
+import os
+import threading
+import time
+import uuid
+from collections import Counter, defaultdict
+import numpy as np
+from src.prescreen import content_tokens
+
+MANIFEST = "manifest.json"
+
+def split_passages(text: str, max_words: int = 120) -> list:
+    """
+    Splits a document into passages of at most max_words words, keeping
+    paragraphs together where they fit.
+    """
+    passages = []
+    current = []
+    for paragraph in text.split("\n"):
+        words = paragraph.split()
+        while words:
+            room = max_words - len(current)
+            if len(words) > room and current:
+                passages.append(" ".join(current))
+                current = []
+                continue
+            current.extend(words[:max_words])
+            words = words[max_words:]
+    if current:
+        passages.append(" ".join(current))
+    return passages
+
+def load_embedder(model_name: str):
+    """
+    Returns a function mapping a list of texts to unit-length float32
+    vectors, using sentence-transformers (imported only when needed).
+    """
+    from sentence_transformers import SentenceTransformer
+
+    model = SentenceTransformer(model_name)
+
+    def embed(texts):
+        return np.asarray(model.encode(list(texts), normalize_embeddings=True, convert_to_numpy=True), dtype=np.float32)
+    return embed
+
+class StringTable:
+    """
+    Read-only list of strings stored as one UTF-8 blob plus offsets, both
+    memory-mapped. Sorted tables support find() by binary search.
+    """
+    def __init__(self, blob, offsets):
+        self.blob = blob
+        self.offsets = offsets
+
+    @staticmethod
+    def write(directory, name, strings):
+        encoded = [s.encode("utf-8") for s in strings]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(e) for e in encoded], out=offsets[1:])
+        np.save(os.path.join(directory, f"{name}_blob.npy"), np.frombuffer(b"".join(encoded) or b"\0", dtype=np.uint8))
+        np.save(os.path.join(directory, f"{name}_offsets.npy"), offsets)
+
+    @classmethod
+    def load(cls, directory, name):
+        return cls(
+            np.load(os.path.join(directory, f"{name}_blob.npy"), mmap_mode="r"),
+            np.load(os.path.join(directory, f"{name}_offsets.npy"), mmap_mode="r")
+        )
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        return bytes(self.blob[self.offsets[i]:self.offsets[i + 1]]).decode("utf-8")
+
+    def find(self, s) -> int:
+        i = bisect.bisect_left(self, s)
+        return i if i < len(self) and self[i] == s else -1
+
+class Segment:
+    """
+    One immutable batch of documents: sorted vocabulary, postings (doc ids
+    and term frequencies per term), document lengths, the documents
+    themselves and optionally their embeddings. Everything is a .npy file
+    opened with mmap_mode="r", so only the pages a query touches are read.
+    """
+    def __init__(self, path):
+        self.path = path
+        self.name = os.path.basename(path)
+        self.terms = StringTable.load(path, "terms")
+        self.term_offsets = np.load(os.path.join(path, "term_offsets.npy"), mmap_mode="r")
+        self.doc_ids = np.load(os.path.join(path, "postings_docs.npy"), mmap_mode="r")
+        self.frequencies = np.load(os.path.join(path, "postings_tf.npy"), mmap_mode="r")
+        self.doc_lengths = np.load(os.path.join(path, "doc_lengths.npy"), mmap_mode="r")
+        self.docs = StringTable.load(path, "docs")
+        embeddings_path = os.path.join(path, "embeddings.npy")
+        self.embeddings = np.load(embeddings_path, mmap_mode="r") if os.path.exists(embeddings_path) else None
+        self.num_docs = len(self.doc_lengths)
+        self.total_length = int(np.sum(self.doc_lengths, dtype=np.int64))
+
+    @staticmethod
+    def write(path, documents, embeddings=None):
+        """
+        Writes documents (dicts with "text" and optionally "url", "title")
+        as a new segment directory. Documents without a url get a
+        local://<segment>/<n> one. Documents with no indexable words are
+        skipped, along with their row of embeddings. Returns the number of
+        documents written.
+        """
+        name = os.path.basename(path)
+        postings = defaultdict(list)
+        doc_lengths = []
+        kept = []
+        rows = []
+        for row, doc in enumerate(documents):
+            tokens = content_tokens(doc["text"])
+            if not tokens:
+                continue
+            rows.append(row)
+            doc_id = len(kept)
+            for term, count in Counter(tokens).items():
+                postings[term].append((doc_id, count))
+            doc_lengths.append(len(tokens))
+            url = doc.get("url") or f"local://{name}/{doc_id}"
+            kept.append(json.dumps({"url": url, "title": doc.get("title", ""), "text": doc["text"]}))
+        if not kept:
+            return 0
+
+        os.makedirs(path)
+        terms = sorted(postings)
+        term_offsets = np.zeros(len(terms) + 1, dtype=np.int64)
+        np.cumsum([len(postings[term]) for term in terms], out=term_offsets[1:])
+        pairs = np.array([pair for term in terms for pair in postings[term]], dtype=np.int64)
+
+        StringTable.write(path, "terms", terms)
+        StringTable.write(path, "docs", kept)
+        np.save(os.path.join(path, "term_offsets.npy"), term_offsets)
+        np.save(os.path.join(path, "postings_docs.npy"), pairs[:, 0].astype(np.int32))
+        np.save(os.path.join(path, "postings_tf.npy"), np.minimum(pairs[:, 1], np.iinfo(np.uint16).max).astype(np.uint16))
+        np.save(os.path.join(path, "doc_lengths.npy"), np.asarray(doc_lengths, dtype=np.int32))
+        if embeddings is not None:
+            # Row n must stay document n
+            np.save(os.path.join(path, "embeddings.npy"), np.asarray(embeddings, dtype=np.float32)[rows])
+        return len(kept)
+
+    def postings(self, term):
+        """
+        (doc_ids, term_frequencies) for term, or None if it does not occur.
+        """
+        i = self.terms.find(term)
+        if i < 0:
+            return None
+        start, end = self.term_offsets[i], self.term_offsets[i + 1]
+        return self.doc_ids[start:end], self.frequencies[start:end]
+
+    def document(self, doc_id) -> dict:
+        return json.loads(self.docs[doc_id])
+
+class LocalIndex:
+    """
+    On-disk BM25 index over a document corpus (e.g. Wikipedia passages),
+    with optional embeddings for dense retrieval.
+
+    The index is a directory of immutable segments listed in manifest.json.
+    add() writes a new segment and then swaps the manifest, so a corpus
+    grows without a rebuild and readers never see a half-written segment.
+    BM25 statistics (document count, average length, document frequency)
+    are combined across segments at query time. One writer at a time.
+    """
+    def __init__(self, path, k1=1.2, b=0.75):
+        self.path = path
+        self.k1 = k1
+        self.b = b
+        self.segments = []
+        self.embedding_model = None
+        self._manifest_version = None
+        self._lock = threading.Lock()
+        self.refresh()
+
+    def _manifest_path(self):
+        return os.path.join(self.path, MANIFEST)
+
+    def _read_manifest(self) -> dict:
+        try:
+            with open(self._manifest_path()) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {"segments": [], "embedding_model": None}
+
+    def refresh(self) -> bool:
+        """
+        Opens segments added since the last call (e.g. by another process).
+        Returns True if the index changed.
+        """
+        try:
+            # The manifest is replaced, never rewritten, so the inode changes too
+            stat = os.stat(self._manifest_path())
+            version = (stat.st_ino, stat.st_mtime_ns)
+        except FileNotFoundError:
+            version = None
+        if version == self._manifest_version:
+            return False
+
+        with self._lock:
+            manifest = self._read_manifest()
+            opened = {segment.name: segment for segment in self.segments}
+            self.segments = [opened.get(name) or Segment(os.path.join(self.path, name)) for name in manifest["segments"]]
+            self.embedding_model = manifest.get("embedding_model")
+            self._manifest_version = version
+        return True
+
+    def add(self, documents, embed=None, embedding_model=None) -> int:
+        """
+        Indexes documents (dicts with "text" and optionally "url" and
+        "title") as a new segment. embed(texts), if given, computes their
+        embeddings; embedding_model names it in the manifest so queries
+        can use the same model. Returns the number of documents added.
+        """
+        # Segment.write would skip these anyway; don't embed them for nothing
+        documents = [doc for doc in documents if doc.get("text") and content_tokens(doc["text"])]
+        embeddings = embed([doc["text"] for doc in documents]) if embed and documents else None
+
+        os.makedirs(self.path, exist_ok=True)
+        name = f"seg-{int(time.time())}-{uuid.uuid4().hex[:8]}"
+        added = Segment.write(os.path.join(self.path, name), documents, embeddings)
+        if not added:
+            return 0
+
+        manifest = self._read_manifest()
+        manifest["segments"].append(name)
+        if embedding_model:
+            manifest["embedding_model"] = embedding_model
+        self._write_manifest(manifest)
+        self.refresh()
+        return added
+
+    def _write_manifest(self, manifest):
+        tmp_path = self._manifest_path() + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp_path, self._manifest_path())
+
+    def compact(self):
+        """
+        Rewrites all segments as one. Loads the whole corpus into memory.
+        """
+        segments = list(self.segments)
+        if len(segments) < 2:
+            return
+        documents = [segment.document(i) for segment in segments for i in range(segment.num_docs)]
+        embeddings = None
+        if all(segment.embeddings is not None for segment in segments):
+            embeddings = np.concatenate([np.asarray(segment.embeddings) for segment in segments])
+
+        name = f"seg-{int(time.time())}-{uuid.uuid4().hex[:8]}"
+        Segment.write(os.path.join(self.path, name), documents, embeddings)
+        manifest = self._read_manifest()
+        manifest["segments"] = [name]
+        self._write_manifest(manifest)
+        self.refresh()
+        # Safe on POSIX even if another reader still has the files mapped
+        for segment in segments:
+            for file_name in os.listdir(segment.path):
+                os.remove(os.path.join(segment.path, file_name))
+            os.rmdir(segment.path)
+
+    def __len__(self):
+        return sum(segment.num_docs for segment in self.segments)
+
+    @property
+    def has_embeddings(self) -> bool:
+        return any(segment.embeddings is not None for segment in self.segments)
+
+    def search(self, query: str, max_results: int = 3) -> list:
+        """
+        BM25 search. Returns up to max_results documents (dicts with url,
+        title, text and score), best first.
+        """
+        segments = self.segments
+        terms = list(dict.fromkeys(t for t in content_tokens(query)))
+        num_docs = sum(segment.num_docs for segment in segments)
+        if not terms or not num_docs:
+            return []
+        avg_length = sum(segment.total_length for segment in segments) / num_docs
+
+        per_segment = [{term: segment.postings(term) for term in terms} for segment in segments]
+        idf = {}
+        for term in terms:
+            df = sum(len(postings[term][0]) for postings in per_segment if postings[term] is not None)
+            idf[term] = np.log(1 + (num_docs - df + 0.5) / (df + 0.5))
+
+        candidates = []
+        for segment, postings in zip(segments, per_segment):
+            doc_ids, contributions = [], []
+            for term, hit in postings.items():
+                if hit is None:
+                    continue
+                ids, tf = np.asarray(hit[0]), np.asarray(hit[1], dtype=np.float32)
+                norm = self.k1 * (1 - self.b + self.b * np.asarray(segment.doc_lengths[ids]) / avg_length)
+                doc_ids.append(ids)
+                contributions.append(idf[term] * tf * (self.k1 + 1) / (tf + norm))
+            if not doc_ids:
+                continue
+            unique, inverse = np.unique(np.concatenate(doc_ids), return_inverse=True)
+            scores = np.bincount(inverse, weights=np.concatenate(contributions))
+            for i in self._top(scores, max_results * 4):
+                candidates.append((float(scores[i]), segment, int(unique[i])))
+
+        return self._documents(sorted(candidates, key=lambda c: -c[0]), max_results)
+
+    def search_embeddings(self, vector, max_results: int = 3) -> list:
+        """
+        Nearest documents by cosine similarity to a unit-length query vector
+        (brute force over the memory-mapped embeddings).
+        """
+        vector = np.asarray(vector, dtype=np.float32)
+        candidates = []
+        for segment in self.segments:
+            if segment.embeddings is None:
+                continue
+            scores = segment.embeddings @ vector
+            for i in self._top(scores, max_results * 4):
+                candidates.append((float(scores[i]), segment, int(i)))
+        return self._documents(sorted(candidates, key=lambda c: -c[0]), max_results)
+
+    @staticmethod
+    def _top(scores, k):
+        if len(scores) > k:
+            top = np.argpartition(-scores, k)[:k]
+        else:
+            top = np.arange(len(scores))
+        return top[np.argsort(-scores[top])]
+
+    @staticmethod
+    def _documents(candidates, max_results):
+        # Passages of one article share its url; keep the best one
+        results, seen = [], set()
+        for score, segment, doc_id in candidates:
+            doc = segment.document(doc_id)
+            if doc["url"] in seen:
+                continue
+            seen.add(doc["url"])
+            results.append({**doc, "score": score})
+            if len(results) == max_results:
+                break
+        return results
+
+    def stats(self) -> dict:
+        segments = self.segments
+        return {
+            "path": self.path,
+            "segments": len(segments),
+            "documents": sum(segment.num_docs for segment in segments),
+            "terms": sum(len(segment.terms) for segment in segments),
+            "postings": sum(len(segment.doc_ids) for segment in segments),
+            "embedding_model": self.embedding_model if self.has_embeddings else None
+        }
+
+def fuse_rankings(rankings, max_results, k=60):
+    """
+    Reciprocal rank fusion of several result lists (documents matched by url).
+    """
+    scores, documents = {}, {}
+    for ranking in rankings:
+        for rank, doc in enumerate(ranking):
+            key = doc["url"]
+            scores[key] = scores.get(key, 0.0) + 1.0 / (k + rank + 1)
+            documents.setdefault(key, doc)
+    best = sorted(scores, key=lambda key: -scores[key])[:max_results]
+    return [{**documents[key], "score": scores[key]} for key in best]
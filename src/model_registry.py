@@ -0,0 +1,177 @@
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from src.session_pool import SessionPool
+from src.utils.logger import logger
+
+class ModelVersion:
+    """
+    One loaded ONNX model: its session pool and content hash.
+    """
+    def __init__(self, model_path, session_pool, version):
+        self.model_path = model_path
+        self.session_pool = session_pool
+        self.version = version
+        self.loaded_at = time.time()
+
+    def describe(self) -> dict:
+        return {
+            "model_path": self.model_path,
+            "version": self.version,
+            "loaded_at": self.loaded_at,
+            "sessions": self.session_pool.size
+        }
+
+class ModelRegistry:
+    """
+    Loads candidate models next to the active one and swaps them in
+    without restarting the API.
+
+    While a candidate is loaded, shadow_rate of the model batches are
+    re-run on it in a background thread (never on the request path) and
+    the agreement and latency difference with the active model are recorded.
+    promote() makes the candidate active; rollback() restores the
+    previously active model.
+    """
+    def __init__(self, engine, shadow_rate=None):
+        self.engine = engine
+        self.current = ModelVersion(engine.model_path, engine.session_pool, engine.model_version)
+        self.candidate = None
+        self.previous = None
+        if shadow_rate is None:
+            shadow_rate = float(os.environ.get("MODEL_SHADOW_RATE", 0.1))
+        self.shadow_rate = shadow_rate
+
+        self._lock = threading.Lock()
+        # One shadow batch at a time; batches arriving meanwhile are skipped
+        self._shadow_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="shadow")
+        self._shadow_busy = False
+        self._reset_shadow_stats()
+
+    def _reset_shadow_stats(self):
+        self.shadow_batches = 0
+        self.shadow_pairs = 0
+        self.shadow_agreements = 0
+        self.shadow_skipped = 0
+        self.shadow_errors = 0
+        self.active_seconds = 0.0
+        self.candidate_seconds = 0.0
+
+    def load_candidate(self, model_path, session_pool_size=None, session_options=None) -> dict:
+        """
+        Loads model_path as the candidate, replacing any earlier candidate.
+        """
+        if not os.path.exists(model_path):
+            raise FileNotFoundError(f"Model file not found at {model_path}")
+
+        session_pool = SessionPool.from_model(model_path, size=session_pool_size, options=session_options)
+        candidate = ModelVersion(model_path, session_pool, self.engine._model_version(model_path))
+        with self._lock:
+            self.candidate = candidate
+            self._reset_shadow_stats()
+        logger.info(f"Loaded candidate model {model_path} ({candidate.version})")
+        return candidate.describe()
+
+    def discard_candidate(self):
+        with self._lock:
+            self.candidate = None
+
+    def set_shadow_rate(self, rate: float):
+        if not 0.0 <= rate <= 1.0:
+            raise ValueError("Shadow rate must be between 0 and 1")
+        self.shadow_rate = rate
+
+    def promote(self) -> dict:
+        """
+        Makes the candidate the active model.
+        """
+        with self._lock:
+            if self.candidate is None:
+                raise ValueError("No candidate model loaded")
+            candidate, self.candidate = self.candidate, None
+            self.previous, self.current = self.current, candidate
+        self.engine.activate_model(candidate.session_pool, candidate.version, candidate.model_path)
+        logger.info(f"Promoted model {candidate.model_path} ({candidate.version})")
+        return candidate.describe()
+
+    def rollback(self) -> dict:
+        """
+        Restores the model that was active before the last promote().
+        """
+        with self._lock:
+            if self.previous is None:
+                raise ValueError("No previous model to roll back to")
+            previous = self.previous
+            self.previous, self.current = self.current, previous
+        self.engine.activate_model(previous.session_pool, previous.version, previous.model_path)
+        logger.info(f"Rolled back to model {previous.model_path} ({previous.version})")
+        return previous.describe()
+
+    def maybe_shadow(self, claims, evidences, predictions, active_seconds):
+        """
+        Called after every active-model batch. Samples it for shadow
+        inference on the candidate and returns immediately.
+        """
+        candidate = self.candidate
+        if candidate is None or random.random() >= self.shadow_rate:
+            return
+        with self._lock:
+            if self._shadow_busy:
+                self.shadow_skipped += 1
+                return
+            self._shadow_busy = True
+        self._shadow_pool.submit(self._shadow, candidate, list(claims), list(evidences), predictions, active_seconds)
+
+    def _shadow(self, candidate, claims, evidences, predictions, active_seconds):
+        try:
+            start = time.perf_counter()
+            shadow_predictions = self.engine._run_model(claims, evidences, candidate.session_pool)
+            elapsed = time.perf_counter() - start
+
+            pairs = [(p, s) for p, s in zip(predictions, shadow_predictions) if p["result"] != "ERROR"]
+            if any(s["result"] == "ERROR" for _, s in pairs):
+                raise RuntimeError(next(s["error"] for _, s in pairs if s["result"] == "ERROR"))
+            agreements = sum(1 for p, s in pairs if p["result"] == s["result"])
+
+            with self._lock:
+                # The candidate may have been replaced while this batch ran
+                if self.candidate is candidate:
+                    self.shadow_batches += 1
+                    self.shadow_pairs += len(pairs)
+                    self.shadow_agreements += agreements
+                    self.active_seconds += active_seconds
+                    self.candidate_seconds += elapsed
+        except Exception as e:
+            logger.warning(f"Shadow inference failed: {e}")
+            with self._lock:
+                self.shadow_errors += 1
+        finally:
+            with self._lock:
+                self._shadow_busy = False
+
+    def shutdown(self):
+        self._shadow_pool.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> dict:
+        with self._lock:
+            candidate = self.candidate
+            batches = self.shadow_batches
+            shadow = {
+                "rate": self.shadow_rate,
+                "batches": batches,
+                "pairs": self.shadow_pairs,
+                "agreement_rate": self.shadow_agreements / self.shadow_pairs if self.shadow_pairs else None,
+                "active_ms_per_batch": self.active_seconds / batches * 1000 if batches else None,
+                "candidate_ms_per_batch": self.candidate_seconds / batches * 1000 if batches else None,
+                "latency_delta_ms": (self.candidate_seconds - self.active_seconds) / batches * 1000 if batches else None,
+                "skipped": self.shadow_skipped,
+                "errors": self.shadow_errors
+            }
+        return {
+            "active": self.current.describe(),
+            "candidate": candidate.describe() if candidate else None,
+            "previous": self.previous.describe() if self.previous else None,
+            "shadow": shadow
+        }
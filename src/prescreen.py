@@ -0,0 +1,144 @@
+import os
+import re
+import threading
+
+NEGATIONS = {"not", "no", "never", "none", "nobody", "nothing", "neither", "nor", "cannot", "without"}
+
+STOPWORDS = {
+    "a", "an", "the", "is", "are", "was", "were", "be", "been", "being", "am",
+    "of", "in", "on", "at", "to", "for", "by", "with", "from", "as", "and", "or",
+    "that", "this", "these", "those", "it", "its", "has", "have", "had", "do",
+    "does", "did", "which", "who", "whom", "there", "their", "than", "then"
+}
+
+# Kept when matching a claim verbatim: "was the capital" is not "is the capital"
+TENSE_WORDS = {"is", "are", "was", "were", "am", "has", "have", "had", "do", "does", "did"}
+MATCH_STOPWORDS = STOPWORDS - TENSE_WORDS
+
+# A matching sentence with any of these may be hedging, rejecting or
+# dating the claim, so it goes to the model
+HEDGES = {
+    "may", "might", "could", "possibly", "perhaps", "probably", "likely", "unlikely",
+    "allegedly", "reportedly", "supposedly", "apparently", "claim", "claims", "claimed", "say", "says",
+    "suggest", "suggests", "suggested", "believe", "believed", "belief", "beliefs",
+    "unclear", "unproven", "unconfirmed", "unverified", "disputed", "controversial",
+    "if", "whether"
+}
+TEMPORAL = {"until", "formerly", "former", "previously", "once", "used", "before", "ago", "anymore", "longer"}
+# Evidence with any of these anywhere reads like a fact-check: always escalate
+DEBUNK = {
+    "false", "falsely", "myth", "myths", "debunk", "debunked", "debunks", "hoax", "hoaxes",
+    "misconception", "misconceptions", "misinformation", "disinformation", "fake", "untrue",
+    "incorrect", "inaccurate", "wrong", "misleading", "refuted", "refutes", "baseless",
+    "unfounded", "conspiracy", "rumor", "rumors", "rumour", "rumours"
+}
+
+WORD_RE = re.compile(r"[a-z0-9]+(?:'[a-z]+)?")
+SENTENCE_RE = re.compile(r"(?<=[.!?;])\s+|\n+")
+
+def content_tokens(text, stopwords=STOPWORDS):
+    """
+    Lowercased words with stopwords dropped. Negations (including "n't"
+    contractions) are kept and normalized to "not".
+    """
+    tokens = []
+    for word in WORD_RE.findall(text.lower()):
+        if word.endswith("n't") or word in NEGATIONS:
+            tokens.append("not")
+        elif word not in stopwords:
+            tokens.append(word.split("'")[0])
+    return tokens
+
+def split_sentences(text):
+    return [sentence for sentence in SENTENCE_RE.split(text) if sentence.strip()]
+
+def _contains(tokens, words):
+    n = len(words)
+    return any(tokens[start:start + n] == words for start in range(len(tokens) - n + 1))
+
+class LexicalPrescreen:
+    """
+    Cheap first stage in front of the DistilBERT model (opt-in, PRESCREEN).
+
+    Decides only the easy cases:
+      - a sentence of the evidence states the claim verbatim, tense
+        included, with no negation, hedge or time qualifier: TRUE, or
+        FALSE when the claim itself is negated
+      - the claim shares (almost) no content words with the evidence: UNCERTAIN
+    Everything else returns None and escalates to the full model, as does
+    any evidence that reads like a fact-check ("false", "myth", ...).
+    """
+    def __init__(self, match_confidence=None, min_overlap=None, min_match_tokens=None):
+        self.match_confidence = match_confidence or float(os.environ.get("PRESCREEN_MATCH_CONFIDENCE", 0.95))
+        if min_overlap is None:
+            min_overlap = float(os.environ.get("PRESCREEN_MIN_OVERLAP", 0.1))
+        self.min_overlap = min_overlap
+        # Very short claims match by accident too easily
+        self.min_match_tokens = min_match_tokens or int(os.environ.get("PRESCREEN_MIN_MATCH_TOKENS", 3))
+
+        self._lock = threading.Lock()
+        self.screened = 0
+        self.escalated = 0
+        self.decided = {"TRUE": 0, "FALSE": 0, "UNCERTAIN": 0}
+
+    def screen(self, claim, evidence):
+        """
+        Returns (result, confidence) when the pair is easy, otherwise None.
+        """
+        decision = self._decide(claim, evidence)
+        with self._lock:
+            self.screened += 1
+            if decision is None:
+                self.escalated += 1
+            else:
+                self.decided[decision[0]] += 1
+        return decision
+
+    def _decide(self, claim, evidence):
+        claim_tokens = content_tokens(claim)
+        claim_words = [t for t in claim_tokens if t != "not"]
+        if not claim_words:
+            return None
+
+        evidence_tokens = content_tokens(evidence)
+        overlap = len(set(claim_words) & set(evidence_tokens)) / len(set(claim_words))
+        if overlap < self.min_overlap:
+            return "UNCERTAIN", 0.0
+
+        if len(claim_words) < self.min_match_tokens:
+            return None
+        if DEBUNK & set(WORD_RE.findall(evidence.lower())):
+            return None
+
+        match = self._match(claim, evidence)
+        if match is None:
+            return None
+
+        claim_negated = claim_tokens.count("not") % 2 == 1
+        return ("FALSE" if claim_negated else "TRUE"), self.match_confidence
+
+    def _match(self, claim, evidence):
+        """
+        True if a sentence of the evidence states the (un-negated) claim
+        plainly, None if no sentence does or any stating it is qualified.
+        """
+        claim_words = [t for t in content_tokens(claim, MATCH_STOPWORDS) if t != "not"]
+        found = None
+        for sentence in split_sentences(evidence):
+            tokens = content_tokens(sentence, MATCH_STOPWORDS)
+            if not _contains([t for t in tokens if t != "not"], claim_words):
+                continue
+            words = set(WORD_RE.findall(sentence.lower()))
+            if "not" in tokens or words & (HEDGES | TEMPORAL):
+                return None
+            found = True
+        return found
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "screened": self.screened,
+                "decided": dict(self.decided),
+                "escalated": self.escalated,
+                "escalation_rate": self.escalated / self.screened if self.screened else 0.0
+            }
@@ -4,6 +4,58 @@ from PIL import Image, ExifTags
 import imagehash
 import io
 import os
+import threading
+from src.http_client import get_http_client
+
+_geolocator = None
+_geolocator_lock = threading.Lock()
+
+def get_geolocator():
+    """
+    The Nominatim geocoder, sending its requests through the shared HTTP
+    client (pooled connections, per-host limit) instead of its own session.
+    """
+    global _geolocator
+    with _geolocator_lock:
+        if _geolocator is None:
+            from geopy.adapters import AdapterHTTPError, BaseSyncAdapter
+            from geopy.exc import GeocoderParseError, GeocoderServiceError, GeocoderTimedOut, GeocoderUnavailable
+            from geopy.geocoders import Nominatim
+            import httpx
+
+            class SharedHTTPAdapter(BaseSyncAdapter):
+                def __init__(self, *, proxies, ssl_context):
+                    super().__init__(proxies=proxies, ssl_context=ssl_context)
+                    self.http = get_http_client()
+
+                def _request(self, url, *, timeout, headers):
+                    try:
+                        response = self.http.run(self.http.request("GET", url, timeout=timeout, headers=headers))
+                    except httpx.TimeoutException:
+                        raise GeocoderTimedOut("Service timed out")
+                    except httpx.TransportError as e:
+                        raise GeocoderUnavailable(str(e))
+                    except Exception as e:
+                        raise GeocoderServiceError(str(e))
+                    if response.status_code >= 400:
+                        raise AdapterHTTPError(
+                            f"Non-successful status code {response.status_code}",
+                            status_code=response.status_code, headers=response.headers, text=response.text
+                        )
+                    return response
+
+                def get_text(self, url, *, timeout, headers):
+                    return self._request(url, timeout=timeout, headers=headers).text
+
+                def get_json(self, url, *, timeout, headers):
+                    response = self._request(url, timeout=timeout, headers=headers)
+                    try:
+                        return response.json()
+                    except ValueError:
+                        raise GeocoderParseError(f"Could not deserialize using deserializer:\n{response.text}")
+
+            _geolocator = Nominatim(user_agent="layers_verisnap", adapter_factory=SharedHTTPAdapter)
+        return _geolocator
 
 class ProvenanceEngine:
     def __init__(self):
@@ -232,8 +284,6 @@ class ProvenanceEngine:
         """
         Extracts GPS data from Exif and reverse geocodes it.
         """
-        from geopy.geocoders import Nominatim
-        
         gps_info = {}
         try:
             exif = image._getexif()
@@ -263,8 +313,7 @@ class ProvenanceEngine:
             lat = dms_to_decimal(gps_info[2], gps_info[1])
             lon = dms_to_decimal(gps_info[4], gps_info[3])
             
-            geolocator = Nominatim(user_agent="layers_verisnap")
-            location = geolocator.reverse(f"{lat}, {lon}")
+            location = get_geolocator().reverse(f"{lat}, {lon}")
             
             return {
                 "has_gps": True,
@@ -0,0 +1,145 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from duckduckgo_search import DDGS
+from src.utils.logger import logger
+
+class SearchBackend:
+    """
+    Where SearchEngine gets its results. search() returns a list of dicts
+    with "href", "title" and "body" (a snippet). Backends that already hold
+    the document text (e.g. a local index) also set "text", and
+    SearchEngine uses it instead of downloading the page.
+    """
+    name = "base"
+    # Worth keeping in SearchEngine's on-disk search cache
+    cacheable = False
+
+    def search(self, query: str, max_results: int = 3, timeout: float = None) -> list:
+        """
+        timeout (seconds), when given, is the caller's remaining budget;
+        backends that may be slow must give up once it is spent.
+        """
+        raise NotImplementedError
+
+    def stats(self) -> dict:
+        return {"name": self.name}
+
+class DuckDuckGoBackend(SearchBackend):
+    """
+    Web search through DuckDuckGo. Results only carry snippets; the pages
+    are scraped afterwards.
+    """
+    name = "duckduckgo"
+    cacheable = True
+
+    def __init__(self, timeout=None, workers=None):
+        # Per-request timeout when the caller has no budget (DDGS's default)
+        self.timeout = timeout or float(os.environ.get("DDG_TIMEOUT", 10))
+        # DDGS keeps its own session state; one per thread
+        self._local = threading.local()
+        # Budgeted searches run here so the caller can stop waiting
+        self._pool = ThreadPoolExecutor(
+            max_workers=workers or int(os.environ.get("DDG_SEARCH_WORKERS", 8)),
+            thread_name_prefix="ddg"
+        )
+        self.timeouts = 0
+
+    @property
+    def ddgs(self):
+        if not hasattr(self._local, "ddgs"):
+            self._local.ddgs = DDGS()
+        return self._local.ddgs
+
+    def _text(self, query, max_results, timeout):
+        ddgs = self.ddgs
+        # Read by DDGS on every request, so the thread's session can be reused
+        ddgs.timeout = timeout
+        return ddgs.text(query, max_results=max_results)
+
+    def search(self, query: str, max_results: int = 3, timeout: float = None) -> list:
+        """
+        With a timeout, each request gets at most that long and the wait
+        is bounded too (it also covers DDGS's pause between requests). A
+        search that overruns is left to finish in the background and
+        raises TimeoutError here.
+        """
+        if timeout is None:
+            return self._text(query, max_results, self.timeout)
+        if timeout <= 0:
+            raise TimeoutError("No time left to search")
+        future = self._pool.submit(self._text, query, max_results, timeout)
+        try:
+            return future.result(timeout=timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            self.timeouts += 1
+            raise TimeoutError(f"Search took longer than {timeout:.2f}s")
+
+    def stats(self) -> dict:
+        return {"name": self.name, "timeout": self.timeout, "timeouts": self.timeouts}
+
+class LocalIndexBackend(SearchBackend):
+    """
+    Offline search over a LocalIndex built with scripts/build_local_index.py
+    (LOCAL_INDEX_PATH). Results include the passage text, so no network is
+    used at all. When the index has embeddings and LOCAL_INDEX_EMBEDDINGS
+    is not "off", BM25 and embedding results are fused.
+    """
+    name = "local"
+
+    def __init__(self, path=None, use_embeddings=None):
+        from src.local_index import LocalIndex, load_embedder
+
+        self.index = LocalIndex(path or os.environ.get("LOCAL_INDEX_PATH", "data/local_index"))
+        if use_embeddings is None:
+            use_embeddings = os.environ.get("LOCAL_INDEX_EMBEDDINGS", "on") != "off"
+        self.embed = None
+        if use_embeddings and self.index.has_embeddings:
+            try:
+                self.embed = load_embedder(self.index.embedding_model)
+            except Exception as e:
+                logger.warning(f"Could not load embedding model {self.index.embedding_model}, using BM25 only: {e}")
+
+        stats = self.index.stats()
+        if not stats["documents"]:
+            logger.warning(f"Local index at {self.index.path} is empty")
+        else:
+            logger.info(f"Local index: {stats['documents']} documents in {stats['segments']} segments (embeddings: {'on' if self.embed else 'off'})")
+
+    def search(self, query: str, max_results: int = 3, timeout: float = None) -> list:
+        # Local and fast: the budget is not needed
+        from src.local_index import fuse_rankings
+
+        # Picks up segments added since the last query
+        self.index.refresh()
+        hits = self.index.search(query, max_results)
+        if self.embed is not None:
+            dense = self.index.search_embeddings(self.embed([query])[0], max_results)
+            hits = fuse_rankings([hits, dense], max_results)
+        return [
+            {"href": hit["url"], "title": hit["title"], "body": hit["text"][:300], "text": hit["text"]}
+            for hit in hits
+        ]
+
+    def stats(self) -> dict:
+        return {"name": self.name, **self.index.stats()}
+
+BACKENDS = {
+    "duckduckgo": DuckDuckGoBackend,
+    "local": LocalIndexBackend,
+}
+
+def get_search_backends(names: str = None) -> list:
+    """
+    Builds the backends named in SEARCH_BACKENDS (comma separated, tried
+    in order until one returns results). "duckduckgo" by default; "local"
+    for air-gapped deployments; "local,duckduckgo" to fall back to the web.
+    """
+    names = names or os.environ.get("SEARCH_BACKENDS", "duckduckgo")
+    backends = []
+    for name in (n.strip() for n in names.split(",") if n.strip()):
+        if name not in BACKENDS:
+            raise ValueError(f"Unknown search backend: {name}")
+        backends.append(BACKENDS[name]())
+    return backends
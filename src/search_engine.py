@@ -1,95 +1,297 @@
+import asyncio
 import logging
-from duckduckgo_search import DDGS
-import trafilatura
+import os
+import threading
+import time
+from typing import NamedTuple
+from src.http_client import get_http_client
+from src.extraction import extract_article
+from src.content_store import get_content_store
+from src.circuit_breaker import get_scrape_breaker
+from src.utils.cache import SQLiteCache
+from src.search_backends import get_search_backends
 
 logger = logging.getLogger(__name__)
+
+_search_cache = None
+_search_cache_lock = threading.Lock()
+
+def get_search_cache():
+    """
+    The on-disk search-result cache (SEARCH_CACHE_PATH), or None when
+    SEARCH_CACHE=off.
+    """
+    global _search_cache
+    if os.environ.get("SEARCH_CACHE", "on") == "off":
+        return None
+    with _search_cache_lock:
+        if _search_cache is None:
+            _search_cache = SQLiteCache(
+                os.environ.get("SEARCH_CACHE_PATH", "cache/search_cache.sqlite"),
+                maxsize=int(os.environ.get("SEARCH_CACHE_SIZE", 10000)),
+                ttl=float(os.environ.get("SEARCH_CACHE_TTL", 3600))
+            )
+        return _search_cache
+
+class EvidenceResult(NamedTuple):
+    """
+    What get_evidence found for one claim: the combined evidence text, the
+    source URLs in result order, the per-source passages it was built from
+    and the sources whose download was cut off by the time budget.
+    search_timed_out is set when the budget ran out during the search
+    itself (evidence is then empty).
+    """
+    evidence: str
+    sources: tuple
+    passages: tuple
+    timed_out: tuple = ()
+    search_timed_out: bool = False
+
+class SourcePassages(NamedTuple):
+    """
+    What collect_passages found: one passage per source, the urls whose
+    download was cut off by the budget, and whether the search itself was.
+    """
+    passages: list
+    timed_out: list
+    search_timed_out: bool = False
+
 class SearchEngine:
-    def __init__(self):
-        self.ddgs = DDGS()
-        self.last_sources = []
+    """
+    Search (through pluggable backends, see search_backends) and scraping.
+    Holds no per-request state, so one instance serves any number of
+    concurrent callers.
+    """
+    def __init__(self, backends=None):
+        # Tried in order until one returns results
+        self.backends = backends if backends is not None else get_search_backends()
+        self.search_cache = get_search_cache()
+        self.http = get_http_client()
+        # Extracted text per URL, revalidated with conditional requests
+        self.content_store = get_content_store()
+        # Per-URL budget for the download; slow sites fall back to their snippet
+        self.fetch_timeout = float(os.environ.get("SCRAPE_TIMEOUT", 5))
+        # Failing domains and URLs skip the download and use their snippet
+        self.breaker = get_scrape_breaker()
 
-    def search(self, query: str, max_results: int = 3):
+    def search(self, query: str, max_results: int = 3, timeout: float = None):
         """
-        Searches DuckDuckGo for the query and returns a list of result objects.
+        Searches the backends in order and returns the first non-empty list
+        of result objects. Web results are cached on disk by backend,
+        normalized query and max_results.
+
+        timeout (seconds) bounds all backends together. If it runs out
+        before any backend found results, raises TimeoutError: unlike an
+        empty search, that says nothing about the claim.
         """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        timed_out = False
+        for backend in self.backends:
+            remaining = None if deadline is None else max(deadline - time.monotonic(), 0.0)
+            try:
+                results = self._search_backend(backend, query, max_results, remaining)
+            except TimeoutError:
+                timed_out = True
+                continue
+            if results:
+                return results
+        if timed_out:
+            raise TimeoutError(f"Search ran out of its {timeout:.2f}s budget")
+        return []
+
+    def _search_backend(self, backend, query, max_results, timeout=None):
+        cache = self.search_cache if backend.cacheable else None
+        cache_key = f"{backend.name}:{max_results}:{' '.join(query.lower().split())}"
+        if cache is not None:
+            cached = cache.get(cache_key)
+            if cached is not None:
+                logger.info(f"Search cache hit for: {query}")
+                return cached
+
         try:
-            logger.info(f"Searching web for: {query}")
-            results = self.ddgs.text(query, max_results=max_results)
+            logger.info(f"Searching {backend.name} for: {query}")
+            results = backend.search(query, max_results=max_results, timeout=timeout)
             logger.info(f"Found {len(results)} results")
-            return results
+        except TimeoutError as e:
+            logger.warning(f"Search timed out: {e}")
+            raise
         except Exception as e:
             logger.error(f"Search failed: {e}")
             return []
 
+        # Empty results are not cached: they are usually rate limits
+        if cache is not None and results:
+            cache.set(cache_key, results)
+        return results
+
     def scrape(self, url: str):
         """
-        Downloads and extracts text from a URL using Trafilatura.
+        Downloads and extracts text from a URL.
         """
-        try:
+        return self.scrape_many([url])[0]
+
+    def scrape_many(self, urls: list, on_scraped=None, timeout: float = None) -> list:
+        """
+        Downloads all urls concurrently on the shared HTTP client, each with
+        its own timeout, and extracts their text in the shared extraction
+        process pool as each download finishes. Pages already in the content store are reused
+        (or revalidated). Returns the texts in url order ("" on failure).
+        on_scraped(url, text) is called as each one completes. URLs that
+        failed recently or whose domain's breaker is open are not
+        downloaded and get "".
+
+        timeout (seconds) bounds the whole call: downloads still running
+        when it expires are cancelled and their text is None. Only fetch
+        errors and SCRAPE_TIMEOUT overruns count against a domain.
+        """
+        if not urls:
+            return []
+        return self.http.run(self._scrape_all(urls, on_scraped, timeout))
+
+    async def _scrape_all(self, urls, on_scraped, timeout=None):
+        tasks = [asyncio.ensure_future(self._scrape_one(url, on_scraped)) for url in urls]
+        if timeout is None:
+            return await asyncio.gather(*tasks)
+
+        done, pending = await asyncio.wait(tasks, timeout=timeout)
+        # Not held against the sites: the budget is what the search left over
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+        return [task.result() if task in done else None for task in tasks]
+
+    async def _scrape_one(self, url, on_scraped):
+        if self.breaker.allow(url):
             logger.info(f"Scraping URL: {url}")
-            downloaded = trafilatura.fetch_url(url)
-            if downloaded:
-                text = trafilatura.extract(downloaded)
-                if text:
-                    return text
-            return ""
-        except Exception as e:
-            logger.error(f"Scraping failed for {url}: {e}")
-            return ""
+            text = await self.content_store.fetch(
+                self.http, url, extract_article, kind="article", timeout=self.fetch_timeout
+            )
+            if text is None:
+                self.breaker.record_failure(url)
+            elif text:
+                self.breaker.record_success(url)
+            else:
+                # Downloaded but nothing to extract: the domain is fine, this page is not
+                self.breaker.failed_urls.set(url, True)
+            text = text or ""
+        else:
+            logger.info(f"Skipping recently failing URL: {url}")
+            text = ""
+        if on_scraped:
+            on_scraped(url, text)
+        return text
+
+    def get_source_passages(self, claim: str, max_results: int = 3, passage_length: int = 500, on_progress=None, budget: float = None) -> list:
+        """
+        Searches for a claim and returns one passage per source, in result order.
+        Each passage is a dict with 'url', 'text' and 'snippet' (True when
+        scraping failed and the DDG snippet was used instead).
 
-    def get_evidence(self, claim: str, max_context_length: int = 1000) -> str:
+        on_progress(event, data), if given, is called with "sources" once the
+        search returns and with "source" after each source is scraped.
+        budget is passed to collect_passages.
+        """
+        return self.collect_passages(claim, max_results, passage_length, on_progress, budget).passages
+
+    def collect_passages(self, claim: str, max_results: int = 3, passage_length: int = 500, on_progress=None, budget: float = None):
+        """
+        get_source_passages, also reporting what the budget cut off.
+
+        budget (seconds) bounds search and scraping together. Sources not
+        scraped by then are cancelled and fall back to their snippet.
+        Returns a SourcePassages.
+        """
+        started = time.monotonic()
+
+        # 1. Search (within the budget too: a slow search would leave nothing for scraping)
+        try:
+            results = [res for res in self.search(claim, max_results=max_results, timeout=budget) if res.get('href')]
+        except TimeoutError:
+            logger.warning(f"Evidence budget of {budget}s ran out during the search")
+            return SourcePassages([], [], search_timed_out=True)
+        urls = [res['href'] for res in results]
+        snippets = {res['href']: res.get('body', '') for res in results}
+        # Backends with the text at hand (local index) need no download
+        local_texts = {res['href']: res['text'] for res in results if res.get('text')}
+        if on_progress:
+            on_progress("sources", {"urls": urls})
+
+        def on_scraped(url, text):
+            snippet = snippets[url]
+            on_progress("source", {
+                "url": url,
+                "ok": bool(text or snippet),
+                "snippet": not text and bool(snippet),
+                "chars": len(text[:passage_length]) if text else len(snippet),
+                "timed_out": False
+            })
+
+        # 2. Scrape (all sources at once, within what is left of the budget)
+        timeout = None if budget is None else max(budget - (time.monotonic() - started), 0.0)
+        remote = [url for url in urls if url not in local_texts]
+        scraped = dict(zip(remote, self.scrape_many(remote, on_scraped=on_scraped if on_progress else None, timeout=timeout)))
+        if on_progress:
+            for url in urls:
+                if url in local_texts:
+                    on_scraped(url, local_texts[url])
+        texts = [local_texts[url] if url in local_texts else scraped[url] for url in urls]
+
+        timed_out = [url for url, text in zip(urls, texts) if text is None]
+        if timed_out:
+            logger.warning(f"Evidence budget of {budget}s ran out before scraping {', '.join(timed_out)}")
+            if on_progress:
+                for url in timed_out:
+                    snippet = snippets[url]
+                    on_progress("source", {"url": url, "ok": bool(snippet), "snippet": bool(snippet), "chars": len(snippet), "timed_out": True})
+
+        passages = []
+        for url, text in zip(urls, texts):
+            snippet = snippets[url]
+            if text:
+                # Take the first passage_length chars of scraped text
+                passages.append({"url": url, "text": text[:passage_length].replace('\n', ' '), "snippet": False})
+            elif snippet:
+                # Fallback to DDG snippet
+                if text is not None:
+                    logger.warning(f"Scraping failed for {url}, using snippet.")
+                passages.append({"url": url, "text": snippet, "snippet": True})
+        return SourcePassages(passages, timed_out)
+
+    def get_evidence(self, claim: str, max_context_length: int = 1000, on_progress=None, budget: float = None) -> EvidenceResult:
         """
         Orchestrates the search and scrape process to find evidence for a claim.
-        Returns a single string of concatenated evidence.
+        Returns an EvidenceResult with the concatenated evidence and its sources
+        (evidence is "" when nothing was found).
+        on_progress is passed on to get_source_passages.
+
+        budget (seconds) is the total time allowed. Whatever sources finished
+        in time are used; the rest are cancelled and listed in timed_out.
         """
         logger.info(f"Gathering evidence for claim: {claim}")
         
-        # 1. Search
-        self.last_sources = []
-        results = self.search(claim, max_results=3)
-        if not results:
-            return "No evidence found on the web."
+        # 1. Search & 2. Scrape
+        passages, timed_out, search_timed_out = self.collect_passages(claim, max_results=3, on_progress=on_progress, budget=budget)
+        if not passages:
+            return EvidenceResult("", (), (), tuple(timed_out), search_timed_out)
 
-        # 2. Scrape & Aggregate
         evidence_parts = []
+        for passage in passages:
+            if passage["snippet"]:
+                evidence_parts.append(f"[Source: {passage['url']}] (Snippet) {passage['text']}")
+            else:
+                evidence_parts.append(f"[Source: {passage['url']}] {passage['text']}...")
 
-        for res in results:
-            url = res.get('href')
-            snippet = res.get('body', '')
-            
-            if url:
-                self.last_sources.append(url)
-                
-                # Try scraping first
-                text = self.scrape(url)
-                
-                if text:
-                    # Take the first 500 chars of scraped text
-                    content = text[:500].replace('\n', ' ')
-                    evidence_parts.append(f"[Source: {url}] {content}...")
-                elif snippet:
-                    # Fallback to DDG snippet
-                    logger.warning(f"Scraping failed for {url}, using snippet.")
-                    evidence_parts.append(f"[Source: {url}] (Snippet) {snippet}")        # 3. Combine
+        # 3. Combine
         full_evidence = "\n\n".join(evidence_parts)
         
         # 4. Truncate (Safety)
         if len(full_evidence) > max_context_length:
             full_evidence = full_evidence[:max_context_length] + "... (truncated)"
             
-        return full_evidence
-
-    def get_last_sources(self):
-        """
-        Returns the list of source URLs from the last evidence gathering operation.
-        
-        Returns:
-            list: List of source URLs, or empty list if no sources available.
-        """
-        return self.last_sources if hasattr(self, 'last_sources') else []
-
+        return EvidenceResult(full_evidence, tuple(passage["url"] for passage in passages), tuple(passages), tuple(timed_out))
 
 if __name__ == "__main__":
     # Test
     engine = SearchEngine()
-    print(engine.get_evidence("The moon is made of cheese"))
+    print(engine.get_evidence("The moon is made of cheese").evidence)
@@ -0,0 +1,117 @@
+import os
+import queue
+import threading
+from contextlib import contextmanager
+import onnxruntime as ort
+
+GRAPH_OPTIMIZATION_LEVELS = {
+    "disable": ort.GraphOptimizationLevel.ORT_DISABLE_ALL,
+    "basic": ort.GraphOptimizationLevel.ORT_ENABLE_BASIC,
+    "extended": ort.GraphOptimizationLevel.ORT_ENABLE_EXTENDED,
+    "all": ort.GraphOptimizationLevel.ORT_ENABLE_ALL,
+}
+
+EXECUTION_MODES = {
+    "sequential": ort.ExecutionMode.ORT_SEQUENTIAL,
+    "parallel": ort.ExecutionMode.ORT_PARALLEL,
+}
+
+def build_session_options(
+    intra_op_threads=None,
+    inter_op_threads=None,
+    graph_optimization=None,
+    execution_mode=None,
+    enable_mem_arena=None,
+    pool_size=1
+):
+    """
+    Builds ONNX Runtime SessionOptions. Unset arguments fall back to the
+    ORT_* environment variables, then to ONNX Runtime's defaults.
+
+    pool_size is the number of sessions that will share these options.
+    Without an explicit intra-op thread count, each of them gets
+    cores // pool_size threads instead of one per core, so a pool does not
+    oversubscribe the CPU pool_size times.
+    """
+    if intra_op_threads is None:
+        if "ORT_INTRA_OP_THREADS" in os.environ:
+            intra_op_threads = int(os.environ["ORT_INTRA_OP_THREADS"])
+        elif pool_size > 1:
+            intra_op_threads = max(1, (os.cpu_count() or 1) // pool_size)
+        else:
+            intra_op_threads = 0
+    if inter_op_threads is None:
+        inter_op_threads = int(os.environ.get("ORT_INTER_OP_THREADS", 0))
+    graph_optimization = graph_optimization or os.environ.get("ORT_GRAPH_OPTIMIZATION", "all")
+    execution_mode = execution_mode or os.environ.get("ORT_EXECUTION_MODE", "sequential")
+    if enable_mem_arena is None:
+        enable_mem_arena = os.environ.get("ORT_ENABLE_MEM_ARENA", "1") != "0"
+
+    if graph_optimization not in GRAPH_OPTIMIZATION_LEVELS:
+        raise ValueError(f"Unknown graph optimization level: {graph_optimization}")
+    if execution_mode not in EXECUTION_MODES:
+        raise ValueError(f"Unknown execution mode: {execution_mode}")
+
+    options = ort.SessionOptions()
+    # 0 lets ONNX Runtime pick (one thread per physical core)
+    options.intra_op_num_threads = intra_op_threads
+    options.inter_op_num_threads = inter_op_threads
+    options.graph_optimization_level = GRAPH_OPTIMIZATION_LEVELS[graph_optimization]
+    options.execution_mode = EXECUTION_MODES[execution_mode]
+    options.enable_cpu_mem_arena = enable_mem_arena
+    options.enable_mem_pattern = enable_mem_arena
+    return options
+
+class SessionPool:
+    """
+    A fixed set of InferenceSessions handed out one caller at a time, so
+    independent batches can run in parallel on many-core hosts.
+    """
+    def __init__(self, sessions):
+        if not sessions:
+            raise ValueError("SessionPool needs at least one session")
+        self.sessions = list(sessions)
+        self._available = queue.Queue()
+        for session in self.sessions:
+            self._available.put(session)
+
+        self._lock = threading.Lock()
+        self.runs = 0
+        self.waits = 0
+
+    @classmethod
+    def from_model(cls, model_path, size=None, options=None):
+        size = size or int(os.environ.get("ORT_SESSION_POOL_SIZE", 1))
+        options = options or build_session_options(pool_size=size)
+        return cls([ort.InferenceSession(model_path, sess_options=options) for _ in range(size)])
+
+    @property
+    def size(self):
+        return len(self.sessions)
+
+    @contextmanager
+    def acquire(self):
+        try:
+            session = self._available.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                self.waits += 1
+            session = self._available.get()
+        try:
+            yield session
+        finally:
+            self._available.put(session)
+
+    def run(self, output_names, inputs):
+        with self.acquire() as session:
+            with self._lock:
+                self.runs += 1
+            return session.run(output_names, inputs)
+
+    def stats(self) -> dict:
+        return {
+            "size": self.size,
+            "available": self._available.qsize(),
+            "runs": self.runs,
+            "waits": self.waits
+        }
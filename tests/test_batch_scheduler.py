@@ -0,0 +1,245 @@
+import unittest
+import asyncio
+import threading
+import time
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.api.batch_scheduler import BatchScheduler
+from src.api.inference_executor import InferenceExecutor
+from src.search_engine import EvidenceResult
+
+
+class FakeEngine:
+    """Records every batch it is asked to run."""
+
+    def __init__(self, fail=False):
+        self.batches = []
+        self.fail = fail
+        self.searches = []
+        self.deadlines = []
+        self.search_delay = 0
+
+    def predict_batch(self, claims, evidences):
+        if self.fail:
+            raise RuntimeError("ONNX failure")
+        self.batches.append(list(claims))
+        return [{"claim": c, "evidence": e, "result": "TRUE", "confidence": 0.9} for c, e in zip(claims, evidences)]
+
+    def gather_evidence(self, claim, on_progress=None, deadline=None):
+        self.searches.append(claim)
+        self.deadlines.append(deadline)
+        time.sleep(self.search_delay)
+        if on_progress:
+            on_progress("sources", {"urls": ["https://example.com"]})
+        return EvidenceResult(f"evidence for {claim}", ("https://example.com",), ())
+
+    def searched_prediction(self, claim, prediction, result):
+        return {**prediction, "sources": list(result.sources)}
+
+    def empty_result(self, claim, sources=None):
+        return {"claim": claim, "result": "UNCERTAIN", "sources": sources or []}
+
+    def lookup_verdict(self, claim, evidence=None):
+        return None
+
+    def store_verdict(self, claim, evidence, prediction):
+        pass
+
+
+class TestBatchScheduler(unittest.IsolatedAsyncioTestCase):
+    """Unit tests for the micro-batching scheduler."""
+
+    async def asyncSetUp(self):
+        self.engine = FakeEngine()
+        self.scheduler = BatchScheduler(self.engine, max_batch_size=8, max_wait_ms=20)
+        await self.scheduler.start()
+
+    async def asyncTearDown(self):
+        await self.scheduler.stop()
+
+    async def test_concurrent_requests_share_one_batch(self):
+        """Requests arriving within the wait window run in a single batch."""
+        claims = [f"claim {i}" for i in range(5)]
+        results = await asyncio.gather(*[self.scheduler.submit(c, "evidence") for c in claims])
+
+        self.assertEqual(len(self.engine.batches), 1)
+        self.assertEqual([r["claim"] for r in results], claims)
+
+    async def test_batches_split_at_max_size(self):
+        """No batch exceeds max_batch_size."""
+        claims = [f"claim {i}" for i in range(20)]
+        results = await asyncio.gather(*[self.scheduler.submit(c, "evidence") for c in claims])
+
+        self.assertTrue(all(len(b) <= 8 for b in self.engine.batches))
+        self.assertEqual(sum(len(b) for b in self.engine.batches), 20)
+        self.assertEqual([r["claim"] for r in results], claims)
+
+    async def test_verify_claim_auto_search_attaches_sources(self):
+        """Missing evidence triggers a search and the sources are returned."""
+        result = await self.scheduler.verify_claim("The sky is blue.")
+
+        self.assertEqual(result["evidence"], "evidence for The sky is blue.")
+        self.assertEqual(result["sources"], ["https://example.com"])
+
+    async def test_verify_claim_reports_progress(self):
+        """on_progress reaches the evidence gathering stage."""
+        events = []
+        await self.scheduler.verify_claim("The sky is blue.", on_progress=lambda event, data: events.append(event))
+
+        self.assertEqual(events, ["sources"])
+
+    async def test_inference_error_propagates_to_callers(self):
+        """A failing batch raises in every waiting caller."""
+        self.engine.fail = True
+
+        with self.assertRaises(RuntimeError):
+            await self.scheduler.submit("claim", "evidence")
+
+    async def test_stop_fails_partly_collected_batch(self):
+        """Items already taken off the queue when stop() cancels the collection are failed, not lost."""
+        await self.scheduler.stop()
+        self.scheduler = BatchScheduler(self.engine, max_batch_size=8, max_wait_ms=10000)
+        await self.scheduler.start()
+
+        pending = [asyncio.create_task(self.scheduler.submit(f"c{i}", "e")) for i in range(3)]
+        await asyncio.sleep(0.05)
+        self.assertEqual(self.scheduler.stats()["queued"], 0)
+
+        await self.scheduler.stop()
+
+        results = await asyncio.wait_for(asyncio.gather(*pending, return_exceptions=True), 1)
+        self.assertTrue(all(isinstance(r, RuntimeError) for r in results))
+        self.assertEqual(self.engine.batches, [])
+
+    async def test_searches_do_not_hold_inference_slots(self):
+        """Evidence-supplied verifications run while every inference slot's worth of searches is pending."""
+        await self.scheduler.stop()
+        inference = InferenceExecutor(max_workers=1)
+        evidence = InferenceExecutor(max_workers=4, name="evidence")
+        self.addCleanup(inference.shutdown)
+        self.addCleanup(evidence.shutdown)
+        self.scheduler = BatchScheduler(self.engine, max_wait_ms=1, executor=inference, evidence_executor=evidence)
+        await self.scheduler.start()
+        self.engine.search_delay = 0.3
+
+        searches = [asyncio.create_task(self.scheduler.verify_claim(f"claim {i}")) for i in range(3)]
+        await asyncio.sleep(0.05)
+        await asyncio.wait_for(self.scheduler.verify_claim("The sky is blue.", "It is blue."), 0.2)
+
+        self.assertFalse(any(search.done() for search in searches))
+        await asyncio.gather(*searches)
+
+    async def test_batches_run_in_parallel_up_to_limit(self):
+        """With two slots, a second batch starts while the first is still running."""
+        await self.scheduler.stop()
+        active = []
+        peak = []
+        lock = threading.Lock()
+
+        def slow_predict(claims, evidences):
+            with lock:
+                active.append(1)
+                peak.append(len(active))
+            time.sleep(0.05)
+            with lock:
+                active.pop()
+            return [{"claim": c} for c in claims]
+
+        self.engine.predict_batch = slow_predict
+        self.scheduler = BatchScheduler(self.engine, max_batch_size=2, max_wait_ms=1, max_concurrent_batches=2)
+        await self.scheduler.start()
+
+        results = await asyncio.gather(*[self.scheduler.submit(f"c{i}", "e") for i in range(6)])
+
+        self.assertEqual(max(peak), 2)
+        self.assertEqual([r["claim"] for r in results], [f"c{i}" for i in range(6)])
+
+    async def test_identical_verifications_are_coalesced(self):
+        """Concurrent identical claims share one search and one inference."""
+        self.engine.search_delay = 0.05
+
+        results = await asyncio.gather(
+            *[self.scheduler.verify_claim("The sky is blue.") for _ in range(10)],
+            self.scheduler.verify_claim("  The sky   is blue. "),
+            self.scheduler.verify_claim("The sky is green.")
+        )
+
+        self.assertEqual(sorted(self.engine.searches), ["The sky is blue.", "The sky is green."])
+        self.assertEqual(sum(len(b) for b in self.engine.batches), 2)
+        self.assertEqual(results[0], results[9])
+        self.assertIsNot(results[0], results[9])
+        # Each caller's response echoes its own claim
+        self.assertEqual(results[10]["claim"], "  The sky   is blue. ")
+        self.assertEqual(self.scheduler.stats()["single_flight"], {"executions": 2, "coalesced": 10, "in_flight": 0})
+
+    async def test_callers_join_searches_ending_before_their_deadline(self):
+        """A caller never waits on a search running to someone else's longer deadline."""
+        self.engine.search_delay = 0.05
+        deadline = time.monotonic() + 1.5
+
+        await asyncio.gather(
+            self.scheduler.verify_claim("The sky is blue.", deadline=deadline),
+            # Joins: the search above is done before this caller's deadline
+            self.scheduler.verify_claim("The sky is blue.", deadline=deadline + 2.0),
+            # Shorter budget than the search in flight: starts its own
+            self.scheduler.verify_claim("The sky is blue.", deadline=deadline - 1.0)
+        )
+
+        self.assertEqual(len(self.engine.searches), 2)
+        self.assertEqual(self.engine.deadlines, [deadline, deadline - 1.0])
+
+    async def test_staggered_callers_share_one_search(self):
+        """A herd arriving over time, each with its own default deadline, runs one search."""
+        self.engine.search_delay = 0.3
+        callers = []
+        for _ in range(10):
+            callers.append(asyncio.create_task(self.scheduler.verify_claim("The sky is blue.", deadline=time.monotonic() + 1.5)))
+            await asyncio.sleep(0.025)
+
+        await asyncio.gather(*callers)
+
+        self.assertEqual(len(self.engine.searches), 1)
+        self.assertEqual(self.scheduler.stats()["single_flight"]["coalesced"], 9)
+
+    async def test_coalesced_callers_all_get_progress(self):
+        """Callers joining late still see the stages that already happened."""
+        self.engine.search_delay = 0.05
+        first, second = [], []
+
+        await asyncio.gather(
+            self.scheduler.verify_claim("The sky is blue.", on_progress=lambda event, data: first.append(event)),
+            self.scheduler.verify_claim("The sky is blue.", on_progress=lambda event, data: second.append(event))
+        )
+
+        self.assertEqual(first, ["sources"])
+        self.assertEqual(second, ["sources"])
+        self.assertEqual(len(self.engine.searches), 1)
+
+    async def test_cancelled_caller_does_not_cancel_others(self):
+        """The shared execution keeps running while any caller still waits for it."""
+        self.engine.search_delay = 0.05
+        leader = asyncio.create_task(self.scheduler.verify_claim("The sky is blue."))
+        follower = asyncio.create_task(self.scheduler.verify_claim("The sky is blue."))
+        await asyncio.sleep(0.01)
+
+        leader.cancel()
+        result = await follower
+
+        self.assertEqual(result["evidence"], "evidence for The sky is blue.")
+        self.assertTrue(leader.cancelled())
+
+    async def test_stats(self):
+        """Stats count batches and items."""
+        await asyncio.gather(*[self.scheduler.submit(f"c{i}", "e") for i in range(3)])
+
+        stats = self.scheduler.stats()
+        self.assertEqual(stats["batches_run"], 1)
+        self.assertEqual(stats["items_run"], 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
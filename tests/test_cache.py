@@ -0,0 +1,119 @@
+import unittest
+from unittest.mock import patch
+import sys
+import os
+import tempfile
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.utils.cache import LRUCache, TTLCache, SQLiteCache
+
+
+class TestLRUCache(unittest.TestCase):
+    """Unit tests for the in-memory LRU cache."""
+
+    def test_evicts_least_recently_used(self):
+        """Reading an entry protects it from eviction."""
+        cache = LRUCache(maxsize=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        self.assertEqual(cache.get("a"), 1)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(len(cache), 2)
+
+    def test_stats(self):
+        """Hits and misses are counted."""
+        cache = LRUCache(maxsize=2)
+        cache.set("a", 1)
+        cache.get("a")
+        cache.get("missing")
+
+        stats = cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 1))
+        self.assertEqual(stats["hit_rate"], 0.5)
+
+
+class TestTTLCache(unittest.TestCase):
+    """Unit tests for the TTL cache."""
+
+    @patch('src.utils.cache.time')
+    def test_entries_expire(self, mock_time):
+        """Entries are dropped once their TTL has passed."""
+        mock_time.monotonic.return_value = 100.0
+        cache = TTLCache(maxsize=10, ttl=60)
+        cache.set("a", 1)
+
+        mock_time.monotonic.return_value = 159.0
+        self.assertEqual(cache.get("a"), 1)
+
+        mock_time.monotonic.return_value = 161.0
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(len(cache), 0)
+
+    @patch('src.utils.cache.time')
+    def test_per_entry_ttl(self, mock_time):
+        """A TTL passed to set() overrides the default."""
+        mock_time.monotonic.return_value = 100.0
+        cache = TTLCache(maxsize=10, ttl=60)
+        cache.set("short", 1, ttl=5)
+        cache.set("long", 2)
+
+        mock_time.monotonic.return_value = 110.0
+        self.assertIsNone(cache.get("short"))
+        self.assertEqual(cache.get("long"), 2)
+
+
+class TestSQLiteCache(unittest.TestCase):
+    """Unit tests for the disk-backed cache."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "cache", "test.sqlite")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_survives_restart_and_is_shared(self):
+        """A second instance on the same file sees the first one's entries."""
+        SQLiteCache(self.path).set("q", [{"href": "https://example.com"}])
+
+        self.assertEqual(SQLiteCache(self.path).get("q"), [{"href": "https://example.com"}])
+
+    @patch('src.utils.cache.time')
+    def test_entries_expire(self, mock_time):
+        mock_time.time.return_value = 100.0
+        cache = SQLiteCache(self.path, ttl=60)
+        cache.set("a", 1)
+        cache.set("short", 2, ttl=5)
+
+        mock_time.time.return_value = 110.0
+        self.assertEqual(cache.get("a"), 1)
+        self.assertIsNone(cache.get("short"))
+
+        mock_time.time.return_value = 161.0
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(len(cache), 0)
+
+    @patch('src.utils.cache.time')
+    def test_evicts_least_recently_used(self, mock_time):
+        mock_time.time.return_value = 100.0
+        cache = SQLiteCache(self.path, maxsize=2)
+        cache.set("a", 1)
+        mock_time.time.return_value = 101.0
+        cache.set("b", 2)
+        mock_time.time.return_value = 102.0
+        cache.get("a")
+        mock_time.time.return_value = 103.0
+        cache.set("c", 3)
+
+        self.assertEqual(cache.get("a"), 1)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(len(cache), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+import unittest
+from unittest.mock import patch
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.circuit_breaker import ScrapeCircuitBreaker, domain_of
+
+
+class TestScrapeCircuitBreaker(unittest.TestCase):
+    """Unit tests for the per-domain scrape breaker and negative cache."""
+
+    def setUp(self):
+        self.now = 1000.0
+        patcher = patch('src.circuit_breaker.time.monotonic', side_effect=lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.breaker = ScrapeCircuitBreaker(threshold=2, cooldown=60, negative_ttl=600)
+
+    def test_opens_after_consecutive_failures(self):
+        self.breaker.record_failure("https://a.com/1", negative_cache=False)
+        self.assertTrue(self.breaker.allow("https://a.com/2"))
+
+        self.breaker.record_failure("https://www.a.com/2", negative_cache=False)
+
+        self.assertFalse(self.breaker.allow("https://a.com/3"))
+        self.assertTrue(self.breaker.allow("https://b.com/3"))
+        self.assertEqual(self.breaker.domains()["a.com"]["state"], "open")
+        self.assertEqual(self.breaker.stats()["short_circuited"], 1)
+
+    def test_success_resets_failures(self):
+        self.breaker.record_failure("https://a.com/1", negative_cache=False)
+        self.breaker.record_success("https://a.com/2")
+        self.breaker.record_failure("https://a.com/3", negative_cache=False)
+
+        self.assertTrue(self.breaker.allow("https://a.com/4"))
+
+    def test_half_open_lets_one_probe_through(self):
+        for i in range(2):
+            self.breaker.record_failure(f"https://a.com/{i}", negative_cache=False)
+        self.now += 61
+
+        self.assertEqual(self.breaker.domains()["a.com"]["state"], "half_open")
+        self.assertTrue(self.breaker.allow("https://a.com/probe"))
+        self.assertFalse(self.breaker.allow("https://a.com/other"))
+
+        # A failed probe opens the breaker for another cooldown
+        self.breaker.record_failure("https://a.com/probe", negative_cache=False)
+        self.assertEqual(self.breaker.domains()["a.com"]["trips"], 2)
+        self.now += 30
+        self.assertFalse(self.breaker.allow("https://a.com/other"))
+
+        # A successful one closes it
+        self.now += 31
+        self.assertTrue(self.breaker.allow("https://a.com/probe"))
+        self.breaker.record_success("https://a.com/probe")
+        self.assertEqual(self.breaker.domains(), {})
+
+    def test_negative_cache_expires(self):
+        self.breaker.record_failure("https://a.com/1")
+
+        self.assertFalse(self.breaker.allow("https://a.com/1"))
+        self.assertTrue(self.breaker.allow("https://a.com/2"))
+        self.now += 601
+        self.assertTrue(self.breaker.allow("https://a.com/1"))
+
+    def test_reset(self):
+        for url in ["https://a.com/1", "https://a.com/2", "https://b.com/1", "https://b.com/2"]:
+            self.breaker.record_failure(url)
+
+        self.breaker.reset("www.a.com")
+        self.assertEqual(list(self.breaker.domains()), ["b.com"])
+        self.assertFalse(self.breaker.allow("https://a.com/1"))
+
+        self.breaker.reset()
+        self.assertEqual(self.breaker.domains(), {})
+        self.assertTrue(self.breaker.allow("https://a.com/1"))
+
+    def test_domain_of(self):
+        self.assertEqual(domain_of("https://WWW.Example.com:8080/path"), "example.com")
+        self.assertEqual(domain_of("https://news.example.com/"), "news.example.com")
+
+
+if __name__ == '__main__':
+    unittest.main()
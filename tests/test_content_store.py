@@ -0,0 +1,96 @@
+import unittest
+from unittest.mock import Mock
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.content_store import ContentStore
+from src.extraction import ExtractPool
+from src.http_client import FetchResponse
+
+
+class FakeHTTP:
+    """Answers conditional requests like a server whose page has ETag "v1"."""
+
+    def __init__(self):
+        self.requests = []
+        self.etag = '"v1"'
+        self.fail = False
+
+    async def fetch_response(self, url, timeout=None, headers=None):
+        self.requests.append(headers or {})
+        if self.fail:
+            return None
+        if headers and headers.get("If-None-Match") == self.etag:
+            return FetchResponse(304, None, {"etag": self.etag})
+        return FetchResponse(200, f"<html>{url} {self.etag}</html>".encode(), {"etag": self.etag, "last-modified": "Mon, 01 Jan 2024 00:00:00 GMT"})
+
+
+class TestContentStore(unittest.IsolatedAsyncioTestCase):
+    """Unit tests for the URL-keyed content store."""
+
+    async def asyncSetUp(self):
+        self.http = FakeHTTP()
+        self.extract = Mock(side_effect=lambda content, encoding: content.decode()[6:-7])
+        # Extract in-process: the Mock cannot be sent to a worker process
+        self.pool = ExtractPool(workers=0)
+
+    async def test_fresh_entries_skip_the_network(self):
+        store = ContentStore(fresh_seconds=60, extract_pool=self.pool)
+        first = await store.fetch(self.http, "https://a.com", self.extract)
+        second = await store.fetch(self.http, "https://a.com", self.extract)
+
+        self.assertEqual(first, second)
+        self.assertEqual(len(self.http.requests), 1)
+        self.assertEqual(store.stats()["hits"], 1)
+
+    async def test_304_skips_download_and_extraction(self):
+        store = ContentStore(fresh_seconds=0, extract_pool=self.pool)
+        await store.fetch(self.http, "https://a.com", self.extract)
+        text = await store.fetch(self.http, "https://a.com", self.extract)
+
+        self.assertEqual(text, 'https://a.com "v1"')
+        self.assertEqual(self.http.requests[1]["If-None-Match"], '"v1"')
+        self.assertEqual(self.http.requests[1]["If-Modified-Since"], "Mon, 01 Jan 2024 00:00:00 GMT")
+        self.assertEqual(self.extract.call_count, 1)
+        self.assertEqual(store.stats()["revalidated"], 1)
+
+    async def test_changed_page_is_extracted_again(self):
+        store = ContentStore(fresh_seconds=0, extract_pool=self.pool)
+        await store.fetch(self.http, "https://a.com", self.extract)
+        self.http.etag = '"v2"'
+        text = await store.fetch(self.http, "https://a.com", self.extract)
+
+        self.assertEqual(text, 'https://a.com "v2"')
+        self.assertEqual(self.extract.call_count, 2)
+
+    async def test_stale_copy_served_when_fetch_fails(self):
+        store = ContentStore(fresh_seconds=0, extract_pool=self.pool)
+        await store.fetch(self.http, "https://a.com", self.extract)
+        self.http.fail = True
+
+        self.assertEqual(await store.fetch(self.http, "https://a.com", self.extract), 'https://a.com "v1"')
+        self.assertIsNone(await store.fetch(self.http, "https://b.com", self.extract))
+
+    def test_bounded_by_bytes_with_lru_eviction(self):
+        store = ContentStore(max_bytes=10)
+        store.put("https://a.com", "aaaa")
+        store.put("https://b.com", "bbbb")
+        store.get("https://a.com")
+        store.put("https://c.com", "cccc")
+
+        self.assertIsNotNone(store.get("https://a.com"))
+        self.assertIsNone(store.get("https://b.com"))
+        self.assertEqual(store.stats()["bytes"], 8)
+
+    def test_kinds_are_separate(self):
+        store = ContentStore()
+        store.put("https://a.com", "article text", kind="article")
+
+        self.assertIsNone(store.get("https://a.com", kind="capture"))
+
+
+if __name__ == '__main__':
+    unittest.main()
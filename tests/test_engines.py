@@ -0,0 +1,92 @@
+import unittest
+import threading
+import time
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.api.engines import EngineRegistry
+
+
+class TestEngineRegistry(unittest.IsolatedAsyncioTestCase):
+    """Unit tests for parallel and lazy engine loading."""
+
+    async def test_eager_engines_load_in_parallel(self):
+        """Two slow eager engines load in roughly the time of one."""
+        def slow(value):
+            def factory():
+                time.sleep(0.2)
+                return value
+            return factory
+
+        registry = EngineRegistry()
+        registry.register("a", slow("A"))
+        registry.register("b", slow("B"))
+
+        start = time.perf_counter()
+        await registry.load_eager()
+        elapsed = time.perf_counter() - start
+
+        self.assertLess(elapsed, 0.35)
+        self.assertEqual(registry.get("a"), "A")
+        self.assertEqual(registry.get("b"), "B")
+        self.assertTrue(registry.ready())
+
+    async def test_lazy_engine_loads_on_first_use(self):
+        """Lazy engines stay cold through startup and load once."""
+        calls = []
+        registry = EngineRegistry()
+        registry.register("eager", lambda: "E")
+        registry.register("lazy", lambda: calls.append(1) or "L", lazy=True)
+
+        await registry.load_eager()
+        self.assertEqual(registry.status()["lazy"]["status"], "cold")
+        self.assertTrue(registry.ready())
+
+        self.assertEqual(await registry.aget("lazy"), "L")
+        self.assertEqual(registry.get("lazy"), "L")
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(registry.status()["lazy"]["status"], "warm")
+
+    async def test_failed_engine_is_reported(self):
+        """A factory that raises leaves the engine failed and the API not ready."""
+        def broken():
+            raise RuntimeError("model missing")
+
+        registry = EngineRegistry()
+        registry.register("ok", lambda: "OK")
+        registry.register("broken", broken)
+        await registry.load_eager()
+
+        self.assertIsNone(registry.get("broken"))
+        self.assertFalse(registry.ready())
+        status = registry.status()["broken"]
+        self.assertEqual(status["status"], "failed")
+        self.assertEqual(status["error"], "model missing")
+
+    def test_concurrent_first_use_loads_once(self):
+        """Threads racing on a cold lazy engine share a single load."""
+        calls = []
+
+        def factory():
+            calls.append(1)
+            time.sleep(0.05)
+            return object()
+
+        registry = EngineRegistry()
+        registry.register("lazy", factory, lazy=True)
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(registry.get("lazy"))) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertTrue(all(r is results[0] for r in results))
+
+
+if __name__ == '__main__':
+    unittest.main()
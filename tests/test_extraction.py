@@ -0,0 +1,75 @@
+import unittest
+import time
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.extraction import ExtractPool, extract_article, extract_capture
+
+ARTICLE = ("<html><head><title>Moon facts</title></head><body><nav>Menu</nav><article>"
+           + "<p>The Moon is a rocky body orbiting the Earth and it is not made of cheese at all.</p>" * 5
+           + "</article><script>var x = 1;</script></body></html>")
+
+def hang(content, encoding=None):
+    time.sleep(60)
+
+def crash(content, encoding=None):
+    os._exit(1)
+
+
+class TestExtractors(unittest.TestCase):
+    """The extractors take raw bytes plus the declared charset."""
+
+    def test_extract_article(self):
+        text = extract_article(ARTICLE.encode())
+
+        self.assertIn("not made of cheese", text)
+        self.assertNotIn("var x", text)
+        self.assertEqual(extract_article(b""), "")
+
+    def test_extract_capture(self):
+        page = extract_capture(ARTICLE.encode())
+
+        self.assertEqual(page["title"], "Moon facts")
+        self.assertNotIn("Menu", page["text"])
+        self.assertNotIn("var x", page["text"])
+
+    def test_declared_charset_is_used(self):
+        html = "<html><head><title>Café</title></head><body></body></html>".encode("latin-1")
+
+        self.assertEqual(extract_capture(html, "iso-8859-1")["title"], "Café")
+
+
+class TestExtractPool(unittest.IsolatedAsyncioTestCase):
+    """Extraction jobs run in worker processes with a per-job timeout."""
+
+    async def asyncSetUp(self):
+        self.pool = ExtractPool(workers=1, timeout=3)
+        self.addCleanup(self.pool.shutdown)
+
+    async def test_runs_in_worker_process(self):
+        page = await self.pool.run(extract_capture, ARTICLE.encode())
+
+        self.assertEqual(page["title"], "Moon facts")
+        self.assertEqual(self.pool.stats()["jobs"], 1)
+
+    async def test_timeout_replaces_stuck_worker(self):
+        self.assertIsNone(await self.pool.run(hang, b"<html></html>"))
+
+        # The next job gets a fresh worker instead of queueing behind the stuck one
+        page = await self.pool.run(extract_capture, ARTICLE.encode())
+        self.assertEqual(page["title"], "Moon facts")
+        self.assertEqual(self.pool.timeouts, 1)
+        self.assertEqual(self.pool.restarts, 1)
+
+    async def test_crashed_worker_is_replaced(self):
+        self.assertIsNone(await self.pool.run(crash, b""))
+
+        self.assertIsNotNone(await self.pool.run(extract_capture, ARTICLE.encode()))
+        self.assertEqual(self.pool.errors, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
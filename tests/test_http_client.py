@@ -0,0 +1,160 @@
+import unittest
+from unittest.mock import patch
+import asyncio
+import http.server
+import threading
+import time
+import sys
+import os
+
+import httpx
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.http_client import AsyncHTTPClient, DNSCache
+
+
+in_flight = {"now": 0, "peak": 0}
+
+async def handler(request):
+    if request.url.path == "/busy":
+        in_flight["now"] += 1
+        in_flight["peak"] = max(in_flight["peak"], in_flight["now"])
+        await asyncio.sleep(0.05)
+        in_flight["now"] -= 1
+    if request.url.path == "/slow":
+        await asyncio.sleep(1)
+    if request.url.path == "/missing":
+        return httpx.Response(404)
+    if request.url.path == "/large":
+        return httpx.Response(200, content=b"x" * 100)
+    return httpx.Response(200, text=f"page {request.url.path}")
+
+
+class TestAsyncHTTPClient(unittest.TestCase):
+    """Unit tests for the shared async HTTP client."""
+
+    def setUp(self):
+        self.client = AsyncHTTPClient(timeout=5, max_bytes=10)
+        self.client._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    def tearDown(self):
+        self.client.close()
+
+    def fetch_all(self, urls, timeout=None):
+        async def fetch_all():
+            return await asyncio.gather(*[self.client.fetch(url, timeout=timeout) for url in urls])
+        return self.client.run(fetch_all())
+
+    def test_fetch_returns_text(self):
+        self.assertEqual(self.fetch_all(["https://example.com/a"]), ["page /a"])
+
+    def test_non_200_returns_none(self):
+        self.assertEqual(self.fetch_all(["https://example.com/missing"]), [None])
+
+    def test_body_is_capped(self):
+        self.assertEqual(self.fetch_all(["https://example.com/large"]), ["x" * 10])
+
+    def test_timeout_is_per_fetch(self):
+        """A slow URL times out without holding up or failing the others."""
+        start = time.perf_counter()
+        results = self.fetch_all(["https://example.com/a", "https://example.com/slow", "https://example.com/b"], timeout=0.2)
+
+        self.assertLess(time.perf_counter() - start, 0.8)
+        self.assertEqual(results, ["page /a", None, "page /b"])
+        self.assertEqual(self.client.stats()["timeouts"], 1)
+
+    def test_requests_per_host_are_capped(self):
+        """No more than max_per_host requests run against one host at a time."""
+        self.client.max_per_host = 2
+        in_flight["peak"] = 0
+
+        results = self.fetch_all(["https://example.com/busy"] * 6 + ["https://other.example.com/a"])
+
+        self.assertEqual(in_flight["peak"], 2)
+        self.assertEqual(results[-1], "page /a")
+        stats = self.client.stats()
+        self.assertEqual(stats["requests"], 7)
+        self.assertEqual(stats["host_waits"], 4)
+        # Slots of idle hosts are released
+        self.assertEqual(self.client._host_slots, {})
+
+    def test_request_raises_on_error(self):
+        response = self.client.run(self.client.request("GET", "https://example.com/missing"))
+        self.assertEqual(response.status_code, 404)
+
+        with self.assertRaises(httpx.TimeoutException):
+            self.client.run(self.client.request("GET", "https://example.com/slow", timeout=0.1))
+
+
+class Handler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        body = b"hello"
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestPooledTransport(unittest.TestCase):
+    """The real transport: keep-alive pool plus DNS cache, against a local server."""
+
+    def setUp(self):
+        self.server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        with patch('urllib.request.getproxies', return_value={}):
+            self.client = AsyncHTTPClient(max_per_host=2)
+        self.addCleanup(self.client.close)
+
+    def test_connections_and_dns_answers_are_reused(self):
+        url = f"http://localhost:{self.server.server_port}/"
+
+        async def fetch_all():
+            return await asyncio.gather(*[self.client.fetch(url) for _ in range(10)])
+
+        self.assertEqual(self.client.run(fetch_all()), ["hello"] * 10)
+        self.assertEqual(self.client.run(fetch_all()), ["hello"] * 10)
+
+        stats = self.client.stats()
+        self.assertEqual(stats["connections"], 2)
+        self.assertEqual(stats["dns_cache"]["misses"], 1)
+
+
+class TestDNSCache(unittest.IsolatedAsyncioTestCase):
+
+    async def test_concurrent_lookups_share_one_resolution(self):
+        cache = DNSCache(ttl=60)
+        calls = []
+
+        async def lookup(host, port):
+            calls.append(host)
+            await asyncio.sleep(0.01)
+            return ["127.0.0.1"]
+
+        with patch.object(cache, '_lookup', lookup):
+            results = await asyncio.gather(*[cache.resolve("example.com", 443) for _ in range(5)])
+            await cache.resolve("example.com", 443)
+
+        self.assertEqual(results, [["127.0.0.1"]] * 5)
+        self.assertEqual(calls, ["example.com"])
+        self.assertEqual(cache.stats(), {"entries": 1, "hits": 5, "misses": 1})
+
+    async def test_entries_expire(self):
+        cache = DNSCache(ttl=0)
+        with patch.object(cache, '_lookup', return_value=["127.0.0.1"]) as lookup:
+            await cache.resolve("example.com", 443)
+            await cache.resolve("example.com", 443)
+
+        self.assertEqual(lookup.call_count, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,384 @@
+import unittest
+from unittest.mock import Mock
+import threading
+import time
+import numpy as np
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.inference_engine import InferenceEngine, aggregate_probs
+from src.utils.cache import LRUCache, TTLCache
+from src.session_pool import SessionPool
+from src.prescreen import LexicalPrescreen
+from src.search_engine import EvidenceResult, SourcePassages
+
+
+def make_engine(logits_fn, batch_size=4, padding_strategy="dynamic", evidence_mode="truncate", prescreen=None):
+    """
+    Builds an InferenceEngine without loading a model or tokenizer.
+    logits_fn receives the input_ids matrix and returns the logits matrix.
+    The fake tokenizer emits one token per character.
+    """
+    engine = InferenceEngine.__new__(InferenceEngine)
+    engine.labels = {0: "FALSE", 1: "TRUE"}
+    engine.confidence_threshold = 0.75
+    engine.batch_size = batch_size
+    engine.max_length = 128
+    engine.padding_strategy = padding_strategy
+    engine.length_buckets = (32, 64, 128)
+    engine.evidence_mode = evidence_mode
+    engine.window_overlap = 32
+    engine.max_windows = 8
+    engine.window_aggregation = "max_entailment"
+    engine.source_aggregation = "max_confidence"
+    engine.token_cache = LRUCache(100)
+    engine.model_path = "test-model.onnx"
+    engine.model_version = "test-model"
+    engine._model_lock = threading.Lock()
+    engine.model_registry = None
+    engine.verdict_cache = TTLCache(100, ttl=60)
+    engine.search_verdict_ttl = 10
+    engine.evidence_budget = 1.5
+    engine.evidence_inference_reserve = 0.25
+    engine.prescreen = prescreen
+
+    def tokenize(texts, **kwargs):
+        return {"input_ids": [[ord(c) for c in t] for t in texts]}
+
+    engine.tokenizer = Mock(side_effect=tokenize)
+    engine.tokenizer.pad_token_id = 0
+    engine.tokenizer.cls_token_id = 101
+    engine.tokenizer.sep_token_id = 102
+    engine.session = Mock()
+    engine.session.run.side_effect = lambda _, inputs: [logits_fn(inputs["input_ids"])]
+    engine.session_pool = SessionPool([engine.session])
+    return engine
+
+
+class TestBatchInference(unittest.TestCase):
+    """Unit tests for batched prediction with a stubbed ONNX session."""
+
+    def test_softmax_is_row_wise(self):
+        """Softmax normalises each row of a logits matrix independently."""
+        engine = make_engine(lambda ids: None)
+        probs = engine.softmax(np.array([[0.0, 0.0], [10.0, 0.0]]))
+
+        np.testing.assert_allclose(probs.sum(axis=1), [1.0, 1.0])
+        self.assertAlmostEqual(probs[0, 0], 0.5)
+        self.assertGreater(probs[1, 0], 0.99)
+
+    def test_predict_batch_applies_logic_gate(self):
+        """Each row gets its own verdict, with low confidence marked UNCERTAIN."""
+        logits = np.array([[0.0, 5.0], [5.0, 0.0], [0.1, 0.1]], dtype=np.float32)
+        engine = make_engine(lambda ids: logits)
+
+        results = engine.predict_batch(["a", "b", "c"], ["x", "y", "z"])
+
+        self.assertEqual([r["result"] for r in results], ["TRUE", "FALSE", "UNCERTAIN"])
+        self.assertEqual(engine.session.run.call_count, 1)
+
+    def test_verify_batch_chunks_and_keeps_order(self):
+        """Large batches are split into batch_size ONNX calls, in input order."""
+        # Verdict depends on sequence length so order can be checked
+        engine = make_engine(lambda ids: np.array([[0.0, 5.0] if (row > 0).sum() % 2 else [5.0, 0.0] for row in ids], dtype=np.float32))
+        claims = ["a" * i for i in range(1, 11)]
+
+        results = engine.verify_batch(claims, ["e"] * 10)
+
+        self.assertEqual(engine.session.run.call_count, 3)
+        self.assertEqual([r["claim"] for r in results], claims)
+        # [CLS] claim [SEP] e [SEP] adds 4 tokens, so odd claim lengths are TRUE
+        self.assertEqual([r["result"] for r in results], ["TRUE" if i % 2 else "FALSE" for i in range(1, 11)])
+
+    def test_dynamic_padding_buckets_by_length(self):
+        """Short and long inputs run in separate calls, each padded to its longest sequence."""
+        engine = make_engine(lambda ids: np.tile([0.0, 5.0], (len(ids), 1)))
+        claims = ["short", "x" * 50, "tiny", "y" * 110]
+
+        results = engine.predict_batch(claims, ["e"] * 4)
+
+        shapes = sorted(call.args[1]["input_ids"].shape for call in engine.session.run.call_args_list)
+        # [CLS] claim [SEP] e [SEP] = len(claim) + 4 tokens
+        self.assertEqual(shapes, [(1, 54), (1, 114), (2, 9)])
+        self.assertEqual([r["claim"] for r in results], claims)
+
+    def test_dynamic_padding_matches_max_length(self):
+        """Both padding strategies produce the same verdicts."""
+        def masked_logits(ids):
+            # Depends only on the unpadded tokens, like a real masked model
+            return np.array([[0.0, 5.0] if (row > 0).sum() % 3 else [5.0, 0.0] for row in ids], dtype=np.float32)
+
+        claims = ["a" * i for i in range(1, 40, 7)]
+        dynamic = make_engine(masked_logits).predict_batch(claims, ["e"] * len(claims))
+        padded = make_engine(masked_logits, padding_strategy="max_length").predict_batch(claims, ["e"] * len(claims))
+
+        self.assertEqual([r["result"] for r in dynamic], [r["result"] for r in padded])
+
+    def test_sequences_are_truncated_to_max_length(self):
+        """Long evidence is cut so the sequence still ends with [SEP]."""
+        engine = make_engine(lambda ids: None)
+
+        sequence = engine._build_sequences(["claim"], ["e" * 500])[0]
+
+        self.assertEqual(len(sequence), 128)
+        self.assertEqual(sequence[0], 101)
+        self.assertEqual(sequence[-1], 102)
+
+    def test_token_cache_batches_misses_and_reuses_ids(self):
+        """Repeated strings are tokenized once; misses go through one tokenizer call."""
+        engine = make_engine(lambda ids: np.tile([0.0, 5.0], (len(ids), 1)))
+
+        engine.predict_batch(["same", "same", "other"], ["evidence"] * 3)
+        first_calls = engine.tokenizer.call_count
+        engine.predict_batch(["same", "other"], ["new evidence", "new evidence"])
+
+        # One call for claims and one for evidence; the second time only the new evidence
+        self.assertEqual(first_calls, 2)
+        self.assertEqual(engine.tokenizer.call_count, 3)
+        self.assertEqual(engine.tokenizer.call_args_list[0].args[0], ["same", "other"])
+        self.assertEqual(engine.tokenizer.call_args_list[2].args[0], ["new evidence"])
+        self.assertGreater(engine.token_cache.hits, 0)
+
+    def test_verdict_cache_skips_model_for_repeated_pairs(self):
+        """A repeated pair (modulo whitespace) is served from the verdict cache."""
+        engine = make_engine(lambda ids: np.tile([0.0, 5.0], (len(ids), 1)))
+
+        first = engine.predict_batch(["The sky is blue."], ["It is blue."])[0]
+        second = engine.predict_batch(["The  sky is blue. "], ["It is\nblue."])[0]
+
+        self.assertEqual(engine.session.run.call_count, 1)
+        self.assertEqual(first["result"], second["result"])
+        self.assertEqual(engine.verdict_cache.hits, 1)
+
+    def test_verdict_cache_keyed_on_model_version(self):
+        """Changing the model version invalidates cached verdicts."""
+        engine = make_engine(lambda ids: np.tile([0.0, 5.0], (len(ids), 1)))
+
+        engine.predict_batch(["claim"], ["evidence"])
+        engine.model_version = "new-model"
+        engine.predict_batch(["claim"], ["evidence"])
+
+        self.assertEqual(engine.session.run.call_count, 2)
+
+    def test_auto_search_verdict_uses_short_ttl(self):
+        """Auto-searched verdicts are cached with the search TTL."""
+        engine = make_engine(lambda ids: np.tile([0.0, 5.0], (len(ids), 1)))
+        engine.gather_evidence = Mock(return_value=EvidenceResult("web evidence", ("https://example.com",), ()))
+
+        first = engine.verify_claim("claim")
+        second = engine.verify_claim("claim")
+
+        engine.gather_evidence.assert_called_once()
+        self.assertEqual(second["sources"], ["https://example.com"])
+        _, expires_at = engine.verdict_cache._data[engine._verdict_key("claim")]
+        _, explicit_expires_at = engine.verdict_cache._data[engine._verdict_key("claim", "web evidence")]
+        self.assertLess(expires_at, explicit_expires_at)
+
+    def test_partial_search_verdict_is_not_cached(self):
+        """Verdicts on evidence cut short by the deadline report the dropped sources and are not cached."""
+        engine = make_engine(lambda ids: np.tile([0.0, 5.0], (len(ids), 1)))
+        engine.gather_evidence = Mock(return_value=EvidenceResult(
+            "web evidence", ("https://example.com", "https://slow.example.com"), (), ("https://slow.example.com",)
+        ))
+
+        first = engine.verify_claim("claim")
+        engine.verify_claim("claim")
+
+        self.assertEqual(first["timed_out_sources"], ["https://slow.example.com"])
+        self.assertEqual(engine.gather_evidence.call_count, 2)
+
+    def test_search_timeout_is_not_scored_or_cached(self):
+        """A search cut off by the deadline returns the empty result and is retried next time."""
+        engine = make_engine(lambda ids: np.tile([0.0, 5.0], (len(ids), 1)))
+        engine.gather_evidence = Mock(return_value=EvidenceResult("", (), (), (), search_timed_out=True))
+
+        first = engine.verify_claim("claim")
+        engine.verify_claim("claim")
+
+        self.assertEqual(first["result"], "UNCERTAIN")
+        engine.session.run.assert_not_called()
+        self.assertEqual(engine.gather_evidence.call_count, 2)
+        self.assertIsNone(engine.lookup_verdict("claim"))
+
+    def test_verdict_without_sources_is_not_cached(self):
+        """Searched verdicts are only cached when the search found sources."""
+        engine = make_engine(lambda ids: np.tile([0.0, 5.0], (len(ids), 1)))
+
+        engine.searched_prediction("claim", engine.predict_batch(["claim"], ["evidence"])[0], EvidenceResult("evidence", (), ()))
+
+        self.assertIsNone(engine.lookup_verdict("claim"))
+
+    def test_evidence_deadline_respects_client_timeout(self):
+        """A client timeout shortens the search budget, leaving the inference reserve."""
+        engine = make_engine(lambda ids: None)
+
+        now = time.monotonic()
+        self.assertAlmostEqual(engine.evidence_deadline() - now, 1.5, delta=0.05)
+        self.assertAlmostEqual(engine.evidence_deadline(1.0) - now, 0.75, delta=0.05)
+        self.assertAlmostEqual(engine.evidence_deadline(0.1) - now, 0.0, delta=0.05)
+
+    def test_errors_are_not_cached(self):
+        """Failed inference is retried on the next call."""
+        engine = make_engine(lambda ids: None)
+        engine.session.run.side_effect = RuntimeError("boom")
+
+        engine.predict_batch(["a"], ["x"])
+        engine.predict_batch(["a"], ["x"])
+
+        self.assertEqual(engine.session.run.call_count, 2)
+
+    def test_predict_batch_error(self):
+        """Inference failures are reported per item rather than raised."""
+        engine = make_engine(lambda ids: None)
+        engine.session.run.side_effect = RuntimeError("boom")
+
+        results = engine.predict_batch(["a", "b"], ["x", "y"])
+
+        self.assertEqual([r["result"] for r in results], ["ERROR", "ERROR"])
+        self.assertEqual(results[0]["error"], "boom")
+
+
+class TestSlidingWindow(unittest.TestCase):
+    """Unit tests for sliding-window evidence inference."""
+
+    def test_windows_overlap_and_cover_the_evidence(self):
+        """Windows step by window_size - overlap and reach the end of the evidence."""
+        engine = make_engine(lambda ids: None, evidence_mode="window")
+
+        windows = engine._split_windows(list(range(250)), window_size=100)
+
+        self.assertEqual([w[0] for w in windows], [0, 68, 136, 204])
+        self.assertEqual(windows[-1][-1], 249)
+
+    def test_window_count_is_capped(self):
+        engine = make_engine(lambda ids: None, evidence_mode="window")
+        engine.max_windows = 2
+
+        self.assertEqual(len(engine._split_windows(list(range(1000)), window_size=100)), 2)
+
+    def test_all_windows_run_in_one_batch(self):
+        """Every window of every pair goes through a single ONNX call."""
+        engine = make_engine(lambda ids: np.tile([0.0, 5.0], (len(ids), 1)), evidence_mode="window")
+
+        results = engine.predict_batch(["claim one", "claim two"], ["x" * 300, "short"])
+
+        self.assertEqual(engine.session.run.call_count, 1)
+        self.assertEqual(engine.session.run.call_args.args[1]["input_ids"].shape[0], results[0]["windows"] + 1)
+        self.assertGreater(results[0]["windows"], 1)
+        self.assertEqual(results[1]["windows"], 1)
+
+    def test_supporting_window_beyond_truncation_is_seen(self):
+        """Evidence past the first 128 tokens can decide the verdict."""
+        # Only windows containing "!" support the claim
+        bang = ord("!")
+        logits_fn = lambda ids: np.array([[0.0, 5.0] if (row == bang).any() else [5.0, 0.0] for row in ids], dtype=np.float32)
+        evidence = "x" * 200 + "!"
+
+        windowed = make_engine(logits_fn, evidence_mode="window").predict_batch(["claim"], [evidence])[0]
+        truncated = make_engine(logits_fn).predict_batch(["claim"], [evidence])[0]
+
+        self.assertEqual(windowed["result"], "TRUE")
+        self.assertEqual(truncated["result"], "FALSE")
+
+    def test_aggregation_strategies(self):
+        probs = np.array([[0.2, 0.8], [0.9, 0.1], [0.4, 0.6]])
+
+        np.testing.assert_allclose(aggregate_probs(probs, "max_entailment"), [0.2, 0.8])
+        np.testing.assert_allclose(aggregate_probs(probs, "max_contradiction"), [0.9, 0.1])
+        np.testing.assert_allclose(aggregate_probs(probs, "max_confidence"), [0.9, 0.1])
+        np.testing.assert_allclose(aggregate_probs(probs, "mean"), [0.5, 0.5])
+        with self.assertRaises(ValueError):
+            aggregate_probs(probs, "median")
+
+
+class TestPerSourceScoring(unittest.TestCase):
+    """Unit tests for scoring a claim against each source separately."""
+
+    def test_sources_scored_in_one_call_with_attribution(self):
+        """Each source gets its own verdict and the strongest decides the aggregate."""
+        # Passages containing "!" support the claim strongly, others weakly contradict
+        bang = ord("!")
+        engine = make_engine(lambda ids: np.array(
+            [[0.0, 6.0] if (row == bang).any() else [1.0, 0.0] for row in ids], dtype=np.float32
+        ))
+        passages = [
+            {"url": "https://a.com", "text": "it is so!", "snippet": False},
+            {"url": "https://b.com", "text": "it is not", "snippet": True},
+        ]
+
+        result = engine.score_sources("claim", passages)
+
+        self.assertEqual(engine.session.run.call_count, 1)
+        self.assertEqual(result["sources"], ["https://a.com", "https://b.com"])
+        self.assertEqual([v["result"] for v in result["source_verdicts"]], ["TRUE", "UNCERTAIN"])
+        self.assertTrue(result["source_verdicts"][1]["snippet"])
+        self.assertEqual(result["result"], "TRUE")
+
+    def test_no_sources(self):
+        engine = make_engine(lambda ids: None)
+
+        result = engine.score_sources("claim", [])
+
+        self.assertEqual(result["result"], "UNCERTAIN")
+        self.assertEqual(result["source_verdicts"], [])
+
+    def test_timed_out_sources_are_reported(self):
+        """Sources the budget cut off are reported, as for combined evidence."""
+        engine = make_engine(lambda ids: np.tile([0.0, 5.0], (len(ids), 1)))
+        engine.search_engine = Mock()
+        engine.search_engine.collect_passages.return_value = SourcePassages(
+            [{"url": "https://a.com", "text": "it is so", "snippet": False}], ["https://slow.example.com"]
+        )
+
+        result = engine.verify_claim_by_source("claim")
+
+        self.assertEqual(result["sources"], ["https://a.com"])
+        self.assertEqual(result["timed_out_sources"], ["https://slow.example.com"])
+
+
+class TestModelSwap(unittest.TestCase):
+    """Hot-swapping the active model."""
+
+    def test_activate_model_switches_sessions_and_drops_verdicts(self):
+        engine = make_engine(lambda ids: np.tile([0.0, 3.0], (len(ids), 1)))
+        first = engine.predict_batch(["claim"], ["evidence"])[0]
+        self.assertEqual(first["model_version"], "test-model")
+
+        new_session = Mock()
+        new_session.run.side_effect = lambda _, inputs: [np.tile([3.0, 0.0], (len(inputs["input_ids"]), 1))]
+        engine.activate_model(SessionPool([new_session]), "new-model", "new.onnx")
+
+        second = engine.predict_batch(["claim"], ["evidence"])[0]
+        self.assertEqual(second["model_version"], "new-model")
+        self.assertEqual(second["result"], "FALSE")
+        self.assertEqual(new_session.run.call_count, 1)
+
+    def test_stale_model_verdicts_are_not_cached(self):
+        engine = make_engine(lambda ids: None)
+        engine.store_verdict("claim", "evidence", {"result": "TRUE", "model_version": "old-model"})
+
+        self.assertIsNone(engine.lookup_verdict("claim", "evidence"))
+
+
+class TestPrescreenCascade(unittest.TestCase):
+    """The lexical pre-screen decides easy pairs before the model runs."""
+
+    def test_only_ambiguous_pairs_reach_the_model(self):
+        engine = make_engine(lambda ids: np.tile([0.0, 3.0], (len(ids), 1)), prescreen=LexicalPrescreen())
+        claims = ["Paris is the capital of France.", "Bananas are blue.", "The Amazon is the longest river."]
+        evidences = ["Paris is the capital of France.", "Tokyo is large.", "The Nile is longer than the Amazon river."]
+
+        predictions = engine.predict_batch(claims, evidences)
+
+        self.assertEqual(engine.session.run.call_count, 1)
+        self.assertEqual(engine.session.run.call_args[0][1]["input_ids"].shape[0], 1)
+        self.assertEqual([p["stage"] for p in predictions], ["prescreen", "prescreen", "model"])
+        self.assertEqual([p["result"] for p in predictions], ["TRUE", "UNCERTAIN", "TRUE"])
+        self.assertAlmostEqual(engine.prescreen.stats()["escalation_rate"], 1 / 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
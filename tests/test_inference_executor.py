@@ -0,0 +1,75 @@
+import unittest
+import asyncio
+import threading
+import time
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.api.inference_executor import InferenceExecutor
+
+
+class TestInferenceExecutor(unittest.IsolatedAsyncioTestCase):
+    """Unit tests for the dedicated inference executor."""
+
+    async def asyncSetUp(self):
+        self.executor = InferenceExecutor(max_workers=2)
+
+    async def asyncTearDown(self):
+        self.executor.shutdown()
+
+    async def test_runs_off_the_event_loop(self):
+        """Work runs on a pool thread, not the event loop thread."""
+        loop_thread = threading.get_ident()
+        worker_thread = await self.executor.run(threading.get_ident)
+
+        self.assertNotEqual(worker_thread, loop_thread)
+
+    async def test_event_loop_stays_responsive(self):
+        """The loop keeps ticking while a blocking job runs."""
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        task = asyncio.create_task(ticker())
+        await self.executor.run(time.sleep, 0.1)
+        task.cancel()
+
+        self.assertGreater(ticks, 3)
+
+    async def test_concurrency_is_bounded(self):
+        """No more than max_workers jobs run at once."""
+        active = []
+        peak = []
+        lock = threading.Lock()
+
+        def job():
+            with lock:
+                active.append(1)
+                peak.append(len(active))
+            time.sleep(0.02)
+            with lock:
+                active.pop()
+
+        await asyncio.gather(*[self.executor.run(job) for _ in range(6)])
+
+        self.assertEqual(max(peak), 2)
+        self.assertEqual(self.executor.stats()["completed"], 6)
+
+    async def test_exceptions_propagate(self):
+        def fail():
+            raise ValueError("bad input")
+
+        with self.assertRaises(ValueError):
+            await self.executor.run(fail)
+        self.assertEqual(self.executor.stats()["running"], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,186 @@
+import unittest
+from unittest.mock import patch
+import tempfile
+import numpy as np
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.local_index import LocalIndex, Segment, split_passages, fuse_rankings
+from src.search_backends import LocalIndexBackend, get_search_backends
+from src.search_engine import SearchEngine
+
+DOCUMENTS = [
+    {"url": "https://en.wikipedia.org/wiki/Paris", "title": "Paris", "text": "Paris is the capital and largest city of France."},
+    {"url": "https://en.wikipedia.org/wiki/Berlin", "title": "Berlin", "text": "Berlin is the capital of Germany."},
+    {"url": "https://en.wikipedia.org/wiki/Moon", "title": "Moon", "text": "The Moon is not made of cheese. It is rocky."},
+    {"url": "https://en.wikipedia.org/wiki/Everest", "title": "Everest", "text": "Mount Everest is the highest mountain above sea level."},
+]
+
+def fake_embed(texts):
+    """One dimension per keyword, so similarity is predictable."""
+    keywords = ["paris", "berlin", "moon", "everest"]
+    vectors = np.array([[float(k in t.lower()) for k in keywords] for t in texts], dtype=np.float32) + 1e-3
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+class TestLocalIndex(unittest.TestCase):
+    """Unit tests for the on-disk BM25 index."""
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = os.path.join(tmp.name, "index")
+        self.index = LocalIndex(self.path)
+
+    def test_search_ranks_matching_document_first(self):
+        self.index.add(DOCUMENTS)
+
+        results = self.index.search("What is the capital of France?", max_results=2)
+
+        self.assertEqual(results[0]["title"], "Paris")
+        self.assertEqual(results[1]["title"], "Berlin")
+        self.assertGreater(results[0]["score"], results[1]["score"])
+
+    def test_no_match_returns_nothing(self):
+        self.index.add(DOCUMENTS)
+
+        self.assertEqual(self.index.search("quantum chromodynamics"), [])
+        self.assertEqual(LocalIndex(os.path.join(self.path, "missing")).search("Paris"), [])
+
+    def test_segments_are_memory_mapped(self):
+        self.index.add(DOCUMENTS)
+
+        segment = self.index.segments[0]
+        self.assertIsInstance(segment.doc_ids, np.memmap)
+        self.assertIsInstance(segment.docs.blob, np.memmap)
+
+    def test_incremental_add_is_seen_by_other_readers(self):
+        """Each add() writes a segment; open indexes pick it up on refresh()."""
+        self.index.add(DOCUMENTS[:2])
+        reader = LocalIndex(self.path)
+        self.assertEqual(reader.search("highest mountain"), [])
+
+        self.index.add(DOCUMENTS[2:])
+
+        self.assertTrue(reader.refresh())
+        self.assertFalse(reader.refresh())
+        self.assertEqual(len(reader.segments), 2)
+        self.assertEqual(reader.search("highest mountain")[0]["title"], "Everest")
+        # Statistics span segments: "capital" occurs in both documents of the first one
+        self.assertEqual(reader.search("capital France")[0]["title"], "Paris")
+
+    def test_compact_keeps_results(self):
+        for doc in DOCUMENTS:
+            self.index.add([doc], embed=fake_embed, embedding_model="fake")
+        before = self.index.search("capital of Germany")
+
+        self.index.compact()
+
+        self.assertEqual(len(self.index.segments), 1)
+        self.assertEqual(len(self.index), len(DOCUMENTS))
+        self.assertEqual(self.index.search("capital of Germany"), before)
+        self.assertTrue(self.index.has_embeddings)
+        self.assertEqual(sorted(os.listdir(self.path)), ["manifest.json", self.index.segments[0].name])
+
+    def test_passages_of_one_url_are_deduplicated(self):
+        self.index.add([
+            {"url": "https://example.com/a", "text": "cheese moon rock"},
+            {"url": "https://example.com/a", "text": "moon cheese crater"},
+            {"url": "https://example.com/b", "text": "moon landing"},
+        ])
+
+        results = self.index.search("moon cheese", max_results=3)
+
+        self.assertEqual([r["url"] for r in results], ["https://example.com/a", "https://example.com/b"])
+
+    def test_documents_without_url_get_a_local_one(self):
+        self.index.add([{"text": "Berlin is in Germany"}])
+
+        self.assertTrue(self.index.search("Berlin")[0]["url"].startswith("local://"))
+
+    def test_embedding_search(self):
+        self.index.add(DOCUMENTS, embed=fake_embed, embedding_model="fake")
+
+        results = self.index.search_embeddings(fake_embed(["tell me about the moon"])[0], max_results=1)
+
+        self.assertEqual(self.index.embedding_model, "fake")
+        self.assertEqual(results[0]["title"], "Moon")
+
+    def test_documents_without_tokens_keep_embeddings_aligned(self):
+        """Documents with no indexable words are dropped together with their embedding."""
+        documents = [{"text": "Москва столица России"}, {"text": "It is the."}] + DOCUMENTS[:2]
+        self.index.add(documents, embed=fake_embed, embedding_model="fake")
+
+        segment = self.index.segments[0]
+        self.assertEqual(segment.num_docs, 2)
+        self.assertEqual(segment.embeddings.shape, (2, 4))
+        self.assertEqual(self.index.search_embeddings(fake_embed(["berlin"])[0], max_results=1)[0]["title"], "Berlin")
+
+    def test_segment_write_drops_embedding_rows_of_skipped_documents(self):
+        documents = [DOCUMENTS[0], {"text": "Москва столица России"}, DOCUMENTS[1]]
+        path = os.path.join(self.path, "segment")
+
+        self.assertEqual(Segment.write(path, documents, fake_embed([doc["text"] for doc in documents])), 2)
+
+        segment = Segment(path)
+        self.assertEqual([segment.document(i)["title"] for i in range(segment.num_docs)], ["Paris", "Berlin"])
+        np.testing.assert_allclose(segment.embeddings, fake_embed([DOCUMENTS[0]["text"], DOCUMENTS[1]["text"]]))
+
+    def test_split_passages(self):
+        text = "one two three\nfour five\n\n" + " ".join(["w"] * 7)
+
+        self.assertEqual(split_passages(text, max_words=5), ["one two three four five", "w w w w w", "w w"])
+
+    def test_fuse_rankings(self):
+        a = [{"url": "1"}, {"url": "2"}]
+        b = [{"url": "2"}, {"url": "3"}]
+
+        self.assertEqual([doc["url"] for doc in fuse_rankings([a, b], 2)], ["2", "1"])
+
+
+class TestLocalIndexBackend(unittest.TestCase):
+    """SearchEngine on the local backend answers without any network access."""
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        patcher = patch('src.search_engine.get_search_cache', return_value=None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        LocalIndex(tmp.name).add(DOCUMENTS)
+        self.backend = LocalIndexBackend(tmp.name, use_embeddings=False)
+
+    def test_get_evidence_uses_index_text(self):
+        engine = SearchEngine(backends=[self.backend])
+
+        with patch.object(engine, 'scrape_many', return_value=[]) as scrape:
+            result = engine.get_evidence("Paris is the capital of France")
+
+        scrape.assert_called_once_with([], on_scraped=None, timeout=None)
+        self.assertEqual(result.sources[0], "https://en.wikipedia.org/wiki/Paris")
+        self.assertIn("largest city of France", result.evidence)
+        self.assertFalse(result.passages[0]["snippet"])
+
+    def test_falls_back_to_next_backend(self):
+        class Web:
+            name = "web"
+            cacheable = False
+
+            def search(self, query, max_results=3, timeout=None):
+                return [{"href": "https://example.com", "body": "web result"}]
+
+        engine = SearchEngine(backends=[self.backend, Web()])
+
+        self.assertEqual(engine.search("Paris")[0]["href"], "https://en.wikipedia.org/wiki/Paris")
+        self.assertEqual(engine.search("quantum chromodynamics")[0]["href"], "https://example.com")
+
+    def test_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            get_search_backends("local,bing")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+import unittest
+from unittest.mock import Mock
+import threading
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.model_registry import ModelRegistry, ModelVersion
+from src.session_pool import SessionPool
+
+
+class FakeEngine:
+    """Scores every pair with the label its session pool's `label` says."""
+
+    def __init__(self):
+        self.model_path = "models/a.onnx"
+        self.session_pool = self.make_pool("TRUE")
+        self.model_version = "a"
+
+    @staticmethod
+    def make_pool(label):
+        pool = SessionPool([Mock()])
+        pool.label = label
+        return pool
+
+    def activate_model(self, session_pool, model_version, model_path):
+        self.session_pool, self.model_version, self.model_path = session_pool, model_version, model_path
+
+    def _run_model(self, claims, evidences, session_pool):
+        return [{"claim": c, "result": session_pool.label} for c in claims]
+
+
+class TestModelRegistry(unittest.TestCase):
+    """Unit tests for candidate models, hot-swap and shadow inference."""
+
+    def setUp(self):
+        self.engine = FakeEngine()
+        self.registry = ModelRegistry(self.engine, shadow_rate=1.0)
+        self.candidate = ModelVersion("models/b.onnx", FakeEngine.make_pool("FALSE"), "b")
+
+    def tearDown(self):
+        self.registry.shutdown()
+
+    def wait_for_shadow(self):
+        self.registry._shadow_pool.submit(lambda: None).result(timeout=5)
+
+    def test_promote_and_rollback(self):
+        self.registry.candidate = self.candidate
+
+        self.registry.promote()
+        self.assertEqual(self.engine.model_version, "b")
+        self.assertIsNone(self.registry.candidate)
+
+        self.registry.rollback()
+        self.assertEqual(self.engine.model_version, "a")
+        self.assertEqual(self.registry.stats()["previous"]["version"], "b")
+
+    def test_promote_without_candidate_fails(self):
+        with self.assertRaises(ValueError):
+            self.registry.promote()
+
+    def test_shadow_records_agreement_and_latency(self):
+        self.registry.candidate = self.candidate
+        predictions = [{"claim": "c1", "result": "TRUE"}, {"claim": "c2", "result": "FALSE"}]
+
+        self.registry.maybe_shadow(["c1", "c2"], ["e1", "e2"], predictions, 0.01)
+        self.wait_for_shadow()
+
+        shadow = self.registry.stats()["shadow"]
+        self.assertEqual(shadow["batches"], 1)
+        self.assertEqual(shadow["pairs"], 2)
+        self.assertAlmostEqual(shadow["agreement_rate"], 0.5)
+        self.assertIsNotNone(shadow["latency_delta_ms"])
+        # The active model is untouched
+        self.assertEqual(self.engine.model_version, "a")
+
+    def test_shadow_skips_while_busy(self):
+        release = threading.Event()
+        self.engine._run_model = lambda claims, evidences, pool: release.wait(5) and [{"result": "TRUE"} for _ in claims]
+        self.registry.candidate = self.candidate
+
+        self.registry.maybe_shadow(["c1"], ["e1"], [{"result": "TRUE"}], 0.01)
+        self.registry.maybe_shadow(["c2"], ["e2"], [{"result": "TRUE"}], 0.01)
+        release.set()
+        self.wait_for_shadow()
+
+        shadow = self.registry.stats()["shadow"]
+        self.assertEqual(shadow["skipped"], 1)
+        self.assertEqual(shadow["batches"], 1)
+
+    def test_no_shadow_without_candidate_or_at_zero_rate(self):
+        self.registry.maybe_shadow(["c1"], ["e1"], [{"result": "TRUE"}], 0.01)
+        self.registry.candidate = self.candidate
+        self.registry.set_shadow_rate(0.0)
+        self.registry.maybe_shadow(["c1"], ["e1"], [{"result": "TRUE"}], 0.01)
+        self.wait_for_shadow()
+
+        self.assertEqual(self.registry.stats()["shadow"]["batches"], 0)
+        with self.assertRaises(ValueError):
+            self.registry.set_shadow_rate(1.5)
+
+
+if __name__ == '__main__':
+    unittest.main()
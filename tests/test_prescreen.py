@@ -0,0 +1,114 @@
+import unittest
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.prescreen import LexicalPrescreen, content_tokens
+
+
+class TestLexicalPrescreen(unittest.TestCase):
+    """Unit tests for the lexical pre-screen stage."""
+
+    def setUp(self):
+        self.prescreen = LexicalPrescreen(match_confidence=0.95, min_overlap=0.1, min_match_tokens=3)
+
+    def test_content_tokens_normalize_negations(self):
+        self.assertEqual(content_tokens("Paris isn't the capital of Spain."), ["paris", "not", "capital", "spain"])
+
+    def test_verbatim_match_is_true(self):
+        result = self.prescreen.screen(
+            "Paris is the capital of France.",
+            "[Source: https://example.com] Paris is the capital of France and its largest city."
+        )
+        self.assertEqual(result, ("TRUE", 0.95))
+
+    def test_negated_claim_against_plain_match_is_false(self):
+        result = self.prescreen.screen(
+            "Paris is not the capital of France.",
+            "Paris is the capital of France. It has about two million inhabitants."
+        )
+        self.assertEqual(result, ("FALSE", 0.95))
+
+    def test_negated_match_escalates(self):
+        for evidence in [
+            "Contrary to popular belief, Sydney is not the capital of Australia.",
+            "Sydney is not the capital of Australia; Canberra is."
+        ]:
+            self.assertIsNone(self.prescreen.screen("Sydney is the capital of Australia.", evidence))
+
+    def test_rejecting_evidence_escalates(self):
+        cases = [
+            ("Vaccines cause autism", "There is no evidence that vaccines cause autism."),
+            ("The moon is made of cheese", "Claims that the moon is made of cheese are false."),
+            ("Humans only use 10 percent of their brain",
+             "The myth that humans only use 10 percent of their brain has been debunked."),
+            ("Rio de Janeiro is the capital of Brazil", "Rio de Janeiro was the capital of Brazil until 1960."),
+        ]
+        for claim, evidence in cases:
+            with self.subTest(claim=claim):
+                self.assertIsNone(self.prescreen.screen(claim, evidence))
+
+    def test_tense_must_match(self):
+        result = self.prescreen.screen(
+            "Rio de Janeiro is the capital of Brazil",
+            "Rio de Janeiro was the capital of Brazil. Today it is a tourist destination."
+        )
+        self.assertIsNone(result)
+
+    def test_hedged_match_escalates(self):
+        result = self.prescreen.screen(
+            "Coffee stunts growth in children.",
+            "Some researchers believe coffee stunts growth in children."
+        )
+        self.assertIsNone(result)
+
+    def test_debunk_term_elsewhere_in_evidence_escalates(self):
+        result = self.prescreen.screen(
+            "Vaccines cause autism.",
+            "Vaccines cause autism. That statement is a myth spread online."
+        )
+        self.assertIsNone(result)
+
+    def test_match_must_be_within_one_sentence(self):
+        result = self.prescreen.screen(
+            "Paris is the capital of France.",
+            "Lyon is not in Paris. Is the capital of France large? Yes."
+        )
+        self.assertIsNone(result)
+
+    def test_no_overlap_is_uncertain(self):
+        result = self.prescreen.screen(
+            "The Great Wall of China is visible from space.",
+            "Bananas are rich in potassium."
+        )
+        self.assertEqual(result, ("UNCERTAIN", 0.0))
+
+    def test_partial_overlap_escalates(self):
+        result = self.prescreen.screen(
+            "The Amazon is the longest river in the world.",
+            "The Nile is usually considered the longest river, though some measurements favour the Amazon."
+        )
+        self.assertIsNone(result)
+
+    def test_conflicting_matches_escalate(self):
+        result = self.prescreen.screen(
+            "Coffee stunts growth in children.",
+            "Some say coffee stunts growth in children. Studies show coffee never stunts growth in children."
+        )
+        self.assertIsNone(result)
+
+    def test_stats_track_escalation_rate(self):
+        self.prescreen.screen("Paris is the capital of France.", "Paris is the capital of France.")
+        self.prescreen.screen("The Amazon is the longest river.", "The Amazon river is long.")
+
+        stats = self.prescreen.stats()
+        self.assertEqual(stats["screened"], 2)
+        self.assertEqual(stats["escalated"], 1)
+        self.assertEqual(stats["decided"]["TRUE"], 1)
+        self.assertAlmostEqual(stats["escalation_rate"], 0.5)
+
+
+if __name__ == '__main__':
+    unittest.main()
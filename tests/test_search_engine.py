@@ -1,12 +1,21 @@
 import unittest
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import Mock, patch, MagicMock, AsyncMock
+import asyncio
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
 import sys
 import os
 
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from src.search_engine import SearchEngine
+from src.search_engine import SearchEngine, EvidenceResult
+from src.utils.cache import SQLiteCache
+from src.http_client import FetchResponse
+from src.content_store import ContentStore
+from src.circuit_breaker import ScrapeCircuitBreaker
+from src.extraction import ExtractPool
 
 
 class TestSearchEngine(unittest.TestCase):
@@ -14,9 +23,30 @@ class TestSearchEngine(unittest.TestCase):
     
     def setUp(self):
         """Set up test fixtures before each test method."""
+        # Keep the on-disk search cache out of unit tests
+        patcher = patch('src.search_engine.get_search_cache', return_value=None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
         self.engine = SearchEngine()
+        # Extract in-process so tests can mock trafilatura
+        self.engine.content_store = ContentStore(extract_pool=ExtractPool(workers=0))
+        self.engine.breaker = ScrapeCircuitBreaker()
+
+    def patch_fetch(self, fetch):
+        """
+        Serves pages from fetch(url, timeout) (html or None) instead of the
+        network, for this test only.
+        """
+        async def fetch_response(url, timeout=None, headers=None):
+            html = await fetch(url, timeout=timeout)
+            return FetchResponse(200, html.encode(), {}) if html is not None else None
+
+        patcher = patch.object(self.engine.http, 'fetch_response', fetch_response)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        return fetch
     
-    @patch('src.search_engine.DDGS')
+    @patch('src.search_backends.DDGS')
     def test_search_success(self, mock_ddgs_class):
         """Test successful search returns results."""
         # Mock DDGS instance and its text method
@@ -37,7 +67,56 @@ class TestSearchEngine(unittest.TestCase):
         self.assertEqual(results[0]['href'], 'https://example.com/1')
         mock_ddgs_instance.text.assert_called_once_with("test query", max_results=2)
     
-    @patch('src.search_engine.DDGS')
+    @patch('src.search_backends.DDGS')
+    def test_search_uses_cache(self, mock_ddgs_class):
+        """Repeated queries (after normalization) are served from the cache."""
+        mock_ddgs_class.return_value.text.return_value = [{'href': 'https://example.com/1', 'body': 'Result 1'}]
+
+        with tempfile.TemporaryDirectory() as tmp:
+            engine = SearchEngine()
+            engine.search_cache = SQLiteCache(os.path.join(tmp, "search.sqlite"))
+
+            first = engine.search("Test  Query", max_results=2)
+            second = engine.search("test query", max_results=2)
+            engine.search("test query", max_results=3)
+
+        self.assertEqual(first, second)
+        self.assertEqual(mock_ddgs_class.return_value.text.call_count, 2)
+
+    @patch('src.search_backends.DDGS')
+    def test_search_is_bounded_by_timeout(self, mock_ddgs_class):
+        """A slow search gives up at the caller's budget with TimeoutError."""
+        mock_ddgs_class.return_value.text.side_effect = lambda query, max_results: time.sleep(0.5) or [{'href': 'https://example.com/1'}]
+
+        engine = SearchEngine()
+        start = time.perf_counter()
+        with self.assertRaises(TimeoutError):
+            engine.search("test query", timeout=0.05)
+        elapsed = time.perf_counter() - start
+
+        self.assertLess(elapsed, 0.3)
+        # Each DDG request also gets the budget as its own timeout
+        self.assertAlmostEqual(mock_ddgs_class.return_value.timeout, 0.05, delta=0.01)
+        self.assertEqual(engine.backends[0].stats()["timeouts"], 1)
+
+    @patch.object(SearchEngine, 'scrape_many', return_value=[])
+    @patch.object(SearchEngine, 'search', return_value=[])
+    def test_get_evidence_search_gets_budget(self, mock_search, mock_scrape):
+        self.engine.get_evidence("claim", budget=1.0)
+
+        mock_search.assert_called_once_with("claim", max_results=3, timeout=1.0)
+
+    @patch.object(SearchEngine, 'scrape_many')
+    @patch.object(SearchEngine, 'search', side_effect=TimeoutError("out of time"))
+    def test_get_evidence_search_timeout(self, mock_search, mock_scrape):
+        """A search cut off by the budget yields no evidence and is flagged, not treated as no results."""
+        result = self.engine.get_evidence("claim", budget=0.01)
+
+        self.assertEqual(result.evidence, "")
+        self.assertTrue(result.search_timed_out)
+        mock_scrape.assert_not_called()
+
+    @patch('src.search_backends.DDGS')
     def test_search_failure(self, mock_ddgs_class):
         """Test search handles exceptions gracefully."""
         mock_ddgs_instance = Mock()
@@ -49,47 +128,141 @@ class TestSearchEngine(unittest.TestCase):
         
         self.assertEqual(results, [])
     
-    @patch('src.search_engine.trafilatura')
+    @patch('src.extraction.trafilatura')
     def test_scrape_success(self, mock_trafilatura):
         """Test successful URL scraping."""
-        mock_trafilatura.fetch_url.return_value = "<html>content</html>"
         mock_trafilatura.extract.return_value = "Extracted text content"
+        fetch = self.patch_fetch(AsyncMock(return_value="<html>content</html>"))
         
         result = self.engine.scrape("https://example.com")
         
         self.assertEqual(result, "Extracted text content")
-        mock_trafilatura.fetch_url.assert_called_once_with("https://example.com")
-        mock_trafilatura.extract.assert_called_once_with("<html>content</html>")
+        fetch.assert_called_once_with("https://example.com", timeout=self.engine.fetch_timeout)
+        mock_trafilatura.extract.assert_called_once_with(b"<html>content</html>")
     
-    @patch('src.search_engine.trafilatura')
+    @patch('src.extraction.trafilatura')
     def test_scrape_no_content(self, mock_trafilatura):
         """Test scraping when no content is fetched."""
-        mock_trafilatura.fetch_url.return_value = None
+        self.patch_fetch(AsyncMock(return_value=None))
         
         result = self.engine.scrape("https://example.com")
         
         self.assertEqual(result, "")
+        mock_trafilatura.extract.assert_not_called()
     
-    @patch('src.search_engine.trafilatura')
+    @patch('src.extraction.trafilatura')
     def test_scrape_extraction_fails(self, mock_trafilatura):
         """Test scraping when extraction returns None."""
-        mock_trafilatura.fetch_url.return_value = "<html>content</html>"
+        self.patch_fetch(AsyncMock(return_value="<html>content</html>"))
         mock_trafilatura.extract.return_value = None
         
         result = self.engine.scrape("https://example.com")
         
         self.assertEqual(result, "")
     
-    @patch('src.search_engine.trafilatura')
+    @patch('src.extraction.trafilatura')
     def test_scrape_exception(self, mock_trafilatura):
-        """Test scraping handles exceptions gracefully."""
-        mock_trafilatura.fetch_url.side_effect = Exception("Connection timeout")
-        
+        """Test scraping handles extraction exceptions gracefully."""
+        self.patch_fetch(AsyncMock(return_value="<html>content</html>"))
+        mock_trafilatura.extract.side_effect = Exception("Malformed HTML")
+
         result = self.engine.scrape("https://example.com")
-        
+
         self.assertEqual(result, "")
+
+    @patch('src.extraction.trafilatura')
+    def test_failing_domain_is_short_circuited(self, mock_trafilatura):
+        """After threshold failures a domain is skipped until its cooldown ends."""
+        fetch = self.patch_fetch(AsyncMock(return_value=None))
+
+        for i in range(5):
+            self.assertEqual(self.engine.scrape(f"https://www.blocked.com/{i}"), "")
+        # A failed URL is not retried, even on a healthy domain
+        self.assertEqual(self.engine.scrape("https://example.com/gone"), "")
+        self.assertEqual(self.engine.scrape("https://example.com/gone"), "")
+
+        self.assertEqual(fetch.call_count, self.engine.breaker.threshold + 1)
+        self.assertEqual(self.engine.breaker.domains()["blocked.com"]["state"], "open")
+
+    @patch('src.extraction.trafilatura')
+    def test_budget_cancellation_is_not_a_domain_failure(self, mock_trafilatura):
+        """Running out of the caller's budget says nothing about the site."""
+        async def fetch(url, timeout=None):
+            await asyncio.sleep(5)
+
+        self.patch_fetch(fetch)
+
+        for _ in range(self.engine.breaker.threshold + 1):
+            self.assertEqual(self.engine.scrape_many(["https://slow.com/a"], timeout=0.05), [None])
+
+        self.assertEqual(self.engine.breaker.domains(), {})
+        self.assertTrue(self.engine.breaker.allow("https://slow.com/a"))
+
+    @patch('src.extraction.trafilatura')
+    def test_fetch_timeout_is_a_domain_failure(self, mock_trafilatura):
+        """A download that overruns SCRAPE_TIMEOUT (fetch gives None) does count."""
+        self.patch_fetch(AsyncMock(return_value=None))
+
+        self.engine.scrape_many(["https://slow.com/a"], timeout=1)
+
+        self.assertEqual(self.engine.breaker.domains()["slow.com"]["failures"], 1)
+
+    @patch('src.extraction.trafilatura')
+    def test_scrape_many_is_concurrent_and_ordered(self, mock_trafilatura):
+        """All URLs download at once and results keep URL order."""
+        delays = {"https://example.com/1": 0.3, "https://example.com/2": 0.2, "https://example.com/3": 0.1}
+
+        async def fetch(url, timeout=None):
+            await asyncio.sleep(delays[url])
+            return f"<html>{url}</html>"
+
+        self.patch_fetch(fetch)
+        mock_trafilatura.extract.side_effect = lambda html: html[6:-7].decode()
+        completed = []
+
+        start = time.perf_counter()
+        texts = self.engine.scrape_many(list(delays), on_scraped=lambda url, text: completed.append(url))
+        elapsed = time.perf_counter() - start
+
+        self.assertEqual(texts, list(delays))
+        self.assertLess(elapsed, 0.5)
+        # Reported as they finish, fastest first
+        self.assertEqual(completed, list(reversed(list(delays))))
+
+    @patch('src.extraction.trafilatura')
+    @patch.object(SearchEngine, 'search')
+    def test_get_evidence_budget_drops_slow_sources(self, mock_search, mock_trafilatura):
+        """Sources still downloading when the budget runs out are cancelled and fall back to their snippet."""
+        mock_search.return_value = [
+            {'href': 'https://example.com/fast', 'body': 'Fast snippet'},
+            {'href': 'https://example.com/hang', 'body': 'Hang snippet'},
+        ]
+        cancelled = []
+
+        async def fetch(url, timeout=None):
+            if url.endswith("hang"):
+                try:
+                    await asyncio.sleep(5)
+                except asyncio.CancelledError:
+                    cancelled.append(url)
+                    raise
+            return f"<html>{url}</html>"
+
+        self.patch_fetch(fetch)
+        mock_trafilatura.extract.side_effect = lambda html: f"Scraped {html[6:-7].decode()}"
+
+        start = time.perf_counter()
+        result = self.engine.get_evidence("test claim", budget=0.2)
+        elapsed = time.perf_counter() - start
+
+        self.assertLess(elapsed, 1.0)
+        self.assertEqual(result.timed_out, ('https://example.com/hang',))
+        self.assertEqual(cancelled, ['https://example.com/hang'])
+        self.assertIn("Scraped https://example.com/fast", result.evidence)
+        self.assertIn("(Snippet) Hang snippet", result.evidence)
+        self.assertEqual(result.sources, ('https://example.com/fast', 'https://example.com/hang'))
     
-    @patch.object(SearchEngine, 'scrape')
+    @patch.object(SearchEngine, 'scrape_many')
     @patch.object(SearchEngine, 'search')
     def test_get_evidence_with_scraped_content(self, mock_search, mock_scrape):
         """Test get_evidence with successful scraping."""
@@ -97,28 +270,29 @@ class TestSearchEngine(unittest.TestCase):
             {'href': 'https://example.com/1', 'body': 'Snippet 1'},
             {'href': 'https://example.com/2', 'body': 'Snippet 2'},
         ]
-        mock_scrape.side_effect = [
+        mock_scrape.return_value = [
             "This is scraped content from the first URL. " * 20,  # Long content
             "This is scraped content from the second URL. " * 20,
         ]
         
-        evidence = self.engine.get_evidence("test claim")
+        result = self.engine.get_evidence("test claim")
+        evidence = result.evidence
         
         self.assertIn("[Source: https://example.com/1]", evidence)
         self.assertIn("[Source: https://example.com/2]", evidence)
         self.assertIn("This is scraped content from the first URL", evidence)
-        self.assertEqual(len(self.engine.last_sources), 2)
+        self.assertEqual(len(result.sources), 2)
     
-    @patch.object(SearchEngine, 'scrape')
+    @patch.object(SearchEngine, 'scrape_many')
     @patch.object(SearchEngine, 'search')
     def test_get_evidence_fallback_to_snippet(self, mock_search, mock_scrape):
         """Test get_evidence falls back to snippet when scraping fails."""
         mock_search.return_value = [
             {'href': 'https://example.com/1', 'body': 'This is a snippet'},
         ]
-        mock_scrape.return_value = ""  # Scraping fails
+        mock_scrape.return_value = [""]  # Scraping fails
         
-        evidence = self.engine.get_evidence("test claim")
+        evidence = self.engine.get_evidence("test claim").evidence
         
         self.assertIn("(Snippet) This is a snippet", evidence)
         self.assertIn("[Source: https://example.com/1]", evidence)
@@ -128,11 +302,13 @@ class TestSearchEngine(unittest.TestCase):
         """Test get_evidence when search returns no results."""
         mock_search.return_value = []
         
-        evidence = self.engine.get_evidence("test claim")
+        result = self.engine.get_evidence("test claim")
         
-        self.assertEqual(evidence, "No evidence found on the web.")
+        self.assertEqual(result.evidence, "")
+        self.assertEqual(result.sources, ())
+        self.assertFalse(result.search_timed_out)
     
-    @patch.object(SearchEngine, 'scrape')
+    @patch.object(SearchEngine, 'scrape_many')
     @patch.object(SearchEngine, 'search')
     def test_get_evidence_truncation(self, mock_search, mock_scrape):
         """Test get_evidence truncates long content."""
@@ -141,14 +317,14 @@ class TestSearchEngine(unittest.TestCase):
         ]
         # Create very long content
         long_content = "A" * 2000
-        mock_scrape.return_value = long_content
+        mock_scrape.return_value = [long_content]
         
-        evidence = self.engine.get_evidence("test claim", max_context_length=500)
+        evidence = self.engine.get_evidence("test claim", max_context_length=500).evidence
         
         self.assertLessEqual(len(evidence), 520)  # 500 + "... (truncated)"
         self.assertIn("(truncated)", evidence)
     
-    @patch.object(SearchEngine, 'scrape')
+    @patch.object(SearchEngine, 'scrape_many')
     @patch.object(SearchEngine, 'search')
     def test_get_evidence_tracks_sources(self, mock_search, mock_scrape):
         """Test that get_evidence properly tracks sources."""
@@ -157,14 +333,71 @@ class TestSearchEngine(unittest.TestCase):
             {'href': 'https://example.com/2', 'body': 'Snippet 2'},
             {'href': 'https://example.com/3', 'body': 'Snippet 3'},
         ]
-        mock_scrape.return_value = "Content"
+        mock_scrape.return_value = ["Content"] * 3
+        
+        result = self.engine.get_evidence("test claim")
+        
+        self.assertEqual(len(result.sources), 3)
+        self.assertEqual(result.sources[0], 'https://example.com/1')
+        self.assertEqual(result.sources[1], 'https://example.com/2')
+        self.assertEqual(result.sources[2], 'https://example.com/3')
+        self.assertEqual([passage["url"] for passage in result.passages], list(result.sources))
+
+    def test_get_evidence_concurrent_callers(self):
+        """Concurrent calls on one engine each get their own sources back."""
+        def search(query, max_results=3, timeout=None):
+            time.sleep(0.01)
+            return [{'href': f'https://example.com/{query}/{i}', 'body': query} for i in range(max_results)]
+
+        with patch.object(self.engine, 'search', side_effect=search), \
+             patch.object(self.engine, 'scrape_many', side_effect=lambda urls, on_scraped=None, timeout=None: ["Content"] * len(urls)):
+            with ThreadPoolExecutor(max_workers=8) as pool:
+                claims = [f"claim{i}" for i in range(16)]
+                results = list(pool.map(self.engine.get_evidence, claims))
+
+        for claim, result in zip(claims, results):
+            self.assertIsInstance(result, EvidenceResult)
+            self.assertTrue(all(url.startswith(f'https://example.com/{claim}/') for url in result.sources))
+            self.assertIn(claim, result.evidence)
+
+    @patch.object(SearchEngine, 'scrape_many')
+    @patch.object(SearchEngine, 'search')
+    def test_get_source_passages(self, mock_search, mock_scrape):
+        """Test get_source_passages returns one passage per source, in order."""
+        mock_search.return_value = [
+            {'href': 'https://example.com/1', 'body': 'Snippet 1'},
+            {'href': 'https://example.com/2', 'body': 'Snippet 2'},
+        ]
+        mock_scrape.return_value = ["Scraped\ncontent " * 100, ""]
         
-        self.engine.get_evidence("test claim")
+        passages = self.engine.get_source_passages("test claim")
         
-        self.assertEqual(len(self.engine.last_sources), 3)
-        self.assertEqual(self.engine.last_sources[0], 'https://example.com/1')
-        self.assertEqual(self.engine.last_sources[1], 'https://example.com/2')
-        self.assertEqual(self.engine.last_sources[2], 'https://example.com/3')
+        self.assertEqual([p['url'] for p in passages], ['https://example.com/1', 'https://example.com/2'])
+        self.assertEqual(len(passages[0]['text']), 500)
+        self.assertNotIn('\n', passages[0]['text'])
+        self.assertFalse(passages[0]['snippet'])
+        self.assertEqual(passages[1]['text'], 'Snippet 2')
+        self.assertTrue(passages[1]['snippet'])
+
+    @patch.object(SearchEngine, 'scrape_many')
+    @patch.object(SearchEngine, 'search')
+    def test_get_source_passages_reports_progress(self, mock_search, mock_scrape):
+        """on_progress receives the search results, then one event per source."""
+        mock_search.return_value = [
+            {'href': 'https://example.com/1', 'body': 'Snippet 1'},
+            {'href': 'https://example.com/2', 'body': ''},
+        ]
+        mock_scrape.side_effect = lambda urls, on_scraped=None, timeout=None: [
+            on_scraped(url, text) or text for url, text in zip(urls, ["Scraped content", ""])
+        ]
+        events = []
+
+        self.engine.get_source_passages("test claim", on_progress=lambda event, data: events.append((event, data)))
+
+        self.assertEqual(events[0], ("sources", {"urls": ['https://example.com/1', 'https://example.com/2']}))
+        self.assertEqual([data["url"] for event, data in events[1:]], ['https://example.com/1', 'https://example.com/2'])
+        self.assertTrue(events[1][1]["ok"])
+        self.assertFalse(events[2][1]["ok"])
 
 
 if __name__ == '__main__':
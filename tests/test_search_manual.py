@@ -14,7 +14,7 @@ def test_search():
     print("Testing Search Engine...")
     engine = SearchEngine()
     claim = "The capital of France is Paris"
-    evidence = engine.get_evidence(claim)
+    evidence = engine.get_evidence(claim).evidence
     print(f"Claim: {claim}")
     print(f"Evidence Found: {len(evidence)} chars")
     print(f"Snippet: {evidence[:100]}...")
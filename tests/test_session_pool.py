@@ -0,0 +1,92 @@
+import unittest
+from unittest.mock import Mock, patch
+import threading
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import onnxruntime as ort
+from src.session_pool import SessionPool, build_session_options
+
+
+class TestSessionOptions(unittest.TestCase):
+    """Unit tests for SessionOptions configuration."""
+
+    def test_explicit_arguments(self):
+        """Arguments are applied to the SessionOptions."""
+        options = build_session_options(
+            intra_op_threads=4,
+            inter_op_threads=2,
+            graph_optimization="extended",
+            execution_mode="parallel",
+            enable_mem_arena=False
+        )
+
+        self.assertEqual(options.intra_op_num_threads, 4)
+        self.assertEqual(options.inter_op_num_threads, 2)
+        self.assertEqual(options.graph_optimization_level, ort.GraphOptimizationLevel.ORT_ENABLE_EXTENDED)
+        self.assertEqual(options.execution_mode, ort.ExecutionMode.ORT_PARALLEL)
+        self.assertFalse(options.enable_cpu_mem_arena)
+
+    @patch.dict(os.environ, {"ORT_INTRA_OP_THREADS": "8", "ORT_GRAPH_OPTIMIZATION": "basic"})
+    def test_environment_defaults(self):
+        """Unset arguments are read from ORT_* environment variables."""
+        options = build_session_options()
+
+        self.assertEqual(options.intra_op_num_threads, 8)
+        self.assertEqual(options.graph_optimization_level, ort.GraphOptimizationLevel.ORT_ENABLE_BASIC)
+
+    @patch.dict(os.environ, {}, clear=True)
+    @patch('src.session_pool.os.cpu_count', return_value=8)
+    def test_pool_splits_cores_between_sessions(self, _):
+        """Sessions of a pool share the cores unless intra-op threads are set."""
+        self.assertEqual(build_session_options(pool_size=4).intra_op_num_threads, 2)
+        self.assertEqual(build_session_options(pool_size=16).intra_op_num_threads, 1)
+        self.assertEqual(build_session_options().intra_op_num_threads, 0)
+        self.assertEqual(build_session_options(intra_op_threads=6, pool_size=4).intra_op_num_threads, 6)
+
+        with patch.dict(os.environ, {"ORT_INTRA_OP_THREADS": "0"}):
+            self.assertEqual(build_session_options(pool_size=4).intra_op_num_threads, 0)
+
+    def test_invalid_level(self):
+        """Unknown settings are rejected."""
+        with self.assertRaises(ValueError):
+            build_session_options(graph_optimization="maximum")
+
+
+class TestSessionPool(unittest.TestCase):
+    """Unit tests for the session pool."""
+
+    def test_run_uses_a_pooled_session(self):
+        """run() borrows a session and returns it to the pool."""
+        session = Mock()
+        session.run.return_value = ["logits"]
+        pool = SessionPool([session])
+
+        self.assertEqual(pool.run(None, {}), ["logits"])
+        self.assertEqual(pool.stats()["available"], 1)
+        self.assertEqual(pool.stats()["runs"], 1)
+
+    def test_each_session_serves_one_caller_at_a_time(self):
+        """A caller waits when every session is checked out."""
+        pool = SessionPool([Mock()])
+        acquired = threading.Event()
+
+        with pool.acquire():
+            thread = threading.Thread(target=lambda: (pool.acquire().__enter__(), acquired.set()))
+            thread.start()
+            self.assertFalse(acquired.wait(0.05))
+
+        self.assertTrue(acquired.wait(1))
+        thread.join()
+        self.assertEqual(pool.waits, 1)
+
+    def test_empty_pool_rejected(self):
+        with self.assertRaises(ValueError):
+            SessionPool([])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,107 @@
+import unittest
+import asyncio
+import time
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.api.single_flight import SingleFlight
+
+
+class TestSingleFlight(unittest.IsolatedAsyncioTestCase):
+    """Unit tests for in-flight call coalescing."""
+
+    async def asyncSetUp(self):
+        self.flights = SingleFlight()
+        self.runs = []
+
+    def slow(self, value, delay=0.05):
+        async def fn(progress):
+            self.runs.append(value)
+            await asyncio.sleep(delay)
+            return value
+        return fn
+
+    async def test_same_key_runs_once(self):
+        results = await asyncio.gather(*[self.flights.do("k", self.slow(1)) for _ in range(5)])
+
+        self.assertEqual(results, [1] * 5)
+        self.assertEqual(self.runs, [1])
+
+    async def test_deadlines_join_only_earlier_flights(self):
+        """Callers join the flight with the most time that still ends by their deadline."""
+        results = await asyncio.gather(
+            self.flights.do("k", self.slow("a"), deadline=10),
+            self.flights.do("k", self.slow("b"), deadline=5),
+            self.flights.do("k", self.slow("c"), deadline=7),
+            self.flights.do("k", self.slow("d"), deadline=12),
+            self.flights.do("k", self.slow("e"))
+        )
+
+        self.assertEqual(results, ["a", "b", "b", "a", "a"])
+        self.assertEqual(self.flights.stats(), {"executions": 2, "coalesced": 3, "in_flight": 0})
+
+    async def test_nothing_is_kept_after_completion(self):
+        await self.flights.do("k", self.slow(1))
+        await self.flights.do("k", self.slow(2))
+
+        self.assertEqual(self.runs, [1, 2])
+        self.assertEqual(self.flights.stats(), {"executions": 2, "coalesced": 0, "in_flight": 0})
+
+    async def test_errors_reach_every_caller(self):
+        async def fail(progress):
+            await asyncio.sleep(0.01)
+            raise ValueError("boom")
+
+        results = await asyncio.gather(*[self.flights.do("k", fail) for _ in range(3)], return_exceptions=True)
+
+        self.assertTrue(all(isinstance(r, ValueError) for r in results))
+
+    async def test_execution_cancelled_when_all_callers_leave(self):
+        started = asyncio.Event()
+        cancelled = asyncio.Event()
+
+        async def fn(progress):
+            started.set()
+            try:
+                await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        callers = [asyncio.create_task(self.flights.do("k", fn)) for _ in range(2)]
+        await started.wait()
+        for caller in callers:
+            caller.cancel()
+        await asyncio.wait_for(cancelled.wait(), 1)
+
+        # A new caller starts a fresh execution rather than joining the cancelled one
+        self.assertEqual(await self.flights.do("k", self.slow(3)), 3)
+
+    async def test_progress_stops_work_once_nobody_waits(self):
+        """Blocking work learns through its progress callback that every caller is gone."""
+        stopped = []
+
+        async def fn(progress):
+            def work():
+                for _ in range(50):
+                    try:
+                        progress("step", {})
+                    except RuntimeError:
+                        stopped.append(True)
+                        return
+                    time.sleep(0.01)
+            await asyncio.to_thread(work)
+
+        caller = asyncio.create_task(self.flights.do("k", fn, on_progress=lambda event, data: None))
+        await asyncio.sleep(0.05)
+        caller.cancel()
+        await asyncio.sleep(0.1)
+
+        self.assertEqual(stopped, [True])
+
+
+if __name__ == '__main__':
+    unittest.main()